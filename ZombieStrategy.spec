@@ -5,7 +5,7 @@ a = Analysis(
     ['src\\main.py'],
     pathex=[],
     binaries=[],
-    datas=[('src/sprites', 'sprites')],
+    datas=[('src/sprites', 'sprites'), ('src/rules.json', '.')],
     hiddenimports=[],
     hookspath=[],
     hooksconfig={},
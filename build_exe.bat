@@ -1 +1 @@
-pyinstaller --onefile --windowed --name "ZombieStrategy" --add-data "src/sprites;sprites" "src/main.py"
\ No newline at end of file
+pyinstaller --onefile --windowed --name "ZombieStrategy" --add-data "src/sprites;sprites" --add-data "src/rules.json;." "src/main.py"
\ No newline at end of file
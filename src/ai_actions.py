@@ -0,0 +1,26 @@
+"""What happened during the zombie turn, one record per zombie step.
+
+execute_ai_turn() fills game_state.ai_actions with AIAction records in the
+order the steps happened; the animator plays them back instead of guessing
+from before/after positions:
+
+    AIAction(MOVE, zombie, x, y, target_x, target_y)             # stepped (x, y) -> target
+    AIAction(ATTACK_UNIT, zombie, x, y, target_x, target_y)      # hit whatever stands on target
+    AIAction(KILL, zombie, x, y, target_x, target_y)             # ...and destroyed it
+
+ATTACK_CITY and ATTACK_BUILDING work like ATTACK_UNIT. A KILL always follows
+the attack that caused it.
+"""
+from collections import namedtuple
+
+MOVE = 0
+ATTACK_UNIT = 1
+ATTACK_CITY = 2
+ATTACK_BUILDING = 3
+KILL = 4
+
+ACTION_NAMES = ('move', 'attack_unit', 'attack_city', 'attack_building', 'kill')
+
+ATTACKS = frozenset((ATTACK_UNIT, ATTACK_CITY, ATTACK_BUILDING))
+
+AIAction = namedtuple('AIAction', ('kind', 'unit', 'x', 'y', 'target_x', 'target_y'))
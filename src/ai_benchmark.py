@@ -0,0 +1,145 @@
+"""Zombie AI turn benchmark, with and without dormant-zombie LOD.
+
+Builds a large map with a few cities clustered near the middle and a horde
+scattered across the whole map, then times several zombie turns with the full
+AI for every zombie and again with far-off zombies moved along the coarse
+field (zombie_lod.py). Both runs start from the same seed.
+
+Usage:
+    cd src
+    python ai_benchmark.py                       # 5,000 zombies on a 300x300 map
+    python ai_benchmark.py --zombies 10000 --size 400 --turns 10 --json results.json
+"""
+import argparse
+import json
+import random
+import time
+
+import game_log
+from map_generator import MapGenerator, TileType
+from game_state import GameState, Unit
+
+
+def build_horde_state(map_size, zombie_count, city_count, seed=1234):
+    """A few walled cities near the map centre with a guard each, and a horde everywhere"""
+    map_gen = MapGenerator(width=map_size, height=map_size, seed=seed)
+    map_grid = map_gen.generate()
+    game_state = GameState(map_grid, map_gen.resources, map_gen.research_lab_pos, 'medium', seed)
+    rng = random.Random(seed)
+    game_state.turn = 40
+
+    # Cities in a small ring around the centre, each with a farm, a workshop and two walls
+    center = map_size // 2
+    offsets = [(-1, 0), (1, 0), (0, -1), (0, 1), (-1, -1), (1, 1), (-1, 1), (1, -1)]
+    for i in range(city_count):
+        ox, oy = offsets[i % len(offsets)]
+        x = center + ox * 10 + rng.randint(-2, 2)
+        y = center + oy * 10 + rng.randint(-2, 2)
+        if map_grid[y][x] == TileType.WATER:
+            continue
+        city = game_state.found_city(x, y, f"New Hope {i + 1}")
+        if not city:
+            continue
+        # Sturdy enough that the horde doesn't raze the targets during the timed turns
+        city.health = city.max_health = 1000000
+        for building_type, (dx, dy) in zip(['farm', 'workshop', 'wall', 'wall'], [(-1, 0), (1, 0), (0, -1), (0, 1)]):
+            bx, by = x + dx, y + dy
+            if map_grid[by][bx] == TileType.WATER:
+                continue
+            city.buildings.append(building_type)
+            city.building_locations[(bx, by)] = {
+                'type': building_type, 'terrain': map_grid[by][bx], 'level': 1,
+                'health': 1000000, 'max_health': 1000000
+            }
+        guard = Unit(x + 1, y + 1, 'soldier', 'player', game_state.difficulty, game_state)
+        if map_grid[guard.y][guard.x] != TileType.WATER and not game_state.get_unit_at(guard.x, guard.y):
+            game_state.units.append(guard)
+    game_state.invalidate_defense_coverage()  # Buildings were placed directly
+
+    # The horde, on free land tiles anywhere on the map
+    positions = []
+    taken = {(unit.x, unit.y) for unit in game_state.units}
+    while len(positions) < zombie_count:
+        x = rng.randrange(map_size)
+        y = rng.randrange(map_size)
+        if (x, y) in taken or map_grid[y][x] == TileType.WATER:
+            continue
+        taken.add((x, y))
+        positions.append((x, y))
+    game_state.spawn_units('zombie', positions)
+    game_state.update_visibility()
+    return game_state
+
+
+def count_dormant(game_state):
+    """Zombies that start this turn outside the hot cells (what move_dormant will try first)"""
+    from zombie_lod import CELL_SIZE
+
+    field = game_state.get_dormant_field()
+    if field is None:
+        return 0
+    columns = field.columns
+    dormant = 0
+    for x, y in zip(game_state.units.enemies.x, game_state.units.enemies.y):
+        cell = (y // CELL_SIZE) * columns + x // CELL_SIZE
+        if not field.hot[cell] and field.steps[cell] is not None:
+            dormant += 1
+    return dormant
+
+
+def run(map_size, zombie_count, city_count, turns, use_lod):
+    """Time `turns` zombie turns; returns per-turn milliseconds and dormant counts"""
+    game_state = build_horde_state(map_size, zombie_count, city_count)
+    game_state.use_zombie_lod = use_lod
+    game_state.get_path_cache()  # Built once per game; keep it out of the first turn's time
+
+    turn_ms = []
+    dormant = []
+    for _ in range(turns):
+        dormant.append(count_dormant(game_state))
+        game_state.units.enemies.reset_moves()
+        start = time.perf_counter()
+        game_state.execute_ai_turn()
+        turn_ms.append((time.perf_counter() - start) * 1000.0)
+        game_state.turn += 1
+    return {
+        'zombies': len(game_state.units.enemies),
+        'turn_ms': [round(ms, 1) for ms in turn_ms],
+        'mean_ms': round(sum(turn_ms) / len(turn_ms), 1),
+        'dormant': dormant,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Zombie AI turn benchmark, with and without LOD")
+    parser.add_argument('--zombies', type=int, default=5000, help="Zombies in the horde")
+    parser.add_argument('--size', type=int, default=300, help="Map width and height in tiles")
+    parser.add_argument('--cities', type=int, default=6, help="Cities near the map centre")
+    parser.add_argument('--turns', type=int, default=5, help="Zombie turns to time")
+    parser.add_argument('--json', metavar='FILE', help="Also write results to a JSON file")
+    args = parser.parse_args()
+
+    game_log.set_console_enabled(False)  # Kills and city damage would flood the console
+
+    results = {'zombies': args.zombies, 'map_size': args.size, 'cities': args.cities, 'turns': args.turns}
+    for label, use_lod in (('full', False), ('lod', True)):
+        print(f"Benchmarking {args.zombies:,} zombies on {args.size}x{args.size}, {'LOD on' if use_lod else 'full AI'}...")
+        results[label] = run(args.size, args.zombies, args.cities, args.turns, use_lod)
+
+    full = results['full']
+    lod = results['lod']
+    print()
+    print(f"Full AI:   {full['mean_ms']:8.1f} ms per zombie turn  {full['turn_ms']}")
+    print(f"LOD:       {lod['mean_ms']:8.1f} ms per zombie turn  {lod['turn_ms']}")
+    print(f"Dormant:   {lod['dormant']} of {lod['zombies']:,} zombies at the start of each turn")
+    if lod['mean_ms']:
+        print(f"Speed-up:  {full['mean_ms'] / lod['mean_ms']:.1f}x")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"Results written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
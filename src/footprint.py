@@ -0,0 +1,153 @@
+"""Tile occupancy for units of any NxN footprint.
+
+A unit at (x, y) with size N covers the tiles x..x+N-1, y..y+N-1 (x, y is the
+top-left "anchor"). The OccupancyGrid keeps, for every map tile, a bitmap byte
+saying whether any unit stands there plus the list of units covering it:
+
+    grid = OccupancyGrid(width, height)
+    grid.add(unit, x, y, size)
+    grid.move(unit, x, y, x + 1, y, size)   # touches only the tiles left and entered
+    grid.unit_at(x, y)                      # O(1)
+    grid.footprint_blocked(x, y, size)      # one bitmap slice per footprint row
+
+UnitRoster owns the grid and registers every unit added to it; units update it
+themselves when their position or size changes, so it is never rebuilt. A tile
+going from empty to occupied can be watched (the path cache does this).
+"""
+
+
+def footprint_in_bounds(x, y, size, width, height):
+    """True if an NxN footprint anchored at (x, y) lies entirely on a width x height map"""
+    return 0 <= x and 0 <= y and x + size <= width and y + size <= height
+
+
+def footprint_visible(visible, x, y, size):
+    """True if any tile of the footprint is visible (visible is the [y][x] fog grid)"""
+    if size == 1:
+        return 0 <= y < len(visible) and 0 <= x < len(visible[0]) and visible[y][x]
+    start_x = max(x, 0)
+    end_x = x + size
+    for row in visible[max(y, 0):y + size]:
+        if any(row[start_x:end_x]):
+            return True
+    return False
+
+
+class OccupancyGrid:
+    """Which units cover which tiles, updated incrementally as units move"""
+
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+        self.occupied = bytearray(width * height)  # 1 where at least one unit stands
+        self.cells = [None] * (width * height)     # Tile index -> list of units covering it
+        # Tiles someone wants to hear about when a unit steps onto them while they are empty
+        # (cached paths, see pathfinding.PathCache)
+        self.watched_tiles = {}
+        self.on_tile_entered = None
+        self.version = 0  # Bumped whenever a tile becomes occupied or empty
+
+    def _tiles(self, x, y, size):
+        """Indices of the on-map tiles of a footprint"""
+        width = self.width
+        if size == 1:
+            if 0 <= x < width and 0 <= y < self.height:
+                return (y * width + x,)
+            return ()
+        xs = range(max(x, 0), min(x + size, width))
+        return [row * width + column for row in range(max(y, 0), min(y + size, self.height)) for column in xs]
+
+    def _enter(self, unit, index, front):
+        cell = self.cells[index]
+        if cell is None:
+            self.cells[index] = [unit]
+            self.occupied[index] = 1
+            self.version += 1
+            if index in self.watched_tiles:
+                self.on_tile_entered(index)
+        elif front:
+            cell.insert(0, unit)
+        else:
+            cell.append(unit)
+
+    def _leave(self, unit, index):
+        cell = self.cells[index]
+        if cell is None:
+            return
+        for i, other in enumerate(cell):
+            if other is unit:
+                del cell[i]
+                break
+        if not cell:
+            self.cells[index] = None
+            self.occupied[index] = 0
+            self.version += 1
+
+    def add(self, unit, x, y, size):
+        # Player units go first on a shared tile so they are found before zombies, as before
+        front = unit.team == 'player'
+        for index in self._tiles(x, y, size):
+            self._enter(unit, index, front)
+
+    def remove(self, unit, x, y, size):
+        for index in self._tiles(x, y, size):
+            self._leave(unit, index)
+
+    def move(self, unit, old_x, old_y, new_x, new_y, size):
+        """Update only the tiles the footprint leaves and enters"""
+        old_tiles = self._tiles(old_x, old_y, size)
+        new_tiles = self._tiles(new_x, new_y, size)
+        front = unit.team == 'player'
+        if size == 1:
+            if old_tiles != new_tiles:
+                for index in old_tiles:
+                    self._leave(unit, index)
+                for index in new_tiles:
+                    self._enter(unit, index, front)
+            return
+        stay = set(old_tiles).intersection(new_tiles)
+        for index in old_tiles:
+            if index not in stay:
+                self._leave(unit, index)
+        for index in new_tiles:
+            if index not in stay:
+                self._enter(unit, index, front)
+
+    # Queries
+    def unit_at(self, x, y, exclude_unit=None):
+        """Unit covering tile (x, y), or None"""
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            return None
+        cell = self.cells[y * self.width + x]
+        if cell:
+            for unit in cell:
+                if unit is not exclude_unit:
+                    return unit
+        return None
+
+    def footprint_blocked(self, x, y, size):
+        """True if any unit stands on an on-map tile of the footprint"""
+        width = self.width
+        occupied = self.occupied
+        if size == 1:
+            return 0 <= x < width and 0 <= y < self.height and occupied[y * width + x] == 1
+        start_x = max(x, 0)
+        end_x = min(x + size, width)
+        for row in range(max(y, 0), min(y + size, self.height)):
+            if any(occupied[row * width + start_x:row * width + end_x]):
+                return True
+        return False
+
+    def unit_in_footprint(self, x, y, size, exclude_unit=None):
+        """First unit other than `exclude_unit` covering any tile of the footprint, or None"""
+        if size == 1:
+            return self.unit_at(x, y, exclude_unit)
+        if not self.footprint_blocked(x, y, size):
+            return None  # Common case: one bitmap query per row, nothing to look up
+        for index in self._tiles(x, y, size):
+            cell = self.cells[index]
+            if cell:
+                for unit in cell:
+                    if unit is not exclude_unit:
+                        return unit
+        return None
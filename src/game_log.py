@@ -0,0 +1,83 @@
+"""Level-gated game event logging with an in-memory ring buffer.
+
+Game logic logs through the standard logging module under the "zombie" logger:
+
+    log = get_logger('ai')
+    log.debug("Zombie attacks %s for %d damage! Health: %d", target.unit_type, damage, target.health)
+
+Arguments are %-style, so the message is only formatted if a handler actually
+emits it, and calls below the current level return after a single level check.
+Per-attack and per-zombie chatter is logged at DEBUG; spawn, death and
+production reports at INFO (the default level).
+
+Every record that passes the level check is kept in a bounded ring buffer
+(formatted lazily when read), so recent history is available for debugging
+even when the console is quiet.
+"""
+import logging
+import sys
+from collections import deque
+
+ROOT_LOGGER = 'zombie'
+DEFAULT_LEVEL = logging.INFO
+RING_BUFFER_SIZE = 2000
+
+
+class RingBufferHandler(logging.Handler):
+    """Keeps the most recent log records in memory; formatting is deferred until read"""
+
+    def __init__(self, capacity=RING_BUFFER_SIZE):
+        super().__init__()
+        self.records = deque(maxlen=capacity)
+
+    def emit(self, record):
+        # Store the record itself - formatting happens in recent(), if ever
+        self.records.append(record)
+
+    def recent(self, count=None):
+        """Formatted messages of the last `count` records (all buffered records if None)"""
+        records = list(self.records)
+        if count is not None:
+            records = records[-count:]
+        return [f"{record.levelname[0]} {record.name[len(ROOT_LOGGER) + 1:] or ROOT_LOGGER}: {record.getMessage()}"
+                for record in records]
+
+    def clear(self):
+        self.records.clear()
+
+
+ring_buffer = RingBufferHandler()
+
+_root = logging.getLogger(ROOT_LOGGER)
+_root.setLevel(DEFAULT_LEVEL)
+_root.addHandler(ring_buffer)
+_root.propagate = False  # Don't double-print through whatever the root logger has configured
+
+_console = logging.StreamHandler(sys.stdout)
+_console.setFormatter(logging.Formatter('%(message)s'))  # Same look as the old print() output
+_root.addHandler(_console)
+
+
+def get_logger(name):
+    """Logger for one subsystem (e.g. 'ai', 'spawn', 'turn'), a child of the game logger"""
+    return logging.getLogger(f"{ROOT_LOGGER}.{name}")
+
+
+def set_level(level):
+    """Set the game log level from a logging constant or a name like 'debug'"""
+    if isinstance(level, str):
+        level = logging.getLevelName(level.upper())
+    _root.setLevel(level)
+
+
+def set_console_enabled(enabled):
+    """Echo log messages to stdout (on by default); the ring buffer is unaffected"""
+    if enabled and _console not in _root.handlers:
+        _root.addHandler(_console)
+    elif not enabled and _console in _root.handlers:
+        _root.removeHandler(_console)
+
+
+def recent(count=None):
+    """Most recent buffered log messages, oldest first"""
+    return ring_buffer.recent(count)
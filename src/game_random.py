@@ -0,0 +1,43 @@
+import random
+
+
+def make_stream(seed, name):
+    """Independent random.Random for one subsystem, derived from the game seed"""
+    # String seeds are hashed deterministically, so "<seed>:<name>" gives the
+    # same stream on every run and platform
+    return random.Random(f"{seed}:{name}")
+
+
+class GameRandom:
+    """Per-game random streams, split by subsystem so one never perturbs another.
+
+    map   - terrain, ruined cities, roads and resource placement
+    spawn - starting units and zombie spawns
+    ai    - zombie movement tie-breaks and wandering
+    loot  - scavenging finds and lab triangulation offsets
+    """
+
+    STREAMS = ('map', 'spawn', 'ai', 'loot')
+
+    def __init__(self, seed=None):
+        # Pick a fresh seed without touching (or depending on) the global generator
+        self.seed = seed if seed is not None else random.SystemRandom().randint(0, 999999)
+        self.map = make_stream(self.seed, 'map')
+        self.spawn = make_stream(self.seed, 'spawn')
+        self.ai = make_stream(self.seed, 'ai')
+        self.loot = make_stream(self.seed, 'loot')
+
+    def get_state(self):
+        """JSON-serializable state of every stream"""
+        state = {}
+        for name in self.STREAMS:
+            version, internal, gauss_next = getattr(self, name).getstate()
+            state[name] = [version, list(internal), gauss_next]
+        return state
+
+    def set_state(self, state):
+        """Restore streams saved by get_state (streams missing from state are left as seeded)"""
+        for name in self.STREAMS:
+            if name in state:
+                version, internal, gauss_next = state[name]
+                getattr(self, name).setstate((version, tuple(internal), gauss_next))
@@ -1,99 +1,216 @@
 import json
+import logging
 import os
+from profiling import turn_profiler
+from game_random import GameRandom
+from game_log import get_logger
+from unit_store import ANCHOR_STRIDE, UnitRoster
+from footprint import footprint_in_bounds
+from spawn_pool import EdgeSpawnPool
+from resource_index import ResourcePiles
+from ai_actions import AIAction, MOVE, ATTACK_UNIT, ATTACK_CITY, ATTACK_BUILDING, KILL
+from rules import rules
+from tech_tree import ResearchedTechs, TECH_BITS, TECH_IDS, get_tech_modifiers
+
+ai_log = get_logger('ai')
+spawn_log = get_logger('spawn')
+turn_log = get_logger('turn')
+
+RESOURCE_TYPES = ('food', 'materials', 'medicine', 'cure')
+
+# Shared placeholder for units that never track explored tiles (only scouts do)
+NO_TILES_EXPLORED = frozenset()
+
+
+class ResourceStore:
+    """Fixed-order food/materials/medicine/cure counters with dict-style access.
+
+    Replaces the per-unit and per-city {'food': .., 'materials': .., ...} dicts:
+    four slots instead of a hash table, while inventory['food'], .get(), .items()
+    and friends keep working. Item access is a Python-level call, so it is slower
+    than a dict lookup; inventories are only touched by player actions and the UI.
+    """
+    __slots__ = RESOURCE_TYPES
+
+    def __init__(self, amounts=None):
+        self.food = 0
+        self.materials = 0
+        self.medicine = 0
+        self.cure = 0
+        if amounts:
+            self.update(amounts)
+
+    def __getitem__(self, key):
+        if key in RESOURCE_TYPES:
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def __setitem__(self, key, value):
+        if key not in RESOURCE_TYPES:
+            raise KeyError(key)
+        setattr(self, key, value)
+
+    def get(self, key, default=None):
+        return getattr(self, key) if key in RESOURCE_TYPES else default
+
+    def update(self, amounts):
+        """Copy known resource amounts from a mapping (unknown keys are ignored)"""
+        for key in RESOURCE_TYPES:
+            if key in amounts:
+                setattr(self, key, amounts[key])
+
+    def __contains__(self, key):
+        return key in RESOURCE_TYPES
+
+    def __iter__(self):
+        return iter(RESOURCE_TYPES)
+
+    def __len__(self):
+        return len(RESOURCE_TYPES)
+
+    def keys(self):
+        return RESOURCE_TYPES
+
+    def values(self):
+        return [self.food, self.materials, self.medicine, self.cure]
+
+    def items(self):
+        return [('food', self.food), ('materials', self.materials), ('medicine', self.medicine), ('cure', self.cure)]
+
+    def to_dict(self):
+        return {'food': self.food, 'materials': self.materials, 'medicine': self.medicine, 'cure': self.cure}
+
+    def __eq__(self, other):
+        if isinstance(other, ResourceStore):
+            other = other.to_dict()
+        return self.to_dict() == other
+
+    def __repr__(self):
+        return repr(self.to_dict())
+
+
+ZOMBIE_TYPES = ('zombie', 'super_zombie')
+
+# (max health, moves, soldier attack) bonuses for units built without research (see TechModifiers.unit_bonuses)
+NO_UNIT_BONUSES = (0, 0, 0)
+
+
+class UnitArchetype:
+    """Starting stats shared by every new unit of one type, team, difficulty and tech bonuses"""
+    __slots__ = ('unit_type', 'team', 'max_health', 'max_moves', 'attack_power', 'size')
+
+    def __init__(self, unit_type, team, difficulty, unit_bonuses):
+        self.unit_type = unit_type
+        self.team = team
+        # Base stats from the rules (unknown types get survivor stats)
+        self.max_health, self.max_moves, self.attack_power, self.size = \
+            rules.unit_stats.get(unit_type, rules.unit_stats['survivor'])
+
+        if unit_type in ZOMBIE_TYPES:
+            settings = rules.difficulty(difficulty)
+            self.max_health = int(self.max_health * settings['zombie_health_multiplier'])
+            self.attack_power = int(self.attack_power * settings['zombie_attack_multiplier'])
+
+        # Tech bonuses for player units (armor_plating, rapid_response, advanced_weaponry)
+        if team == 'player':
+            health_bonus, moves_bonus, soldier_attack_bonus = unit_bonuses
+            self.max_health += health_bonus
+            self.max_moves += moves_bonus
+            if unit_type == 'soldier':
+                self.attack_power += soldier_attack_bonus
+
+
+# (unit_type, team, difficulty, unit tech bonuses) -> UnitArchetype
+_archetypes = {}
+rules.on_reload(_archetypes.clear)
+
+
+def get_archetype(unit_type, team, difficulty='medium', unit_bonuses=NO_UNIT_BONUSES):
+    """Cached archetype; `unit_bonuses` is TechModifiers.unit_bonuses"""
+    key = (unit_type, team, difficulty, unit_bonuses)
+    archetype = _archetypes.get(key)
+    if archetype is None:
+        archetype = _archetypes[key] = UnitArchetype(unit_type, team, difficulty, unit_bonuses)
+    return archetype
+
 
 class Unit:
-    def __init__(self, x, y, unit_type, team, difficulty='medium', game_state=None):
-        self.x = x
-        self.y = y
+    __slots__ = ('_x', '_y', 'unit_type', 'team', 'inventory', 'health', 'max_health', 'max_moves',
+                 'attack_power', '_size', 'moves_remaining', 'turn_skipped', 'xp', 'level',
+                 'xp_to_next_level', 'tiles_explored', 'age_in_turns', 'occupancy',
+                 'goto', 'reachable')
+
+    def __init__(self, x, y, unit_type, team, difficulty='medium', game_state=None, archetype=None):
+        self.occupancy = None  # OccupancyGrid of the roster this unit is in (set by UnitRoster)
+        self._x = x
+        self._y = y
         self.unit_type = unit_type  # 'survivor', 'scout', 'soldier', 'medic', 'zombie', 'super_zombie'
         self.team = team  # 'player' or 'enemy'
-        self.inventory = {'food': 0, 'materials': 0, 'medicine': 0, 'cure': 0}
-
-        # Determine difficulty multiplier for zombie stats
-        if difficulty == 'easy':
-            zombie_health_multiplier = 0.7
-            zombie_attack_multiplier = 0.7
-        elif difficulty == 'hard':
-            zombie_health_multiplier = 1.4
-            zombie_attack_multiplier = 1.4
-        else:  # medium
-            zombie_health_multiplier = 1.0
-            zombie_attack_multiplier = 1.0
-
-        # Set unit stats based on type
-        if unit_type == 'scout':
-            self.health = 75
-            self.max_health = 75
-            self.max_moves = 5
-            self.attack_power = 3
-            self.size = 1  # Normal units are 1x1
-        elif unit_type == 'soldier':
-            self.health = 120
-            self.max_health = 120
-            self.max_moves = 2
-            self.attack_power = 20
-            self.size = 1
-        elif unit_type == 'super_soldier':
-            self.health = 150
-            self.max_health = 150
-            self.max_moves = 3
-            self.attack_power = 30
-            self.size = 1
-        elif unit_type == 'medic':
-            self.health = 80
-            self.max_health = 80
-            self.max_moves = 3
-            self.attack_power = 5
-            self.size = 1
-        elif unit_type == 'zombie':
-            self.health = int(100 * zombie_health_multiplier)
-            self.max_health = int(100 * zombie_health_multiplier)
-            self.max_moves = 2
-            self.attack_power = int(20 * zombie_attack_multiplier)
-            self.size = 1
-        elif unit_type == 'super_zombie':
-            self.health = int(200 * zombie_health_multiplier)
-            self.max_health = int(200 * zombie_health_multiplier)
-            self.max_moves = 2
-            self.attack_power = int(80 * zombie_attack_multiplier)
-            self.size = 2  # Super zombies are 2x2
-        else:  # 'survivor' or default
-            self.health = 100
-            self.max_health = 100
-            self.max_moves = 3
-            self.attack_power = 12
-            self.size = 1
+        self.inventory = ResourceStore()
+
+        # Starting stats come from the archetype table (difficulty multipliers for zombies,
+        # tech bonuses for player units - only when a game state is given to read research from)
+        if archetype is None:
+            unit_bonuses = game_state.tech_modifiers.unit_bonuses if game_state and team == 'player' else NO_UNIT_BONUSES
+            archetype = get_archetype(unit_type, team, difficulty, unit_bonuses)
+        self.health = archetype.max_health
+        self.max_health = archetype.max_health
+        self.max_moves = archetype.max_moves
+        self.attack_power = archetype.attack_power
+        self._size = archetype.size  # Super zombies are 2x2, everything else 1x1
 
         self.moves_remaining = self.max_moves
         self.turn_skipped = False  # Set by spacebar to skip this unit's turn
 
-        # Apply tech bonuses for player units
-        if team == 'player' and game_state:
-            # armor_plating: +40 max HP for all units
-            if game_state.has_tech('armor_plating'):
-                self.max_health += 40
-                self.health += 40
-
-            # rapid_response: +1 movement for all units
-            if game_state.has_tech('rapid_response'):
-                self.max_moves += 1
-                self.moves_remaining += 1
-
-            # advanced_weaponry: +10 attack for soldiers
-            if game_state.has_tech('advanced_weaponry') and unit_type == 'soldier':
-                self.attack_power += 10
-
         # XP and leveling system
         self.xp = 0
         self.level = 1
         self.xp_to_next_level = 100  # XP needed for level 2
 
-        # Track tiles explored by this unit (for scout XP)
-        self.tiles_explored = set()
+        # Track tiles explored by this unit (for scout XP); other units share an empty placeholder
+        self.tiles_explored = set() if unit_type == 'scout' else NO_TILES_EXPLORED
 
         # Track age for zombie leveling (zombies level up over time)
         self.age_in_turns = 0  # How many turns this unit has been alive
 
+        # Standing move order (right click): tile the unit keeps walking toward each turn
+        self.goto = None
+        self.reachable = None  # Cached ReachableArea for the move overlay, see GameState.get_reachable_area()
+
+    # Position and footprint size keep the roster's occupancy grid in step when they change
+    @property
+    def x(self):
+        return self._x
+
+    @x.setter
+    def x(self, value):
+        self._place(value, self._y)
+
+    @property
+    def y(self):
+        return self._y
+
+    @y.setter
+    def y(self, value):
+        self._place(self._x, value)
+
+    @property
+    def size(self):
+        return self._size
+
+    @size.setter
+    def size(self, value):
+        if self.occupancy is not None:
+            self.occupancy.remove(self, self._x, self._y, self._size)
+            self.occupancy.add(self, self._x, self._y, value)
+        self._size = value
+
+    def _place(self, x, y):
+        if self.occupancy is not None:
+            self.occupancy.move(self, self._x, self._y, x, y, self._size)
+        self._x = x
+        self._y = y
+
     def reset_moves(self):
         """Reset movement points at start of turn"""
         self.moves_remaining = self.max_moves
@@ -107,8 +224,7 @@ class Unit:
         from map_generator import TileType
 
         if self.can_move():
-            self.x += dx
-            self.y += dy
+            self._place(self._x + dx, self._y + dy)
 
             # Roads cost only 0.5 movement points
             if terrain_type == TileType.ROAD:
@@ -174,6 +290,9 @@ class Unit:
         return leveled_up
 
 class City:
+    __slots__ = ('x', 'y', 'name', 'population', 'buildings', 'building_locations', 'resources',
+                 'level', 'health', 'max_health', 'production_cache')
+
     def __init__(self, x, y, name):
         self.x = x
         self.y = y
@@ -181,45 +300,24 @@ class City:
         self.population = 5
         self.buildings = ['shelter']
         self.building_locations = {}  # Maps (x, y) -> {'type': str, 'terrain': TileType, 'level': int, 'health': int}
-        self.resources = {'food': 0, 'materials': 0, 'medicine': 0, 'cure': 0}  # Start with zero resources
+        self.resources = ResourceStore()  # Start with zero resources
         self.level = 1
         self.health = 50
         self.max_health = 50
+        self.production_cache = None  # Compiled per-turn production, see production_vector()
 
     def can_build(self, building_type, game_state=None):
         """Check if city has resources to build"""
-        # Base cure cost
-        cure_food = 500
-        cure_materials = 500
-
-        # Apply cure_research tech if available
-        if game_state and game_state.has_tech('cure_research'):
-            cure_food = 350
-            cure_materials = 350
-
-        costs = {
-            'farm': {'materials': 30},
-            'workshop': {'materials': 50},
-            'hospital': {'materials': 40},
-            'wall': {'materials': 5},
-            'dock': {'materials': 40},
-            'research_center': {'materials': 30},
-            'survivor': {'food': 20, 'materials': 10},
-            'scout': {'food': 15, 'materials': 5},
-            'soldier': {'food': 30, 'materials': 20},
-            'medic': {'food': 25, 'materials': 15, 'medicine': 10},
-            'manufacture_cure': {'food': cure_food, 'materials': cure_materials, 'medicine': 200, 'cure': 1}
-        }
-
         # Special requirement: can only manufacture cure if city has a hospital
         if building_type == 'manufacture_cure':
             if 'hospital' not in self.buildings:
                 return False
 
-        if building_type not in costs:
+        # Costs come from the rules registry (the cure is cheaper with cure_research)
+        cost = rules.build_cost(building_type, game_state)
+        if cost is None:
             return False
 
-        cost = costs[building_type]
         for resource, amount in cost.items():
             if self.resources.get(resource, 0) < amount:
                 return False
@@ -227,36 +325,13 @@ class City:
 
     def build(self, building_type, tile_x, tile_y, terrain_type, game_state=None):
         """Construct a building at a specific location"""
-        # Base cure cost
-        cure_food = 500
-        cure_materials = 500
-
-        # Apply cure_research tech if available
-        if game_state and game_state.has_tech('cure_research'):
-            cure_food = 350
-            cure_materials = 350
-
-        costs = {
-            'farm': {'materials': 30},
-            'workshop': {'materials': 50},
-            'hospital': {'materials': 40},
-            'wall': {'materials': 5},
-            'dock': {'materials': 40},
-            'research_center': {'materials': 30},
-            'survivor': {'food': 20, 'materials': 10},
-            'scout': {'food': 15, 'materials': 5},
-            'soldier': {'food': 30, 'materials': 20},
-            'medic': {'food': 25, 'materials': 15, 'medicine': 10},
-            'manufacture_cure': {'food': cure_food, 'materials': cure_materials, 'medicine': 200, 'cure': 1}
-        }
-
         if self.can_build(building_type, game_state):
-            cost = costs.get(building_type, {})
+            cost = rules.build_cost(building_type, game_state)
             for resource, amount in cost.items():
                 self.resources[resource] -= amount
 
             # Place building or recruit unit
-            if building_type in ['survivor', 'scout', 'soldier', 'medic']:
+            if building_type in rules.unit_costs:
                 # Unit recruitment - return True to signal unit creation
                 return True
             elif building_type == 'manufacture_cure':
@@ -265,7 +340,7 @@ class City:
             else:
                 self.buildings.append(building_type)
                 # Walls have 200 HP, other buildings have 20 HP
-                health = 200 if building_type == 'wall' else 20
+                health = rules.building_health.get(building_type, rules.building_health['default'])
                 self.building_locations[(tile_x, tile_y)] = {
                     'type': building_type,
                     'terrain': terrain_type,
@@ -273,6 +348,9 @@ class City:
                     'health': health,
                     'max_health': health
                 }
+                self.invalidate_production()
+                if game_state:
+                    game_state.invalidate_defense_coverage()
 
                 # If building a wall at city location, double city HP
                 if building_type == 'wall' and tile_x == self.x and tile_y == self.y:
@@ -282,146 +360,58 @@ class City:
                 return True
         return False
 
-    def produce_resources(self, game_state):
-        """Produce resources based on buildings and their terrain each turn"""
-        from map_generator import TileType
-
-        production = {
-            'food': 2,  # Base city production
-            'materials': 2,  # Base city production
-            'medicine': 0
-        }
-
-        # Calculate production from placed buildings with terrain bonuses
-        farm_count = 0
-        workshop_count = 0
-        hospital_count = 0
-
+    def invalidate_production(self):
+        """Drop the cached production vector (buildings or research changed)"""
+        self.production_cache = None
+
+    def production_vector(self, game_state=None):
+        """Per-turn production of this city, compiled once and cached until its buildings or research change"""
+        if game_state is None:
+            # Without a game state there is no research to apply; don't cache that
+            return self._compile_production(None)
+        if self.production_cache is None:
+            self.production_cache = self._compile_production(game_state)
+        return self.production_cache
+
+    def _compile_production(self, game_state):
+        """Sum the yield of every building (terrain and level) plus tech bonuses"""
+        production = dict(rules.city_base_production)  # Base city production
+
+        # Calculate production from placed buildings with terrain bonuses (yields come from the rules)
+        building_counts = {}
         for location, building_info in self.building_locations.items():
             building_type = building_info['type']
-            terrain = building_info['terrain']
-            level = building_info.get('level', 1)
-
-            if building_type == 'farm':
-                farm_count += 1
-                # Farm: 6 on grass, 3 on forest, 0 base
-                food_production = 0
-                if terrain == TileType.GRASS:
-                    food_production = 6
-                elif terrain == TileType.FOREST:
-                    food_production = 3
-                production['food'] += food_production * level
-
-            elif building_type == 'dock':
-                # Dock: 2x farm production (12 on water, equivalent to grass farm bonus)
-                food_production = 12
-                production['food'] += food_production * level
-
-            elif building_type == 'workshop':
-                workshop_count += 1
-                # Workshop: 2 on rubble, 4 on ruined/road, 8 on intact, 0 base
-                materials_production = 0
-                if terrain == TileType.RUBBLE:
-                    materials_production = 2
-                elif terrain in [TileType.BUILDING_RUINED, TileType.ROAD]:
-                    materials_production = 4
-                elif terrain == TileType.BUILDING_INTACT:
-                    materials_production = 8
-                production['materials'] += materials_production * level
-
-            elif building_type == 'hospital':
-                hospital_count += 1
-                # Hospital: 2 base, +4 on intact building
-                medicine_production = 2
-                if terrain == TileType.BUILDING_INTACT:
-                    medicine_production += 4
-                production['medicine'] += medicine_production * level
-
-            elif building_type == 'research_center':
-                # Research Center: 2 tech points per level
-                tech_production = 2 * level
-                game_state.tech_points += tech_production
-                # Track for display purposes
-                if 'tech_points' not in production:
-                    production['tech_points'] = 0
-                production['tech_points'] += tech_production
-
-        # Apply tech bonuses
-        if game_state.has_tech('advanced_farming'):
-            production['food'] += farm_count * 2
-        if game_state.has_tech('industrial_workshops'):
-            production['materials'] += workshop_count * 3
-        if game_state.has_tech('basic_medicine'):
-            production['medicine'] += hospital_count * 2
-
-        # Add production to city resources (skip tech_points as they go to game_state)
-        for resource, amount in production.items():
-            if resource != 'tech_points':
-                self.resources[resource] += amount
+            building_counts[building_type] = building_counts.get(building_type, 0) + 1
+
+            building_yield = rules.building_yield(building_type, building_info['terrain'])
+            if building_yield:
+                # Research centers yield tech points (added to game_state, not the city)
+                resource, amount = building_yield
+                production[resource] = production.get(resource, 0) + amount * building_info.get('level', 1)
+
+        # Apply tech bonuses (flat per building, not scaled by level)
+        if game_state:
+            for building_type, resource, amount in game_state.tech_modifiers.production_bonuses:
+                production[resource] = production.get(resource, 0) + building_counts.get(building_type, 0) * amount
 
         return production
 
-    def calculate_production(self, game_state=None):
-        """Calculate total resource production per turn without actually producing"""
-        from map_generator import TileType
+    def produce_resources(self, game_state):
+        """Produce resources based on buildings and their terrain each turn"""
+        production = self.production_vector(game_state)
 
-        production = {
-            'food': 2,  # Base city production
-            'materials': 2,  # Base city production
-            'medicine': 0
-        }
+        # Add production to city resources (tech_points go to game_state)
+        resources = self.resources
+        resources.food += production['food']
+        resources.materials += production['materials']
+        resources.medicine += production['medicine']
+        game_state.tech_points += production.get('tech_points', 0)
 
-        # Calculate production from placed buildings with terrain bonuses
-        for location, building_info in self.building_locations.items():
-            building_type = building_info['type']
-            terrain = building_info['terrain']
-            level = building_info.get('level', 1)
-
-            if building_type == 'farm':
-                food_production = 0
-                if terrain == TileType.GRASS:
-                    food_production = 6
-                elif terrain == TileType.FOREST:
-                    food_production = 3
-                # Apply tech bonus
-                if game_state and game_state.has_tech('advanced_farming'):
-                    food_production += 2
-                production['food'] += food_production * level
-
-            elif building_type == 'dock':
-                food_production = 12
-                production['food'] += food_production * level
-
-            elif building_type == 'workshop':
-                materials_production = 0
-                if terrain == TileType.RUBBLE:
-                    materials_production = 2
-                elif terrain in [TileType.BUILDING_RUINED, TileType.ROAD]:
-                    materials_production = 4
-                elif terrain == TileType.BUILDING_INTACT:
-                    materials_production = 8
-                # Apply tech bonus
-                if game_state and game_state.has_tech('industrial_workshops'):
-                    materials_production += 3
-                production['materials'] += materials_production * level
-
-            elif building_type == 'hospital':
-                medicine_production = 2
-                if terrain == TileType.BUILDING_INTACT:
-                    medicine_production += 4
-                # Apply tech bonus
-                if game_state and game_state.has_tech('basic_medicine'):
-                    medicine_production += 2
-                production['medicine'] += medicine_production * level
-
-            elif building_type == 'research_center':
-                # Research Center: 2 tech points per level
-                tech_production = 2 * level
-                if 'tech_points' not in production:
-                    production['tech_points'] = 0
-                production['tech_points'] += tech_production
+        return dict(production)
 
-        return production
+    def calculate_production(self, game_state=None):
+        """Calculate total resource production per turn without actually producing"""
+        return self.production_vector(game_state)
 
     def can_upgrade_building(self, tile_x, tile_y):
         """Check if a building can be upgraded"""
@@ -429,27 +419,12 @@ class City:
             return False
 
         building_info = self.building_locations[(tile_x, tile_y)]
-        current_level = building_info.get('level', 1)
 
-        # Max level is 3
-        if current_level >= 3:
+        # Upgrade cost scales with level; there is no entry at max level (3)
+        cost = rules.upgrade_cost(building_info['type'], building_info.get('level', 1))
+        if cost is None:
             return False
 
-        # Upgrade cost scales with level (50% more than original build cost per level)
-        upgrade_costs = {
-            'farm': {'materials': 15 * (current_level + 1)},
-            'workshop': {'materials': 25 * (current_level + 1)},
-            'hospital': {'materials': 20 * (current_level + 1)},
-            'wall': {'materials': 12 * (current_level + 1)},
-            'dock': {'materials': 20 * (current_level + 1)},
-            'research_center': {'materials': 15 * (current_level + 1)}
-        }
-
-        building_type = building_info['type']
-        if building_type not in upgrade_costs:
-            return False
-
-        cost = upgrade_costs[building_type]
         for resource, amount in cost.items():
             if self.resources.get(resource, 0) < amount:
                 return False
@@ -462,52 +437,33 @@ class City:
 
         building_info = self.building_locations[(tile_x, tile_y)]
         current_level = building_info.get('level', 1)
-        building_type = building_info['type']
 
         # Deduct upgrade cost
-        upgrade_costs = {
-            'farm': {'materials': 15 * (current_level + 1)},
-            'workshop': {'materials': 25 * (current_level + 1)},
-            'hospital': {'materials': 20 * (current_level + 1)},
-            'wall': {'materials': 12 * (current_level + 1)},
-            'dock': {'materials': 20 * (current_level + 1)},
-            'research_center': {'materials': 15 * (current_level + 1)}
-        }
-
-        cost = upgrade_costs[building_type]
+        cost = rules.upgrade_cost(building_info['type'], current_level)
         for resource, amount in cost.items():
             self.resources[resource] -= amount
 
         # Upgrade the building
         building_info['level'] = current_level + 1
+        self.invalidate_production()
         return True
 
 class GameState:
-    def __init__(self, map_grid, resources, research_lab_pos=None, difficulty='medium'):
+    def __init__(self, map_grid, resources, research_lab_pos=None, difficulty='medium', seed=None):
         self.map_grid = map_grid
-        self.resources = resources
+        self.resources = ResourcePiles(resources)  # Tile -> scavengeable pile, indexed by area (resource_index.py)
         self.research_lab_pos = research_lab_pos
         self.turn = 0
         self.current_team = 'player'
         self.game_won = False  # Track if player has won via cure
         self.difficulty = difficulty  # 'easy', 'medium', or 'hard'
 
-        # Difficulty settings
-        if difficulty == 'easy':
-            self.zombie_spawn_rate = 0.50  # 50% chance per turn
-            self.zombie_spawn_count_min = 1
-            self.zombie_spawn_count_max = 2
-            self.starting_resources_multiplier = 1.5
-        elif difficulty == 'hard':
-            self.zombie_spawn_rate = 1  # 100% chance per turn
-            self.zombie_spawn_count_min = 2
-            self.zombie_spawn_count_max = 4
-            self.starting_resources_multiplier = 0.7
-        else:  # medium
-            self.zombie_spawn_rate = 0.75  # 75% chance per turn
-            self.zombie_spawn_count_min = 1
-            self.zombie_spawn_count_max = 3
-            self.starting_resources_multiplier = 1.0
+        # Per-game random streams (map/spawn/ai/loot); pass the map seed so one seed reproduces the game
+        self.rng = GameRandom(seed)
+        self.seed = self.rng.seed
+
+        # Difficulty settings (spawn rate and counts, starting resources, cure time)
+        self.apply_difficulty_rules()
 
         # Add the cure to the research lab as a resource
         if research_lab_pos:
@@ -528,7 +484,8 @@ class GameState:
 
         # Tech tree state
         self.tech_points = 0
-        self.researched_techs = set()  # Set of researched tech names
+        self.researched_techs = ResearchedTechs()  # Researched tech bitmask (set-like, by name)
+        self.tech_modifiers = get_tech_modifiers(self.researched_techs)  # Precomputed effects of researched techs
         self.tiles_explored_count = 0  # Track for tech point rewards
         self.total_resources_produced = 0  # Track for tech point rewards
         self.zombies_killed_count = 0  # Track for tech point rewards
@@ -536,25 +493,27 @@ class GameState:
         # Cure manufacturing state
         self.cure_manufacturing_city = None  # City currently manufacturing cure
         self.cure_manufacturing_turns_remaining = 0  # Turns until cure is complete
-        self.cure_manufacturing_turns_required = {
-            'easy': 4,
-            'medium': 7,
-            'hard': 10
-        }
 
-        # Initialize player units
-        self.units = []
+        # Initialize player units (zombies are kept in struct-of-arrays storage, see unit_store.py)
+        self.units = UnitRoster(len(map_grid[0]), len(map_grid))
         self.spawn_initial_units()
 
         # Initialize cities
         self.cities = []
+        self.defense_coverage = None  # Automated-defense coverage, see get_defense_coverage()
+        self.spawn_pools = {}  # Footprint size -> EdgeSpawnPool
+        self.path_cache = None  # A* paths for goto orders, see get_path_cache()
+        self.threat_map = None  # Tiles zombies can reach or attack next turn, see get_threat_map()
+        self.ai_actions = []  # AIAction records of the last zombie turn
+        self.dormant_field = None  # Coarse movement for far-off zombies, see get_dormant_field()
+        self.use_zombie_lod = True  # False runs the full AI for every zombie
 
         # Update initial visibility
         self.update_visibility()
 
     def spawn_initial_units(self):
         """Spawn starting survivors and zombies"""
-        import random
+        rng = self.rng.spawn
         from map_generator import TileType
 
         # Choose random starting location for survivors (avoid edges and water)
@@ -564,105 +523,225 @@ class GameState:
         # Find valid spawn location not on water
         attempts = 0
         while attempts < 100:
-            start_x = random.randint(10, map_width - 10)
-            start_y = random.randint(10, map_height - 10)
+            start_x = rng.randint(10, map_width - 10)
+            start_y = rng.randint(10, map_height - 10)
             # Check if all 3 survivor positions are not water
             if all(self.map_grid[start_y][start_x + i] != TileType.WATER for i in range(3) if start_x + i < map_width):
                 break
             attempts += 1
 
         # Spawn 3 player survivors with starting resources (clustered together)
-        for i in range(3):
-            survivor = Unit(start_x + i, start_y, 'survivor', 'player', self.difficulty, self)
+        for survivor in self.spawn_units('survivor', [(start_x + i, start_y) for i in range(3)]):
             # Give each survivor some starting resources (adjusted by difficulty)
             # Medicine cannot be found - must be produced by hospitals
             survivor.inventory['food'] = int(20 * self.starting_resources_multiplier)
             survivor.inventory['materials'] = int(40 * self.starting_resources_multiplier)
             survivor.inventory['medicine'] = 0
-            self.units.append(survivor)
 
         # Spawn some zombies scattered around (avoid water)
+        zombie_positions = []
         for _ in range(5):
             attempts = 0
             while attempts < 100:
-                x = random.randint(10, len(self.map_grid[0]) - 5)
-                y = random.randint(10, len(self.map_grid) - 5)
+                x = rng.randint(10, len(self.map_grid[0]) - 5)
+                y = rng.randint(10, len(self.map_grid) - 5)
                 if self.map_grid[y][x] != TileType.WATER:
                     break
                 attempts += 1
-            zombie = Unit(x, y, 'zombie', 'enemy', self.difficulty)
-            self.units.append(zombie)
-
-    def apply_automated_defenses(self):
-        """Cities and buildings damage adjacent zombies (Automated Defenses tech)"""
-        if not self.has_tech('automated_defenses'):
-            return {'damaged': 0, 'killed': 0}
-
-        damage_per_hit = 10  # Fixed damage amount
-        zombies_to_remove = []
-        damaged_count = 0
+            zombie_positions.append((x, y))
+        self.spawn_units('zombie', zombie_positions)
+
+    def apply_difficulty_rules(self):
+        """Set the difficulty-dependent parameters from the rules registry"""
+        settings = rules.difficulty(self.difficulty)
+        self.zombie_spawn_rate = settings['zombie_spawn_rate']  # Chance per turn that zombies spawn
+        self.zombie_spawn_count_min = settings['zombie_spawn_count_min']
+        self.zombie_spawn_count_max = settings['zombie_spawn_count_max']
+        self.starting_resources_multiplier = settings['starting_resources_multiplier']
+        self.cure_manufacturing_turns_required = settings['cure_manufacturing_turns']
+
+    def add_researched_tech(self, tech_id):
+        """Mark a tech researched, rebuild the tech modifier table and apply its effects to
+        existing units, cities and vision; returns the number of units whose stats changed"""
+        self.researched_techs.add(tech_id)
+        return self.refresh_tech_modifiers()
+
+    def refresh_tech_modifiers(self):
+        """Swap in the modifier table for the current research (also after a rules reload)
+        and apply whatever changed in one pass; returns the number of units updated"""
+        old = self.tech_modifiers
+        new = self.tech_modifiers = get_tech_modifiers(self.researched_techs)
+
+        # Retroactive unit stats: existing player units get the difference in one batch pass
+        health_delta = new.unit_health_bonus - old.unit_health_bonus
+        moves_delta = new.unit_moves_bonus - old.unit_moves_bonus
+        soldier_attack_delta = new.soldier_attack_bonus - old.soldier_attack_bonus
+        units_updated = 0
+        if health_delta or moves_delta or soldier_attack_delta:
+            for unit in self.units.players:
+                is_soldier = unit.unit_type == 'soldier'
+                if health_delta or moves_delta or (is_soldier and soldier_attack_delta):
+                    unit.max_health += health_delta
+                    unit.health += health_delta
+                    unit.max_moves += moves_delta
+                    unit.moves_remaining += moves_delta
+                    if is_soldier:
+                        unit.attack_power += soldier_attack_delta
+                    units_updated += 1
+
+        if new.production_bonuses != old.production_bonuses:
+            for city in self.cities:
+                city.invalidate_production()
+        if new.scout_vision != old.scout_vision or new.city_vision != old.city_vision:
+            self.update_visibility()
+        return units_updated
+
+    def spawn_units(self, kind, positions):
+        """Create one unit of type `kind` at each (x, y) in a single batch; returns the new units.
+
+        Stats come from one archetype lookup for the whole batch. Zombies go straight
+        into the enemy arrays (the returned units are their views).
+        """
+        if kind in ZOMBIE_TYPES:
+            archetype = get_archetype(kind, 'enemy', self.difficulty)
+            return self.units.enemies.add_batch(archetype, positions)
+
+        archetype = get_archetype(kind, 'player', self.difficulty, self.tech_modifiers.unit_bonuses)
+        units = [Unit(x, y, kind, 'player', archetype=archetype) for x, y in positions]
+        self.units.extend_players(units)
+        return units
+
+    def invalidate_defense_coverage(self):
+        """Drop the automated-defense coverage (call when a city or building is added or removed)"""
+        self.defense_coverage = None
+        self.threat_map = None  # Cities and buildings stop zombies too; rebuilt when next asked for
+
+    def get_defense_coverage(self):
+        """Tiles covered by automated defenses, dilated per zombie size; rebuilt only after
+        invalidate_defense_coverage().
+
+        Returns {size: set of anchor keys (y * ANCHOR_STRIDE + x)}: a zombie of that size
+        anchored on one of those tiles has at least one footprint tile in coverage.
+        """
+        max_size = self.units.enemies.max_size
+        if self.defense_coverage is not None and max_size in self.defense_coverage:
+            return self.defense_coverage
+        map_width = len(self.map_grid[0])
+        map_height = len(self.map_grid)
 
         # Track tiles that deal damage (cities and buildings)
         defense_tiles = set()
-
-        # Add all city tiles
         for city in self.cities:
             defense_tiles.add((city.x, city.y))
+            defense_tiles.update(city.building_locations.keys())
 
-        # Add all building tiles
-        for city in self.cities:
-            for (bx, by) in city.building_locations.keys():
-                defense_tiles.add((bx, by))
+        # Tiles adjacent (8 directions) to any defense tile
+        covered_tiles = set()
+        for def_x, def_y in defense_tiles:
+            for dy in (-1, 0, 1):
+                for dx in (-1, 0, 1):
+                    if dx or dy:
+                        covered_tiles.add((def_x + dx, def_y + dy))
+
+        # Dilate once more per zombie size: an NxN zombie anchored at (x, y) covers x..x+N-1, y..y+N-1
+        self.defense_coverage = {}
+        for size in range(1, max_size + 1):
+            anchors = set()
+            for tile_x, tile_y in covered_tiles:
+                for sy in range(size):
+                    for sx in range(size):
+                        x, y = tile_x - sx, tile_y - sy
+                        if 0 <= x < map_width and 0 <= y < map_height:
+                            anchors.add(y * ANCHOR_STRIDE + x)
+            self.defense_coverage[size] = anchors
+        return self.defense_coverage
 
-        # Track which zombies have been damaged this turn
-        processed_zombies = set()
+    def apply_automated_defenses(self):
+        """Cities and buildings damage adjacent zombies (Automated Defenses tech)"""
+        if not self.tech_modifiers.automated_defenses:
+            return {'damaged': 0, 'killed': 0}
 
-        # Check each defense tile for adjacent zombies
-        for def_x, def_y in defense_tiles:
-            # Check all 8 adjacent tiles
-            for dy in [-1, 0, 1]:
-                for dx in [-1, 0, 1]:
-                    if dx == 0 and dy == 0:
-                        continue
+        damage_per_hit = 10  # Fixed damage amount
+
+        # One pass over the zombie arrays against the cached coverage; each zombie is damaged at most once per turn
+        damaged_count, zombies_to_remove = self.units.enemies.damage_covered(self.get_defense_coverage(), damage_per_hit)
 
-                    check_x = def_x + dx
-                    check_y = def_y + dy
-
-                    # Find zombie at this location
-                    zombie = self.get_unit_at(check_x, check_y)
-                    if zombie and zombie.team == 'enemy' and zombie not in processed_zombies:
-                        # Only damage each zombie once per turn
-                        processed_zombies.add(zombie)
-                        zombie.health -= damage_per_hit
-                        damaged_count += 1
-
-                        if zombie.health <= 0:
-                            # Mark zombie for removal
-                            zombies_to_remove.append(zombie)
-                            # Award tech points for kill
-                            self.zombies_killed_count += 1
-                            if zombie.unit_type == 'super_zombie':
-                                self.tech_points += 5
-                            else:
-                                self.tech_points += 2
-
-        # Remove dead zombies
         for zombie in zombies_to_remove:
+            # Award tech points for kill
+            self.zombies_killed_count += 1
+            if zombie.unit_type == 'super_zombie':
+                self.tech_points += 5
+            else:
+                self.tech_points += 2
+            # Remove dead zombie
             self.units.remove(zombie)
+        if zombies_to_remove:
+            self.threat_map = None  # Rebuilt without the dead zombies when next asked for
 
         return {'damaged': damaged_count, 'killed': len(zombies_to_remove)}
 
+    def get_spawn_pool(self, size):
+        """Edge spawn anchors for NxN units, built once per map (see spawn_pool.py)"""
+        pool = self.spawn_pools.get(size)
+        if pool is None:
+            pool = self.spawn_pools[size] = EdgeSpawnPool(self.map_grid, size)
+        return pool
+
+    def get_path_cache(self):
+        """Cached A* paths over this map's movement costs (see pathfinding.py)"""
+        if self.path_cache is None:
+            from pathfinding import MovementCosts, PathCache
+            self.path_cache = PathCache(MovementCosts(self.map_grid), self.units.occupancy)
+        return self.path_cache
+
+    def find_path(self, unit, goal):
+        """Tiles a player unit walks through to reach goal (goal last), or None if unreachable"""
+        return self.get_path_cache().get((unit.x, unit.y), goal)
+
+    def get_reachable_area(self, unit):
+        """Tiles a player unit can walk to with its remaining moves (cached on the unit)"""
+        occupancy = self.units.occupancy
+        area = unit.reachable
+        if area is None or not area.is_current(occupancy, unit.x, unit.y, unit.moves_remaining):
+            from pathfinding import ReachableArea
+            area = unit.reachable = ReachableArea(self.get_path_cache().costs, occupancy,
+                                                  unit.x, unit.y, unit.moves_remaining)
+        return area
+
+    def get_threat_map(self):
+        """Threat map of the visible zombies (see threat_map.py), rebuilt after zombies spawn or die or the fog changes"""
+        if self.threat_map is None or self.threat_map.turn != self.turn:
+            from threat_map import ThreatMap
+            self.threat_map = ThreatMap(self)
+        return self.threat_map
+
+    def threat_at(self, x, y):
+        """Threat level of a tile for the coming zombie turn (0 = safe, 1 = can be attacked, 2 = zombies can walk here)"""
+        return self.get_threat_map().at(x, y)
+
+    def get_dormant_field(self):
+        """Field for moving zombies far from every target, with this turn's hot cells marked (None if LOD is off)"""
+        if not self.use_zombie_lod:
+            return None
+        field = self.dormant_field
+        if field is None or not field.is_current(self, rules.zombie_lod_refresh_turns):
+            from zombie_lod import DormantField
+            field = self.dormant_field = DormantField(self)
+        field.mark_hot(self, rules.zombie_lod_distance)
+        return field
+
     def spawn_zombies(self):
         """Spawn zombies at map edges, escalating with turn count and difficulty"""
-        import random
+        rng = self.rng.spawn
+        self.threat_map = None  # New zombies threaten tiles too; rebuilt when next asked for
 
         # Spawn zombies based on difficulty spawn rate
-        spawn_roll = random.random()
+        spawn_roll = rng.random()
         if spawn_roll > self.zombie_spawn_rate:
-            print(f"[Turn {self.turn}] No zombies spawned this turn (rolled {spawn_roll:.2f} > {self.zombie_spawn_rate})")
+            spawn_log.debug("[Turn %d] No zombies spawned this turn (rolled %.2f > %s)", self.turn, spawn_roll, self.zombie_spawn_rate)
             return  # No zombies this turn
 
-        print(f"[Turn {self.turn}] Zombies spawning! (rolled {spawn_roll:.2f} <= {self.zombie_spawn_rate})")
+        spawn_log.debug("[Turn %d] Zombies spawning! (rolled %.2f <= %s)", self.turn, spawn_roll, self.zombie_spawn_rate)
 
         # Calculate base spawn count based on turn (escalating difficulty)
         # Turn 1-5: 1-2 zombies per turn
@@ -675,57 +754,29 @@ class GameState:
 
         base_spawn_count = 0
         if self.turn <= 5:
-            base_spawn_count = random.randint(1, 2)
+            base_spawn_count = rng.randint(1, 2)
         elif self.turn <= 10:
-            base_spawn_count = random.randint(2, 3)
+            base_spawn_count = rng.randint(2, 3)
         elif self.turn <= 15:
-            base_spawn_count = random.randint(3, 4)
+            base_spawn_count = rng.randint(3, 4)
         elif self.turn <= 20:
-            base_spawn_count = random.randint(4, 5)
+            base_spawn_count = rng.randint(4, 5)
         elif self.turn <= 30:
-            base_spawn_count = random.randint(5, 7)
+            base_spawn_count = rng.randint(5, 7)
         elif self.turn <= 40:
-            base_spawn_count = random.randint(7, 10)
+            base_spawn_count = rng.randint(7, 10)
         else:
-            base_spawn_count = random.randint(10, 15)
+            base_spawn_count = rng.randint(10, 15)
 
         # Apply difficulty modifier - add some randomness within difficulty range
-        spawn_count = base_spawn_count + random.randint(self.zombie_spawn_count_min, self.zombie_spawn_count_max) - 1
-
-        map_width = len(self.map_grid[0])
-        map_height = len(self.map_grid)
+        spawn_count = base_spawn_count + rng.randint(self.zombie_spawn_count_min, self.zombie_spawn_count_max) - 1
 
-        from map_generator import TileType
+        # Draw the whole batch from the free non-water edge tiles (no per-zombie retries)
+        spawn_positions = self.get_spawn_pool(1).sample(rng, spawn_count, self.units.occupancy)
+        self.spawn_units('zombie', spawn_positions)
 
-        for _ in range(spawn_count):
-            # Try to find valid spawn location (not water, not occupied)
-            attempts = 0
-            while attempts < 20:
-                # Randomly choose which edge: 0=top, 1=right, 2=bottom, 3=left
-                edge = random.randint(0, 3)
-
-                if edge == 0:  # Top edge
-                    x = random.randint(0, map_width - 1)
-                    y = 0
-                elif edge == 1:  # Right edge
-                    x = map_width - 1
-                    y = random.randint(0, map_height - 1)
-                elif edge == 2:  # Bottom edge
-                    x = random.randint(0, map_width - 1)
-                    y = map_height - 1
-                else:  # Left edge
-                    x = 0
-                    y = random.randint(0, map_height - 1)
-
-                # Check if position is valid (not water, not occupied)
-                if (self.map_grid[y][x] != TileType.WATER and not self.get_unit_at(x, y)):
-                    zombie = Unit(x, y, 'zombie', 'enemy', self.difficulty)
-                    self.units.append(zombie)
-                    break
-                attempts += 1
-
-        if spawn_count > 0:
-            print(f"⚠ {spawn_count} zombie(s) have appeared at the map edges!")
+        if spawn_positions:
+            spawn_log.info("⚠ %d zombie(s) have appeared at the map edges!", len(spawn_positions))
 
         # Spawn super zombies after turn 25 (every 3-4 turns)
         if self.turn >= 25:
@@ -734,77 +785,42 @@ class GameState:
                 spawn_super = True
 
             if spawn_super:
-                # Try to spawn a super zombie at a map edge
-                # Need to ensure 2x2 space is available
-                edge = random.randint(0, 3)
-
-                # For super zombies, we need to be careful about edge placement
-                # Position (x,y) is top-left corner, occupies (x,y), (x+1,y), (x,y+1), (x+1,y+1)
-                if edge == 0:  # Top edge
-                    x = random.randint(0, map_width - 2)  # -2 to ensure room for 2x2
-                    y = 0
-                elif edge == 1:  # Right edge
-                    x = map_width - 2  # Place at right edge with room for size
-                    y = random.randint(0, map_height - 2)
-                elif edge == 2:  # Bottom edge
-                    x = random.randint(0, map_width - 2)
-                    y = map_height - 2
-                else:  # Left edge
-                    x = 0
-                    y = random.randint(0, map_height - 2)
-
-                # Check if all 4 tiles are free and not water
-                tiles_free = True
-                for dy in range(2):
-                    for dx in range(2):
-                        if (self.get_unit_at(x + dx, y + dy) or
-                            self.map_grid[y + dy][x + dx] == TileType.WATER):
-                            tiles_free = False
-                            break
-                    if not tiles_free:
-                        break
-
-                if tiles_free:
-                    super_zombie = Unit(x, y, 'super_zombie', 'enemy', self.difficulty)
-                    self.units.append(super_zombie)
+                # Super zombies need a free 2x2 footprint on land touching a map edge
+                # (position is the top-left corner, occupying (x,y), (x+1,y), (x,y+1), (x+1,y+1))
+                super_positions = self.get_spawn_pool(2).sample(rng, 1, self.units.occupancy)  # Sees this turn's zombies too
+                if super_positions:
+                    super_zombie, = self.spawn_units('super_zombie', super_positions)
                     # Display stats based on difficulty
-                    print(f"💀 A SUPER ZOMBIE has appeared! (HP: {super_zombie.max_health}, Attack: {super_zombie.attack_power})")
+                    spawn_log.info("💀 A SUPER ZOMBIE has appeared! (HP: %d, Attack: %d)", super_zombie.max_health, super_zombie.attack_power)
 
     def get_unit_at(self, x, y, exclude_unit=None):
         """Get unit at position, accounting for multi-tile units"""
-        for unit in self.units:
-            # Skip the excluded unit (used when checking if a unit can move to a position)
-            if exclude_unit and unit == exclude_unit:
-                continue
-
-            # Check if the position is within the unit's occupied area
-            if unit.size == 1:
-                # Normal 1x1 unit
-                if unit.x == x and unit.y == y:
-                    return unit
-            else:
-                # Multi-tile unit (2x2 for super zombies)
-                # Unit occupies (x, y) through (x+size-1, y+size-1)
-                if unit.x <= x < unit.x + unit.size and unit.y <= y < unit.y + unit.size:
-                    return unit
-        return None
+        if turn_profiler.enabled:
+            turn_profiler.count('get_unit_at_calls')
+        # O(1) lookup in the roster's occupancy grid, for any footprint size
+        # (exclude_unit skips the unit asking, when checking if it can move to a position)
+        return self.units.unit_at(x, y, exclude_unit)
+
+    def footprint_in_bounds(self, x, y, size=1):
+        """True if an NxN footprint anchored at (x, y) lies entirely on the map"""
+        return footprint_in_bounds(x, y, size, len(self.map_grid[0]), len(self.map_grid))
 
     def check_collision_for_multitile_unit(self, unit, new_x, new_y):
         """Check all tiles a multi-tile unit would occupy for collisions
         Returns tuple: (target_unit, target_city, target_building) or (None, None, None)"""
-        unit_size = getattr(unit, 'size', 1)
+        unit_size = unit.size
+
+        # Units: one occupancy-grid query for the whole footprint
+        target_unit = self.units.occupancy.unit_in_footprint(new_x, new_y, unit_size, exclude_unit=unit)
+        if target_unit:
+            return (target_unit, None, None)
 
-        # Check all tiles the unit would occupy
+        # Check the footprint tiles for cities and buildings
         for dy in range(unit_size):
             for dx in range(unit_size):
                 check_x = new_x + dx
                 check_y = new_y + dy
 
-                # Check for unit collision
-                target_unit = self.get_unit_at(check_x, check_y, exclude_unit=unit)
-                if target_unit:
-                    return (target_unit, None, None)
-
                 # Check for city collision
                 target_city = self.get_city_at(check_x, check_y)
                 if target_city:
@@ -851,588 +867,441 @@ class GameState:
             # Log what was dropped
             dropped_items = {k: v for k, v in unit.inventory.items() if v > 0}
             if dropped_items:
-                print(f"💀 {unit.unit_type} dropped: {dropped_items} at ({unit.x}, {unit.y})")
+                turn_log.info("💀 %s dropped: %s at (%d, %d)", unit.unit_type, dropped_items, unit.x, unit.y)
 
     def end_turn(self):
         """End current player's turn"""
         if self.current_team == 'player':
+            turn_profiler.begin_turn(self.turn, len(self.map_grid))
             self.current_team = 'enemy'
             # Reset enemy unit moves
-            for unit in self.units:
-                if unit.team == 'enemy':
-                    unit.reset_moves()
+            with turn_profiler.phase('reset_moves'):
+                self.units.enemies.reset_moves()
             # AI turn for zombies
-            self.execute_ai_turn()
+            with turn_profiler.phase('ai_turn'):
+                self.execute_ai_turn()
         else:
             self.current_team = 'player'
             self.turn += 1
             # Reset player unit moves
-            for unit in self.units:
-                if unit.team == 'player':
-                    unit.reset_moves()
+            with turn_profiler.phase('reset_moves'):
+                for unit in self.units:
+                    if unit.team == 'player':
+                        unit.reset_moves()
 
             # Award tech points for surviving (1 per turn)
             self.tech_points += 1
 
             # Handle cure manufacturing progress
-            if self.cure_manufacturing_city:
-                self.cure_manufacturing_turns_remaining -= 1
-                print(f"🧪 Cure manufacturing in progress: {self.cure_manufacturing_turns_remaining} turns remaining")
-                if self.cure_manufacturing_turns_remaining <= 0:
-                    # Cure is complete!
-                    self.manufacture_cure()
-                    print(f"🎉 CURE COMPLETE! The city survived the onslaught!")
+            with turn_profiler.phase('cure'):
+                if self.cure_manufacturing_city:
+                    self.cure_manufacturing_turns_remaining -= 1
+                    turn_log.info("🧪 Cure manufacturing in progress: %d turns remaining", self.cure_manufacturing_turns_remaining)
+                    if self.cure_manufacturing_turns_remaining <= 0:
+                        # Cure is complete!
+                        self.manufacture_cure()
+                        turn_log.info("🎉 CURE COMPLETE! The city survived the onslaught!")
 
             # Autosave at the start of player's turn
-            self.autosave()
+            with turn_profiler.phase('autosave'):
+                self.autosave()
 
             # Produce resources in all cities at the start of player's turn
-            for city in self.cities:
-                production = city.produce_resources(self)
-                # Print production report
-                if any(production.values()):
-                    prod_str = ', '.join([f"{k}: +{v}" for k, v in production.items() if v > 0])
-                    print(f"{city.name} produced: {prod_str}")
-
-                # Track resources for tech points (1 point per 500 resources)
-                total_produced = sum(production.values())
-                self.total_resources_produced += total_produced
-                tech_points_from_resources = self.total_resources_produced // 500
-                if tech_points_from_resources > 0:
-                    self.total_resources_produced -= tech_points_from_resources * 500
-                    self.tech_points += tech_points_from_resources
+            with turn_profiler.phase('production'):
+                for city in self.cities:
+                    production = city.produce_resources(self)
+                    # Production report (the string is only built if INFO is enabled)
+                    if any(production.values()) and turn_log.isEnabledFor(logging.INFO):
+                        prod_str = ', '.join([f"{k}: +{v}" for k, v in production.items() if v > 0])
+                        turn_log.info("%s produced: %s", city.name, prod_str)
+
+                    # Track resources for tech points (1 point per 500 resources)
+                    total_produced = sum(production.values())
+                    self.total_resources_produced += total_produced
+                    tech_points_from_resources = self.total_resources_produced // 500
+                    if tech_points_from_resources > 0:
+                        self.total_resources_produced -= tech_points_from_resources * 500
+                        self.tech_points += tech_points_from_resources
 
             # Spawn new zombies (escalating with turn count)
-            self.spawn_zombies()
+            with turn_profiler.phase('spawn'):
+                self.spawn_zombies()
 
             # Update fog of war
-            self.update_visibility()
+            with turn_profiler.phase('visibility'):
+                self.update_visibility()
+
+            self.finish_turn_profile()
+
+    def finish_turn_profile(self):
+        """Close the turn profiler record with unit totals for this turn"""
+        if turn_profiler.enabled:
+            zombie_total = len(self.units.enemies)
+            turn_profiler.end_turn(zombies_total=zombie_total,
+                                   player_units_total=len(self.units) - zombie_total,
+                                   cities_total=len(self.cities))
 
     def get_ai_visible_targets(self):
         """Get player units visible to ANY zombie (shared vision network)"""
-        visible_player_units = set()
-
-        # Check what each zombie can see
-        for zombie in self.units:
-            if zombie.team == 'enemy':
-                vision_range = 2  # Zombies have 2 tile vision
+        # Returned as a list in unit order (not a set) so target tie-breaks are reproducible
+        visible_player_units = []
+        vision_range = 2  # Zombies have 2 tile vision
+        zombies = self.units.enemies
 
-                # Check all player units
-                for pu in self.units:
-                    if pu.team == 'player':
-                        # Use Chebyshev distance (max of dx, dy) for vision
-                        distance = max(abs(pu.x - zombie.x), abs(pu.y - zombie.y))
-                        if distance <= vision_range:
-                            visible_player_units.add(pu)
+        # Check which player units any zombie can see (Chebyshev distance, scanned over the zombie arrays)
+        for pu in self.units.players:
+            if zombies.any_within(pu.x, pu.y, vision_range):
+                visible_player_units.append(pu)
 
         return visible_player_units
 
-    def collect_zombie_movements(self):
-        """Collect zombie movements for animation without executing them
-        Returns a list of (unit, old_x, old_y, new_x, new_y, action_type, action_data)"""
-        import random
-
-        movements = []
+    def execute_ai_turn(self):
+        """AI for zombie movement with fog of war; the steps taken are left in self.ai_actions"""
+        ai_turn = self.iter_ai_turn()
+        next(ai_turn)
+        with turn_profiler.phase('ai_movement'):
+            for _ in ai_turn:
+                pass
+
+    def iter_ai_turn(self):
+        """The zombie turn as a resumable generator.
+
+        The first step ages the zombies and picks visible targets, then yields how many
+        zombies will move; after that each step moves one zombie (all of its moves) and
+        yields how many have moved so far. The caller decides how many steps to run per
+        frame; the result is the same however the turn is sliced.
+        """
+        self.ai_actions = []
 
-        # Age all zombies and check for level-ups (instant, no animation needed)
-        for unit in self.units:
-            if unit.team == 'enemy' and (unit.unit_type == 'zombie' or unit.unit_type == 'super_zombie'):
-                unit.age_in_turns += 1
-                if unit.zombie_age_level_up():
-                    print(f"🧟 {unit.unit_type} leveled up to level {unit.level}! (Age: {unit.age_in_turns} turns)")
+        # Age all zombies and check for level-ups
+        with turn_profiler.phase('ai_aging'):
+            for unit in self.units.enemies.age_all():
+                ai_log.debug("🧟 %s leveled up to level %d! (Age: %d turns)", unit.unit_type, unit.level, unit.age_in_turns)
 
         # Get shared visible targets (zombies share vision network)
-        visible_player_units = self.get_ai_visible_targets()
+        with turn_profiler.phase('ai_targets'):
+            visible_player_units = self.get_ai_visible_targets()
+
+        # Player units don't move during the zombie turn: read their positions once
+        visible_player_positions = [(pu, pu.x, pu.y) for pu in visible_player_units]
+
+        # Zombies far from every target get cheap field steps instead (see zombie_lod.py)
+        with turn_profiler.phase('ai_lod'):
+            dormant_field = self.get_dormant_field()
+        record = self.ai_actions.append
+
+        zombies = [unit for unit in self.units.enemies
+                   if unit.unit_type == 'zombie' or unit.unit_type == 'super_zombie']
+        yield len(zombies)
+
+        for done, unit in enumerate(zombies, 1):
+            if dormant_field is not None and dormant_field.move_dormant(unit, record):
+                turn_profiler.count('zombies_dormant')
+            else:
+                self._move_zombie(unit, visible_player_positions)
+            yield done
+
+    def _move_zombie(self, unit, visible_player_positions):
+        """Move one zombie toward its chosen target until it runs out of moves, attacking whatever blocks the way"""
+        rng = self.rng.ai
 
         # Calculate map center for wandering behavior
         map_center_x = len(self.map_grid[0]) // 2
         map_center_y = len(self.map_grid) // 2
 
-        # Collect all movements for each zombie
-        for unit in self.units[:]:  # Use slice to avoid modification during iteration
-            if unit.team == 'enemy' and (unit.unit_type == 'zombie' or unit.unit_type == 'super_zombie'):
-                while unit.can_move():
-                    old_x, old_y = unit.x, unit.y
-                    movement = self._calculate_single_zombie_move(unit, visible_player_units, map_center_x, map_center_y)
-                    if movement:
-                        movements.append(movement)
-                    else:
-                        break  # No valid move found
-
-        return movements
-
-    def _calculate_single_zombie_move(self, unit, visible_player_units, map_center_x, map_center_y):
-        """Calculate a single zombie move and return movement data
-        Returns (unit, old_x, old_y, new_x, new_y, action_type, action_data) or None"""
-        import random
-
-        old_x, old_y = unit.x, unit.y
-        targets = []
-
-        # PRIORITY: If cure is being manufactured, ALL zombies target that city
-        if self.cure_manufacturing_city:
-            cure_city = self.cure_manufacturing_city
-            cure_city_distance = abs(cure_city.x - unit.x) + abs(cure_city.y - unit.y)
-
-            # Set cure city as primary target
-            targets.append(('city', cure_city, cure_city_distance))
-
-            # Also add nearby walls/units as fallback targets if zombie can't get closer to cure city
-            # Add visible player units near the zombie (within 3 tiles) as fallback
-            for pu in visible_player_units:
-                distance = abs(pu.x - unit.x) + abs(pu.y - unit.y)
-                if distance <= 3:
-                    # Add penalty so cure city is still preferred
-                    targets.append(('unit', pu, distance + 500))
-
-            # Add buildings near the cure city as fallback (especially walls blocking the path)
-            for (bx, by), building in cure_city.building_locations.items():
-                distance = abs(bx - unit.x) + abs(by - unit.y)
-                # Walls get less penalty during cure manufacturing (zombies need to break through)
-                if building['type'] == 'wall':
-                    targets.append(('building', (cure_city, bx, by, building), distance + 100))
-                else:
-                    targets.append(('building', (cure_city, bx, by, building), distance + 500))
-        else:
-            # Normal targeting behavior (when cure is NOT being manufactured)
-            # Add visible player units as targets (fog of war)
-            for pu in visible_player_units:
-                targets.append(('unit', pu, abs(pu.x - unit.x) + abs(pu.y - unit.y)))
+        # Every step is recorded for the animator (see ai_actions.py)
+        record = self.ai_actions.append
 
-            # Add cities as targets (permanent knowledge)
-            for city in self.cities:
-                targets.append(('city', city, abs(city.x - unit.x) + abs(city.y - unit.y)))
+        turn_profiler.count('zombies_processed')
+        while unit.can_move():
+            targets = []
+            # Enemy units are views onto the zombie arrays: read the position once per step
+            unit_x, unit_y = unit.x, unit.y
 
-            # Add buildings as targets (permanent knowledge)
-            # Walls are deprioritized with a large distance penalty
-            for city in self.cities:
-                for (bx, by), building in city.building_locations.items():
-                    distance = abs(bx - unit.x) + abs(by - unit.y)
-                    # Add large penalty to walls so they're only targeted if nothing else is available
+            # PRIORITY: If cure is being manufactured, ALL zombies target that city
+            if self.cure_manufacturing_city:
+                cure_city = self.cure_manufacturing_city
+                cure_city_distance = abs(cure_city.x - unit_x) + abs(cure_city.y - unit_y)
+
+                # Set cure city as primary target
+                targets.append(('city', cure_city, cure_city_distance))
+
+                # Also add nearby walls/units as fallback targets if zombie can't get closer to cure city
+                # Add visible player units near the zombie (within 3 tiles) as fallback
+                for pu, pu_x, pu_y in visible_player_positions:
+                    distance = abs(pu_x - unit_x) + abs(pu_y - unit_y)
+                    if distance <= 3:
+                        # Add penalty so cure city is still preferred
+                        targets.append(('unit', pu, distance + 500))
+
+                # Add buildings near the cure city as fallback (especially walls blocking the path)
+                for (bx, by), building in cure_city.building_locations.items():
+                    distance = abs(bx - unit_x) + abs(by - unit_y)
+                    # Walls get less penalty during cure manufacturing (zombies need to break through)
                     if building['type'] == 'wall':
-                        distance += 1000
-                    targets.append(('building', (city, bx, by, building), distance))
-
-        if targets:
-            # Find nearest target (walls will have +1000 distance penalty in normal mode, less during cure)
-            target_type, target_data, _ = min(targets, key=lambda t: t[2])
-
-            if target_type == 'unit':
-                target_x, target_y = target_data.x, target_data.y
-            elif target_type == 'city':
-                target_x, target_y = target_data.x, target_data.y
-            else:  # building
-                _, target_x, target_y, _ = target_data
-
-            # Calculate preferred direction toward target
-            dx = 1 if target_x > unit.x else -1 if target_x < unit.x else 0
-            dy = 1 if target_y > unit.y else -1 if target_y < unit.y else 0
-
-            # Random movement if same position
-            if dx == 0 and dy == 0:
-                dx = random.choice([-1, 0, 1])
-                dy = random.choice([-1, 0, 1])
-
-            # Try primary direction first, then perpendicular directions if blocked by friendly
-            move_options = []
-
-            if dx != 0 and dy != 0:
-                move_options = [(dx, dy), (dx, 0), (0, dy)]
-            elif dx != 0:
-                move_options = [(dx, 0), (dx, 1), (dx, -1)]
-            elif dy != 0:
-                move_options = [(0, dy), (1, dy), (-1, dy)]
-            else:
-                move_options = [(random.choice([-1, 0, 1]), random.choice([-1, 0, 1]))]
-
-            # Try each move option
-            for try_dx, try_dy in move_options:
-                if try_dx == 0 and try_dy == 0:
-                    continue
-
-                new_x = unit.x + try_dx
-                new_y = unit.y + try_dy
-
-                # Check bounds
-                unit_size = getattr(unit, 'size', 1)
-                bounds_ok = True
-                if unit_size > 1:
-                    for sy in range(unit_size):
-                        for sx in range(unit_size):
-                            if not (0 <= new_x + sx < len(self.map_grid[0]) and
-                                   0 <= new_y + sy < len(self.map_grid)):
-                                bounds_ok = False
-                                break
-                        if not bounds_ok:
-                            break
-                else:
-                    bounds_ok = (0 <= new_x < len(self.map_grid[0]) and
-                                0 <= new_y < len(self.map_grid))
-
-                if not bounds_ok:
-                    continue
-
-                # Check what's at the target position
-                if unit_size > 1:
-                    target_unit, target_city, target_building = self.check_collision_for_multitile_unit(unit, new_x, new_y)
-                else:
-                    target_unit = self.get_unit_at(new_x, new_y, exclude_unit=unit)
-                    target_city = self.get_city_at(new_x, new_y)
-                    target_building = self.get_building_at(new_x, new_y)
-
-                if target_unit and target_unit.team != unit.team:
-                    # Return attack action
-                    return (unit, old_x, old_y, new_x, new_y, 'attack_unit', target_unit)
-                elif target_city:
-                    # Return attack city action
-                    return (unit, old_x, old_y, new_x, new_y, 'attack_city', target_city)
-                elif target_building:
-                    # Check if there's a player unit on this building (prioritize unit)
-                    unit_on_building = self.get_unit_at(new_x, new_y, exclude_unit=unit)
-                    if unit_on_building and unit_on_building.team == 'player':
-                        return (unit, old_x, old_y, new_x, new_y, 'attack_unit_on_building', (unit_on_building, target_building))
+                        targets.append(('building', (cure_city, bx, by, building), distance + 100))
                     else:
-                        return (unit, old_x, old_y, new_x, new_y, 'attack_building', target_building)
-                elif not target_unit:
-                    # Check if target is a wall (impassable to zombies)
-                    if target_building and target_building['type'] == 'wall':
-                        continue
-                    # Check if target is water (impassable)
-                    from map_generator import TileType
-                    terrain = self.map_grid[new_y][new_x]
-                    if terrain == TileType.WATER:
+                        targets.append(('building', (cure_city, bx, by, building), distance + 500))
+            else:
+                # Normal targeting behavior (when cure is NOT being manufactured)
+                # Add visible player units as targets (fog of war)
+                for pu, pu_x, pu_y in visible_player_positions:
+                    targets.append(('unit', pu, abs(pu_x - unit_x) + abs(pu_y - unit_y)))
+
+                # Add cities as targets (permanent knowledge)
+                for city in self.cities:
+                    targets.append(('city', city, abs(city.x - unit_x) + abs(city.y - unit_y)))
+
+                # Add buildings as targets (permanent knowledge)
+                # Walls are deprioritized with a large distance penalty
+                for city in self.cities:
+                    for (bx, by), building in city.building_locations.items():
+                        distance = abs(bx - unit_x) + abs(by - unit_y)
+                        # Add large penalty to walls so they're only targeted if nothing else is available
+                        if building['type'] == 'wall':
+                            distance += 1000
+                        targets.append(('building', (city, bx, by, building), distance))
+
+            if targets:
+                # Find nearest target (walls will have +1000 distance penalty in normal mode, less during cure)
+                target_type, target_data, _ = min(targets, key=lambda t: t[2])
+
+                if target_type == 'unit':
+                    target_x, target_y = target_data.x, target_data.y
+                elif target_type == 'city':
+                    target_x, target_y = target_data.x, target_data.y
+                else:  # building
+                    _, target_x, target_y, _ = target_data
+
+                # Evaluate all 8 directions, sorted by which gets closest to target
+                # Randomize among equally good options to prevent lining up
+                all_directions = [(-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0), (1, 1)]
+                current_dist = abs(target_x - unit_x) + abs(target_y - unit_y)
+
+                # Score each direction by resulting distance to target
+                scored_dirs = []
+                for d in all_directions:
+                    new_dist = abs(target_x - (unit_x + d[0])) + abs(target_y - (unit_y + d[1]))
+                    scored_dirs.append((new_dist, d))
+
+                # Sort by distance (closest first), then shuffle ties randomly
+                rng.shuffle(scored_dirs)  # Shuffle first so ties are random
+                scored_dirs.sort(key=lambda x: x[0])
+
+                move_options = [d for _, d in scored_dirs]
+
+                # Try each move option until we find a valid one
+                moved = False
+                for try_dx, try_dy in move_options:
+                    if try_dx == 0 and try_dy == 0:
                         continue
-                    # Return move action
-                    return (unit, old_x, old_y, new_x, new_y, 'move', terrain)
 
-        return None  # No valid move found
-
-    def execute_ai_turn(self):
-        """AI for zombie movement with fog of war"""
-        import random
-
-        # Age all zombies and check for level-ups
-        for unit in self.units:
-            if unit.team == 'enemy' and (unit.unit_type == 'zombie' or unit.unit_type == 'super_zombie'):
-                unit.age_in_turns += 1
-                if unit.zombie_age_level_up():
-                    print(f"🧟 {unit.unit_type} leveled up to level {unit.level}! (Age: {unit.age_in_turns} turns)")
+                    new_x = unit_x + try_dx
+                    new_y = unit_y + try_dy
 
-        # Get shared visible targets (zombies share vision network)
-        visible_player_units = self.get_ai_visible_targets()
+                    # Check bounds (the whole footprint for multi-tile units)
+                    unit_size = unit.size
+                    bounds_ok = self.footprint_in_bounds(new_x, new_y, unit_size)
 
-        # Calculate map center for wandering behavior
-        map_center_x = len(self.map_grid[0]) // 2
-        map_center_y = len(self.map_grid) // 2
+                    if not bounds_ok:
+                        continue  # Try next move option
 
-        for unit in self.units:
-            if unit.team == 'enemy' and (unit.unit_type == 'zombie' or unit.unit_type == 'super_zombie'):
-                while unit.can_move():
-                    targets = []
-
-                    # PRIORITY: If cure is being manufactured, ALL zombies target that city
-                    if self.cure_manufacturing_city:
-                        cure_city = self.cure_manufacturing_city
-                        cure_city_distance = abs(cure_city.x - unit.x) + abs(cure_city.y - unit.y)
-
-                        # Set cure city as primary target
-                        targets.append(('city', cure_city, cure_city_distance))
-
-                        # Also add nearby walls/units as fallback targets if zombie can't get closer to cure city
-                        # Add visible player units near the zombie (within 3 tiles) as fallback
-                        for pu in visible_player_units:
-                            distance = abs(pu.x - unit.x) + abs(pu.y - unit.y)
-                            if distance <= 3:
-                                # Add penalty so cure city is still preferred
-                                targets.append(('unit', pu, distance + 500))
-
-                        # Add buildings near the cure city as fallback (especially walls blocking the path)
-                        for (bx, by), building in cure_city.building_locations.items():
-                            distance = abs(bx - unit.x) + abs(by - unit.y)
-                            # Walls get less penalty during cure manufacturing (zombies need to break through)
-                            if building['type'] == 'wall':
-                                targets.append(('building', (cure_city, bx, by, building), distance + 100))
-                            else:
-                                targets.append(('building', (cure_city, bx, by, building), distance + 500))
-                    else:
-                        # Normal targeting behavior (when cure is NOT being manufactured)
-                        # Add visible player units as targets (fog of war)
-                        for pu in visible_player_units:
-                            targets.append(('unit', pu, abs(pu.x - unit.x) + abs(pu.y - unit.y)))
-
-                        # Add cities as targets (permanent knowledge)
-                        for city in self.cities:
-                            targets.append(('city', city, abs(city.x - unit.x) + abs(city.y - unit.y)))
-
-                        # Add buildings as targets (permanent knowledge)
-                        # Walls are deprioritized with a large distance penalty
-                        for city in self.cities:
-                            for (bx, by), building in city.building_locations.items():
-                                distance = abs(bx - unit.x) + abs(by - unit.y)
-                                # Add large penalty to walls so they're only targeted if nothing else is available
-                                if building['type'] == 'wall':
-                                    distance += 1000
-                                targets.append(('building', (city, bx, by, building), distance))
-
-                    if targets:
-                        # Find nearest target (walls will have +1000 distance penalty in normal mode, less during cure)
-                        target_type, target_data, _ = min(targets, key=lambda t: t[2])
-
-                        if target_type == 'unit':
-                            target_x, target_y = target_data.x, target_data.y
-                        elif target_type == 'city':
-                            target_x, target_y = target_data.x, target_data.y
-                        else:  # building
-                            _, target_x, target_y, _ = target_data
-
-                        # Evaluate all 8 directions, sorted by which gets closest to target
-                        # Randomize among equally good options to prevent lining up
-                        all_directions = [(-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0), (1, 1)]
-                        current_dist = abs(target_x - unit.x) + abs(target_y - unit.y)
-
-                        # Score each direction by resulting distance to target
-                        scored_dirs = []
-                        for d in all_directions:
-                            new_dist = abs(target_x - (unit.x + d[0])) + abs(target_y - (unit.y + d[1]))
-                            scored_dirs.append((new_dist, d))
-
-                        # Sort by distance (closest first), then shuffle ties randomly
-                        random.shuffle(scored_dirs)  # Shuffle first so ties are random
-                        scored_dirs.sort(key=lambda x: x[0])
-
-                        move_options = [d for _, d in scored_dirs]
-
-                        # Try each move option until we find a valid one
-                        moved = False
-                        for try_dx, try_dy in move_options:
-                            if try_dx == 0 and try_dy == 0:
-                                continue
-
-                            new_x = unit.x + try_dx
-                            new_y = unit.y + try_dy
-
-                            # Check bounds (for multi-tile units, check all tiles)
-                            unit_size = getattr(unit, 'size', 1)
-                            bounds_ok = True
-                            if unit_size > 1:
-                                # Check all tiles the unit would occupy
-                                for sy in range(unit_size):
-                                    for sx in range(unit_size):
-                                        if not (0 <= new_x + sx < len(self.map_grid[0]) and
-                                               0 <= new_y + sy < len(self.map_grid)):
-                                            bounds_ok = False
-                                            break
-                                    if not bounds_ok:
-                                        break
-                            else:
-                                bounds_ok = (0 <= new_x < len(self.map_grid[0]) and
-                                            0 <= new_y < len(self.map_grid))
-
-                            if not bounds_ok:
-                                continue  # Try next move option
-
-                            # Check what's at the target position (for multi-tile units, check ALL tiles)
-                            if unit_size > 1:
-                                target_unit, target_city, target_building = self.check_collision_for_multitile_unit(unit, new_x, new_y)
-                            else:
-                                target_unit = self.get_unit_at(new_x, new_y, exclude_unit=unit)
-                                target_city = self.get_city_at(new_x, new_y)
-                                target_building = self.get_building_at(new_x, new_y)
-
-                            if target_unit and target_unit.team != unit.team:
-                                # Attack the enemy unit
-                                damage = unit.attack_power
-
-                                # Check if target is standing on a wall tile and has fortification tech
-                                if target_unit.team == 'player' and self.has_tech('fortification'):
-                                    building_at_location = self.get_building_at(target_unit.x, target_unit.y)
-                                    if building_at_location and building_at_location['type'] == 'wall':
-                                        damage = int(damage * 0.5)  # 50% damage reduction
-                                        print(f"Fortification: Damage reduced by 50%!")
-
-                                target_unit.health -= damage
-                                print(f"Zombie attacks {target_unit.unit_type} for {damage} damage! Health: {target_unit.health}")
-
-                                # Record attack target for animation
-                                unit.last_attack_target = (new_x, new_y)
-
-                                if target_unit.health <= 0:
-                                    # Drop inventory before removing unit
-                                    self.drop_unit_inventory(target_unit)
-
-                                    self.units.remove(target_unit)
-                                    print(f"{target_unit.unit_type} was killed by zombie!")
-                                    self.update_visibility()
-                                unit.moves_remaining -= 1
-                                moved = True
-                                break
-                            elif target_city:
-                                # Attack the city
-                                target_city.health -= unit.attack_power
-                                print(f"Zombie attacks {target_city.name}! City Health: {target_city.health}/{target_city.max_health}")
-
-                                # Record attack target for animation
-                                unit.last_attack_target = (new_x, new_y)
-
-                                if target_city.health <= 0:
-                                    print(f"{target_city.name} has been destroyed by zombies!")
-                                    self.cities.remove(target_city)
-                                    self.update_visibility()
-                                unit.moves_remaining -= 1
-                                moved = True
-                                break
-                            elif target_building:
-                                # Check if there's a player unit on this building (prioritize unit)
-                                unit_on_building = self.get_unit_at(new_x, new_y, exclude_unit=unit)
-                                if unit_on_building and unit_on_building.team == 'player':
-                                    # Attack the unit instead of the building
-                                    damage = unit.attack_power
-
-                                    # Check if target is standing on a wall tile and has fortification tech
-                                    if self.has_tech('fortification'):
-                                        building_at_location = self.get_building_at(unit_on_building.x, unit_on_building.y)
-                                        if building_at_location and building_at_location['type'] == 'wall':
-                                            damage = int(damage * 0.5)  # 50% damage reduction
-                                            print(f"Fortification: Damage reduced by 50%!")
-
-                                    unit_on_building.health -= damage
-                                    print(f"Zombie attacks {unit_on_building.unit_type} on {target_building['type']} for {damage} damage! Health: {unit_on_building.health}")
-
-                                    # Record attack target for animation
-                                    unit.last_attack_target = (new_x, new_y)
-
-                                    if unit_on_building.health <= 0:
-                                        # Drop inventory before removing unit
-                                        self.drop_unit_inventory(unit_on_building)
-                                        self.units.remove(unit_on_building)
-                                        print(f"{unit_on_building.unit_type} was killed by zombie!")
-                                        self.update_visibility()
-                                else:
-                                    # Attack the building
-                                    target_building['health'] -= unit.attack_power
-                                    print(f"Zombie attacks {target_building['type']}! Building Health: {target_building['health']}/{target_building['max_health']}")
-
-                                    # Record attack target for animation
-                                    unit.last_attack_target = (new_x, new_y)
-
-                                    if target_building['health'] <= 0:
-                                        print(f"{target_building['type']} has been destroyed by zombies!")
-                                        # Find and remove the building
-                                        for city in self.cities:
-                                            if (new_x, new_y) in city.building_locations:
-                                                del city.building_locations[(new_x, new_y)]
-                                                if target_building['type'] in city.buildings:
-                                                    city.buildings.remove(target_building['type'])
-                                                break
-                                unit.moves_remaining -= 1
-                                moved = True
-                                break
-                            elif not target_unit:
-                                # Check if target is a wall (impassable to zombies)
-                                if target_building and target_building['type'] == 'wall':
-                                    continue
-                                # Check if target is water (impassable)
-                                from map_generator import TileType
-                                terrain = self.map_grid[new_y][new_x]
-                                if terrain == TileType.WATER:
-                                    continue
-                                # Move to empty tile
-                                unit.move(try_dx, try_dy, terrain)
-                                moved = True
-                                break
-                            # else: blocked by friendly unit, try next move option
-
-                        # If no valid move found after trying all options, stop
-                        if not moved:
-                            break
+                    # Check what's at the target position (for multi-tile units, check ALL tiles)
+                    if unit_size > 1:
+                        target_unit, target_city, target_building = self.check_collision_for_multitile_unit(unit, new_x, new_y)
                     else:
-                        # No targets visible - wander randomly toward map center
-                        # Calculate direction toward center with random variation
-                        dx_to_center = 1 if map_center_x > unit.x else -1 if map_center_x < unit.x else 0
-                        dy_to_center = 1 if map_center_y > unit.y else -1 if map_center_y < unit.y else 0
-
-                        # 40% chance to move toward center, 60% random
-                        if random.random() < 0.4:
-                            dx = dx_to_center
-                            dy = dy_to_center
+                        target_unit = self.get_unit_at(new_x, new_y, exclude_unit=unit)
+                        target_city = self.get_city_at(new_x, new_y)
+                        target_building = self.get_building_at(new_x, new_y)
+
+                    if target_unit and target_unit.team != unit.team:
+                        # Attack the enemy unit
+                        damage = unit.attack_power
+
+                        # Check if target is standing on a wall tile and has fortification tech
+                        wall_damage_multiplier = self.tech_modifiers.wall_damage_multiplier
+                        if target_unit.team == 'player' and wall_damage_multiplier != 1:
+                            building_at_location = self.get_building_at(target_unit.x, target_unit.y)
+                            if building_at_location and building_at_location['type'] == 'wall':
+                                damage = int(damage * wall_damage_multiplier)  # 50% damage reduction
+                                ai_log.debug("Fortification: Damage reduced by 50%%!")
+
+                        target_unit.health -= damage
+                        ai_log.debug("Zombie attacks %s for %d damage! Health: %d", target_unit.unit_type, damage, target_unit.health)
+                        record(AIAction(ATTACK_UNIT, unit, unit_x, unit_y, new_x, new_y))
+
+                        if target_unit.health <= 0:
+                            record(AIAction(KILL, unit, unit_x, unit_y, new_x, new_y))
+                            # Drop inventory before removing unit
+                            self.drop_unit_inventory(target_unit)
+
+                            self.units.remove(target_unit)
+                            ai_log.info("%s was killed by zombie!", target_unit.unit_type)
+                            self.update_visibility()
+                        unit.moves_remaining -= 1
+                        moved = True
+                        break
+                    elif target_city:
+                        # Attack the city
+                        target_city.health -= unit.attack_power
+                        ai_log.debug("Zombie attacks %s! City Health: %d/%d", target_city.name, target_city.health, target_city.max_health)
+                        record(AIAction(ATTACK_CITY, unit, unit_x, unit_y, new_x, new_y))
+
+                        if target_city.health <= 0:
+                            record(AIAction(KILL, unit, unit_x, unit_y, new_x, new_y))
+                            ai_log.info("%s has been destroyed by zombies!", target_city.name)
+                            self.cities.remove(target_city)
+                            self.invalidate_defense_coverage()
+                            self.update_visibility()
+                        unit.moves_remaining -= 1
+                        moved = True
+                        break
+                    elif target_building:
+                        # Check if there's a player unit on this building (prioritize unit)
+                        unit_on_building = self.get_unit_at(new_x, new_y, exclude_unit=unit)
+                        if unit_on_building and unit_on_building.team == 'player':
+                            # Attack the unit instead of the building
+                            damage = unit.attack_power
+
+                            # Check if target is standing on a wall tile and has fortification tech
+                            wall_damage_multiplier = self.tech_modifiers.wall_damage_multiplier
+                            if wall_damage_multiplier != 1:
+                                building_at_location = self.get_building_at(unit_on_building.x, unit_on_building.y)
+                                if building_at_location and building_at_location['type'] == 'wall':
+                                    damage = int(damage * wall_damage_multiplier)  # 50% damage reduction
+                                    ai_log.debug("Fortification: Damage reduced by 50%%!")
+
+                            unit_on_building.health -= damage
+                            ai_log.debug("Zombie attacks %s on %s for %d damage! Health: %d", unit_on_building.unit_type, target_building['type'], damage, unit_on_building.health)
+                            record(AIAction(ATTACK_UNIT, unit, unit_x, unit_y, new_x, new_y))
+
+                            if unit_on_building.health <= 0:
+                                record(AIAction(KILL, unit, unit_x, unit_y, new_x, new_y))
+                                # Drop inventory before removing unit
+                                self.drop_unit_inventory(unit_on_building)
+                                self.units.remove(unit_on_building)
+                                ai_log.info("%s was killed by zombie!", unit_on_building.unit_type)
+                                self.update_visibility()
                         else:
-                            dx = random.choice([-1, 0, 1])
-                            dy = random.choice([-1, 0, 1])
-
-                        # Add some randomness even when moving toward center
-                        if random.random() < 0.3:
-                            dx = random.choice([-1, 0, 1])
-                        if random.random() < 0.3:
-                            dy = random.choice([-1, 0, 1])
-
-                        # Don't stay still
-                        if dx == 0 and dy == 0:
-                            dx = random.choice([-1, 0, 1])
-                            dy = random.choice([-1, 0, 1])
-
-                        new_x = unit.x + dx
-                        new_y = unit.y + dy
-
-                        # Check bounds
-                        unit_size = getattr(unit, 'size', 1)
-                        bounds_ok = True
-                        if unit_size > 1:
-                            for sy in range(unit_size):
-                                for sx in range(unit_size):
-                                    if not (0 <= new_x + sx < len(self.map_grid[0]) and
-                                           0 <= new_y + sy < len(self.map_grid)):
-                                        bounds_ok = False
+                            # Attack the building
+                            target_building['health'] -= unit.attack_power
+                            ai_log.debug("Zombie attacks %s! Building Health: %d/%d", target_building['type'], target_building['health'], target_building['max_health'])
+                            record(AIAction(ATTACK_BUILDING, unit, unit_x, unit_y, new_x, new_y))
+
+                            if target_building['health'] <= 0:
+                                record(AIAction(KILL, unit, unit_x, unit_y, new_x, new_y))
+                                ai_log.info("%s has been destroyed by zombies!", target_building['type'])
+                                # Find and remove the building
+                                for city in self.cities:
+                                    if (new_x, new_y) in city.building_locations:
+                                        del city.building_locations[(new_x, new_y)]
+                                        city.invalidate_production()
+                                        self.invalidate_defense_coverage()
+                                        if target_building['type'] in city.buildings:
+                                            city.buildings.remove(target_building['type'])
                                         break
-                                if not bounds_ok:
-                                    break
-                        else:
-                            bounds_ok = (0 <= new_x < len(self.map_grid[0]) and
-                                        0 <= new_y < len(self.map_grid))
-
-                        if bounds_ok:
-                            # Check for collisions
-                            if unit_size > 1:
-                                target_unit, target_city, target_building = self.check_collision_for_multitile_unit(unit, new_x, new_y)
-                            else:
-                                target_unit = self.get_unit_at(new_x, new_y, exclude_unit=unit)
-                                target_city = self.get_city_at(new_x, new_y)
-                                target_building = self.get_building_at(new_x, new_y)
-
-                            if not target_unit and not target_city:
-                                # Check if it's a wall (impassable to zombies)
-                                if target_building and target_building['type'] == 'wall':
-                                    # Walls are impassable, stop moving
-                                    break
-                                # Move to empty tile
-                                terrain = self.map_grid[new_y][new_x]
-                                unit.move(dx, dy, terrain)
-                            else:
-                                # Blocked, stop moving
-                                break
-                        else:
-                            # Out of bounds, stop moving
+                        unit.moves_remaining -= 1
+                        moved = True
+                        break
+                    elif not target_unit:
+                        # Check if target is a wall (impassable to zombies)
+                        if target_building and target_building['type'] == 'wall':
+                            continue
+                        # Check if target is water (impassable)
+                        from map_generator import TileType
+                        terrain = self.map_grid[new_y][new_x]
+                        if terrain == TileType.WATER:
+                            continue
+                        # Move to empty tile
+                        unit.move(try_dx, try_dy, terrain)
+                        record(AIAction(MOVE, unit, unit_x, unit_y, new_x, new_y))
+                        moved = True
+                        break
+                    # else: blocked by friendly unit, try next move option
+
+                # If no valid move found after trying all options, stop
+                if not moved:
+                    break
+            else:
+                # No targets visible - wander randomly toward map center
+                # Calculate direction toward center with random variation
+                dx_to_center = 1 if map_center_x > unit.x else -1 if map_center_x < unit.x else 0
+                dy_to_center = 1 if map_center_y > unit.y else -1 if map_center_y < unit.y else 0
+
+                # 40% chance to move toward center, 60% random
+                if rng.random() < 0.4:
+                    dx = dx_to_center
+                    dy = dy_to_center
+                else:
+                    dx = rng.choice([-1, 0, 1])
+                    dy = rng.choice([-1, 0, 1])
+
+                # Add some randomness even when moving toward center
+                if rng.random() < 0.3:
+                    dx = rng.choice([-1, 0, 1])
+                if rng.random() < 0.3:
+                    dy = rng.choice([-1, 0, 1])
+
+                # Don't stay still
+                if dx == 0 and dy == 0:
+                    dx = rng.choice([-1, 0, 1])
+                    dy = rng.choice([-1, 0, 1])
+
+                new_x = unit.x + dx
+                new_y = unit.y + dy
+
+                # Check bounds (the whole footprint for multi-tile units)
+                unit_size = unit.size
+                bounds_ok = self.footprint_in_bounds(new_x, new_y, unit_size)
+
+                if bounds_ok:
+                    # Check for collisions
+                    if unit_size > 1:
+                        target_unit, target_city, target_building = self.check_collision_for_multitile_unit(unit, new_x, new_y)
+                    else:
+                        target_unit = self.get_unit_at(new_x, new_y, exclude_unit=unit)
+                        target_city = self.get_city_at(new_x, new_y)
+                        target_building = self.get_building_at(new_x, new_y)
+
+                    if not target_unit and not target_city:
+                        # Check if it's a wall (impassable to zombies)
+                        if target_building and target_building['type'] == 'wall':
+                            # Walls are impassable, stop moving
                             break
+                        # Move to empty tile
+                        terrain = self.map_grid[new_y][new_x]
+                        unit.move(dx, dy, terrain)
+                        record(AIAction(MOVE, unit, new_x - dx, new_y - dy, new_x, new_y))
+                    else:
+                        # Blocked, stop moving
+                        break
+                else:
+                    # Out of bounds, stop moving
+                    break
 
     def update_visibility(self):
         """Update which tiles are visible (and explored) based on player unit positions"""
+        # The threat map only counts visible zombies, so it is rebuilt under the new fog when next asked for
+        self.threat_map = None
         # Reset visibility
         for y in range(len(self.visible)):
             for x in range(len(self.visible[0])):
                 self.visible[y][x] = False
 
         # Mark tiles visible from player units and cities
+        scout_vision = self.tech_modifiers.scout_vision
         for unit in self.units:
             if unit.team == 'player':
                 # Scouts have vision range of 3 (or 4 with tech), others have 2
                 if unit.unit_type == 'scout':
-                    vision_range = 4 if self.has_tech('scout_training') else 3
+                    vision_range = scout_vision
                 else:
                     vision_range = 2
                 self._reveal_area(unit.x, unit.y, vision_range)
 
+        # Cities have vision range of 3 (or 5 with watchtower tech)
+        city_vision = self.tech_modifiers.city_vision
         for city in self.cities:
-            # Cities have vision range of 3 (or 5 with watchtower tech)
-            city_vision = 5 if self.has_tech('watchtower') else 3
             self._reveal_area(city.x, city.y, city_vision)
 
             # Buildings also provide vision
@@ -1454,6 +1323,7 @@ class GameState:
 
         # Award tech points for exploration (1 point per 50 tiles)
         if newly_explored > 0:
+            turn_profiler.count('tiles_revealed', newly_explored)
             self.tiles_explored_count += newly_explored
             tech_points_from_exploration = self.tiles_explored_count // 50
             if tech_points_from_exploration > 0:
@@ -1462,7 +1332,7 @@ class GameState:
 
     def has_tech(self, tech_id):
         """Check if a technology has been researched"""
-        return tech_id in self.researched_techs
+        return bool(self.researched_techs.mask & TECH_BITS.get(tech_id, 0))
 
     def can_found_city(self, x, y):
         """Check if a city can be founded at this location"""
@@ -1483,7 +1353,7 @@ class GameState:
     def start_cure_manufacturing(self, city):
         """Start the cure manufacturing process"""
         self.cure_manufacturing_city = city
-        self.cure_manufacturing_turns_remaining = self.cure_manufacturing_turns_required[self.difficulty]
+        self.cure_manufacturing_turns_remaining = self.cure_manufacturing_turns_required
         print(f"🧪 DEBUG: start_cure_manufacturing called! City: {city.name}, Turns: {self.cure_manufacturing_turns_remaining}")
 
     def manufacture_cure(self):
@@ -1499,18 +1369,20 @@ class GameState:
                 self.visible[y][x] = True
 
         # Convert all zombies to player survivors
-        zombies = [u for u in self.units if u.team == 'enemy']
+        zombies = list(self.units.enemies)
         for zombie in zombies:
-            # Convert zombie to survivor
-            zombie.team = 'player'
-            zombie.unit_type = 'survivor'
+            # Convert zombie to survivor: a new player Unit takes the zombie's place
+            # (zombies live in the enemy arrays, survivors are ordinary Unit objects)
+            survivor = Unit(zombie.x, zombie.y, 'survivor', 'player', self.difficulty)
             # Reset stats to survivor defaults
-            zombie.health = 100
-            zombie.max_health = 100
-            zombie.max_moves = 3
-            zombie.attack_power = 10
-            zombie.size = 1
-            zombie.reset_moves()
+            survivor.attack_power = 10
+            survivor.inventory = zombie.inventory
+            survivor.xp = zombie.xp
+            survivor.level = zombie.level
+            survivor.xp_to_next_level = zombie.xp_to_next_level
+            survivor.age_in_turns = zombie.age_in_turns
+            self.units.remove(zombie)
+            self.units.append(survivor)
 
         print(f"🎉 THE CURE HAS BEEN MANUFACTURED! All {len(zombies)} zombies have been cured!")
         print(f"🏆 VICTORY! You survived {self.turn} turns to save humanity!")
@@ -1522,11 +1394,11 @@ class GameState:
         city = City(x, y, name)
 
         # Apply quick_start tech - new cities get bonus resources
-        if self.has_tech('quick_start'):
-            city.resources['food'] += 30
-            city.resources['materials'] += 30
+        for resource, amount in self.tech_modifiers.new_city_resources.items():
+            city.resources[resource] += amount
 
         self.cities.append(city)
+        self.invalidate_defense_coverage()
         self.update_visibility()  # Update fog of war
         return city
 
@@ -1561,23 +1433,41 @@ class GameState:
 
     def save_game(self, filename='savegame.json', camera_x=0, camera_y=0):
         """Save the game state to a JSON file"""
-        from map_generator import TileType
+        save_data = self.to_save_data(camera_x, camera_y)
+
+        # Save to file in the saves directory
+        saves_dir = os.path.join(os.path.dirname(__file__), '..', 'saves')
+        os.makedirs(saves_dir, exist_ok=True)
+        filepath = os.path.join(saves_dir, filename)
+
+        with open(filepath, 'w') as f:
+            json.dump(save_data, f, indent=2)
+
+        # Only print message if it's not an autosave
+        if filename != 'autosave.json':
+            print(f"Game saved to {filepath}")
+        return filepath
 
-        save_data = {
+    def to_save_data(self, camera_x=0, camera_y=0):
+        """Serialize the game state to a JSON-compatible dict"""
+        return {
             'turn': self.turn,
             'current_team': self.current_team,
             'game_won': self.game_won,
             'difficulty': self.difficulty,
+            'seed': self.seed,
+            'rng_state': self.rng.get_state(),
             'research_lab_pos': list(self.research_lab_pos) if self.research_lab_pos else None,
             'triangulation_level': self.triangulation_level,
             'triangulation_circle_offset': list(self.triangulation_circle_offset),
             'tech_points': self.tech_points,
-            'researched_techs': list(self.researched_techs),
+            'researched_techs': sorted(self.researched_techs),
             'tiles_explored_count': self.tiles_explored_count,
             'total_resources_produced': self.total_resources_produced,
             'zombies_killed_count': self.zombies_killed_count,
             'cure_manufacturing_city_coords': [self.cure_manufacturing_city.x, self.cure_manufacturing_city.y] if self.cure_manufacturing_city else None,
             'cure_manufacturing_turns_remaining': self.cure_manufacturing_turns_remaining,
+            'dormant_field': self.dormant_field.to_save_data() if self.dormant_field else None,
             'camera_x': camera_x,
             'camera_y': camera_y,
             'map_grid': [[int(tile) for tile in row] for row in self.map_grid],
@@ -1592,12 +1482,13 @@ class GameState:
                 'max_health': unit.max_health,
                 'attack_power': unit.attack_power,
                 'moves_remaining': unit.moves_remaining,
-                'inventory': unit.inventory,
+                'inventory': unit.inventory.to_dict(),
                 'xp': unit.xp,
                 'level': unit.level,
                 'xp_to_next_level': unit.xp_to_next_level,
-                'size': getattr(unit, 'size', 1),
-                'tiles_explored': [list(tile) for tile in getattr(unit, 'tiles_explored', set())]
+                'size': unit.size,
+                'tiles_explored': [list(tile) for tile in sorted(unit.tiles_explored)],
+                **({'goto': list(unit.goto)} if unit.goto else {})
             } for unit in self.units],
             'cities': [{
                 'x': city.x,
@@ -1614,25 +1505,19 @@ class GameState:
                         'max_health': info.get('max_health', 20)
                     } for (x, y), info in city.building_locations.items()
                 },
-                'resources': city.resources,
+                'resources': city.resources.to_dict(),
                 'level': city.level,
                 'health': city.health,
                 'max_health': city.max_health
             } for city in self.cities]
         }
 
-        # Save to file in the saves directory
-        saves_dir = os.path.join(os.path.dirname(__file__), '..', 'saves')
-        os.makedirs(saves_dir, exist_ok=True)
-        filepath = os.path.join(saves_dir, filename)
-
-        with open(filepath, 'w') as f:
-            json.dump(save_data, f, indent=2)
-
-        # Only print message if it's not an autosave
-        if filename != 'autosave.json':
-            print(f"Game saved to {filepath}")
-        return filepath
+    def state_digest(self):
+        """Short hash of the full game state, used to check that replays end up identical"""
+        import hashlib
+        save_data = self.to_save_data()
+        del save_data['camera_x'], save_data['camera_y']
+        return hashlib.sha1(json.dumps(save_data, sort_keys=True).encode()).hexdigest()
 
     @staticmethod
     def load_game(filename='savegame.json'):
@@ -1659,11 +1544,23 @@ class GameState:
             print(f"Invalid save file format: expected dictionary, got {type(save_data)}")
             return None
 
+        game_state = GameState.from_save_data(save_data)
+
+        # Load camera position (default to 0,0 for backward compatibility)
+        camera_x = save_data.get('camera_x', 0)
+        camera_y = save_data.get('camera_y', 0)
+
+        print(f"Game loaded from {filepath}")
+        return game_state, camera_x, camera_y
+
+    @staticmethod
+    def from_save_data(save_data):
+        """Rebuild a game state from a dict produced by to_save_data"""
         # Reconstruct map_grid with TileType values
         map_grid = [[tile for tile in row] for row in save_data['map_grid']]
 
         # Reconstruct resources dictionary
-        resources = {tuple(map(int, k.split(','))): v for k, v in save_data['resources'].items()}
+        resources = ResourcePiles({tuple(map(int, k.split(','))): v for k, v in save_data['resources'].items()})
 
         # Create game state
         game_state = GameState.__new__(GameState)
@@ -1673,6 +1570,11 @@ class GameState:
         game_state.current_team = save_data['current_team']
         game_state.game_won = save_data.get('game_won', False)
         game_state.difficulty = save_data.get('difficulty', 'medium')  # Default to medium if not present
+
+        # Restore random streams (old saves without a seed get a fresh one)
+        game_state.rng = GameRandom(save_data.get('seed'))
+        game_state.rng.set_state(save_data.get('rng_state', {}))
+        game_state.seed = game_state.rng.seed
         game_state.research_lab_pos = tuple(save_data['research_lab_pos']) if save_data.get('research_lab_pos') else None
         game_state.explored = [[bool(cell) for cell in row] for row in save_data['explored']]
         game_state.visible = [[False for _ in range(len(map_grid[0]))] for _ in range(len(map_grid))]
@@ -1683,7 +1585,8 @@ class GameState:
 
         # Load tech tree data (default to 0/empty for backwards compatibility)
         game_state.tech_points = save_data.get('tech_points', 0)
-        game_state.researched_techs = set(save_data.get('researched_techs', []))
+        game_state.researched_techs = ResearchedTechs(t for t in save_data.get('researched_techs', []) if t in TECH_IDS)
+        game_state.tech_modifiers = get_tech_modifiers(game_state.researched_techs)
         game_state.tiles_explored_count = save_data.get('tiles_explored_count', 0)
         game_state.total_resources_produced = save_data.get('total_resources_produced', 0)
         game_state.zombies_killed_count = save_data.get('zombies_killed_count', 0)
@@ -1691,48 +1594,39 @@ class GameState:
         # Load cure manufacturing state (default to None for backwards compatibility)
         game_state.cure_manufacturing_city = None  # Will be set after cities are loaded
         game_state.cure_manufacturing_turns_remaining = save_data.get('cure_manufacturing_turns_remaining', 0)
-        game_state.cure_manufacturing_turns_required = {
-            'easy': 4,
-            'medium': 7,
-            'hard': 10
-        }
         cure_manufacturing_city_coords = save_data.get('cure_manufacturing_city_coords', None)
 
         # Re-initialize difficulty settings based on loaded difficulty
-        if game_state.difficulty == 'easy':
-            game_state.zombie_spawn_rate = 0.50
-            game_state.zombie_spawn_count_min = 1
-            game_state.zombie_spawn_count_max = 2
-            game_state.starting_resources_multiplier = 1.5
-        elif game_state.difficulty == 'hard':
-            game_state.zombie_spawn_rate = 1
-            game_state.zombie_spawn_count_min = 2
-            game_state.zombie_spawn_count_max = 4
-            game_state.starting_resources_multiplier = 0.7
-        else:  # medium
-            game_state.zombie_spawn_rate = 0.75
-            game_state.zombie_spawn_count_min = 1
-            game_state.zombie_spawn_count_max = 3
-            game_state.starting_resources_multiplier = 1.0
+        game_state.apply_difficulty_rules()
 
         # Reconstruct units
-        game_state.units = []
+        game_state.units = UnitRoster(len(game_state.map_grid[0]), len(game_state.map_grid))
         for unit_data in save_data['units']:
             unit = Unit(unit_data['x'], unit_data['y'], unit_data['unit_type'], unit_data['team'], game_state.difficulty)
             unit.health = unit_data['health']
             unit.max_health = unit_data.get('max_health', unit.max_health)
             unit.attack_power = unit_data.get('attack_power', unit.attack_power)
             unit.moves_remaining = unit_data['moves_remaining']
-            unit.inventory = unit_data['inventory']
+            unit.inventory = ResourceStore(unit_data['inventory'])
             unit.xp = unit_data.get('xp', 0)
             unit.level = unit_data.get('level', 1)
             unit.xp_to_next_level = unit_data.get('xp_to_next_level', 100)
             unit.size = unit_data.get('size', 1)
-            unit.tiles_explored = set(tuple(tile) for tile in unit_data.get('tiles_explored', []))
+            if unit_data.get('tiles_explored'):
+                unit.tiles_explored = set(tuple(tile) for tile in unit_data['tiles_explored'])
+            if unit_data.get('goto'):
+                unit.goto = tuple(unit_data['goto'])
             game_state.units.append(unit)
 
         # Reconstruct cities
         game_state.cities = []
+        game_state.defense_coverage = None
+        game_state.spawn_pools = {}
+        game_state.path_cache = None
+        game_state.threat_map = None
+        game_state.ai_actions = []
+        game_state.dormant_field = None
+        game_state.use_zombie_lod = True
         for city_data in save_data['cities']:
             city = City(city_data['x'], city_data['y'], city_data['name'])
             city.population = city_data['population']
@@ -1746,7 +1640,7 @@ class GameState:
                     'max_health': info.get('max_health', 20)
                 } for k, info in city_data['building_locations'].items()
             }
-            city.resources = city_data['resources']
+            city.resources = ResourceStore(city_data['resources'])
             city.level = city_data['level']
             city.health = city_data.get('health', 50)
             city.max_health = city_data.get('max_health', 50)
@@ -1760,15 +1654,14 @@ class GameState:
                     game_state.cure_manufacturing_city = city
                     break
 
+        # Carry on with the dormant-zombie field the saved game had (see zombie_lod.py)
+        if save_data.get('dormant_field'):
+            from zombie_lod import DormantField
+            game_state.dormant_field = DormantField(game_state, save_data['dormant_field'])
+
         # Update visibility
         game_state.update_visibility()
-
-        # Load camera position (default to 0,0 for backward compatibility)
-        camera_x = save_data.get('camera_x', 0)
-        camera_y = save_data.get('camera_y', 0)
-
-        print(f"Game loaded from {filepath}")
-        return game_state, camera_x, camera_y
+        return game_state
 
     @staticmethod
     def save_high_score(turns_survived):
@@ -1,10 +1,16 @@
 import pygame
 import sys
 import math
-import random
+import time
 from map_generator import MapGenerator
 from game_state import GameState, Unit
 from renderer import Renderer
+from profiling import turn_profiler, frame_profiler, profile_capture
+import game_log
+from replay import CommandRecorder, ReplayDivergence, default_replay_path
+from message_log import MessageLog
+from zombie_animator import ZombieAnimator
+from rules import rules
 
 class ZombieStrategyGame:
     def __init__(self):
@@ -20,6 +26,10 @@ class ZombieStrategyGame:
         self.clock = pygame.time.Clock()
         self.running = True
 
+        # Development: re-read rules.json when it changes (--hot-reload-rules)
+        self.hot_reload_rules = False
+        self.next_rules_check = 0  # pygame ticks
+
         # Difficulty configuration
         self.difficulty_dialog_open = True
         self.difficulty = None  # Will be set to 'easy', 'medium', or 'hard'
@@ -43,6 +53,9 @@ class ZombieStrategyGame:
         self.auto_select_timer = 0
         self.auto_select_delay = 0.25  # 0.25 seconds
 
+        # Z toggles the overlay of tiles zombies can reach or attack next turn
+        self.show_threat_map = False
+
         # Save/Load menu state
         self.save_menu_open = False
         self.load_menu_open = False
@@ -81,9 +94,11 @@ class ZombieStrategyGame:
         self.tech_tree_open = False
         self.selected_tech = None  # Currently hovered/selected tech
 
-        # Console message log
-        self.message_log = []
+        # Console message log (last 50 lines, pre-rendered; the full session goes to saves/logs/)
+        self.message_log = MessageLog(capacity=50)
         self.message_log_open = False
+        self.message_log_panel = None  # Cached (size, overlay, panel) surfaces for the log dialog
+        self.message_box_hint = None  # Cached "(click for log)" surface
 
         # Help panel
         self.help_panel_open = False
@@ -94,23 +109,35 @@ class ZombieStrategyGame:
 
         # Animation state for zombie movements
         self.animating_zombies = False
-        self.zombie_animations = {}  # Dict: unit -> {'type': 'move'/'attack', 'start': (x,y), 'end': (x,y), 'attack_count': int}
+        self.zombie_animator = None  # ZombieAnimator playing back the last zombie turn
         self.animation_start_time = 0
         self.animation_duration = 1.0  # 1 second total for all movements
-        self.zombie_positions_snapshot = {}  # Dict: unit -> (x, y) before AI turn
-        self.zombie_action_log = {}  # Dict: unit -> list of actions taken during turn
 
-    def initialize_game(self, difficulty):
-        """Initialize the game with the selected difficulty"""
+        # Time-sliced zombie turn: the AI runs a slice per frame so the window stays responsive
+        self.ai_turn = None  # GameState.iter_ai_turn() generator while zombies are still being moved
+        self.ai_turn_total = 0  # Zombies to move this turn
+        self.ai_turn_done = 0  # Zombies moved so far
+        self.ai_actions_animated = 0  # AI actions already handed to the animator
+        self.ai_frame_budget = 0.008  # Seconds of AI work per frame (about half a 60 FPS frame)
+
+        # cProfile capture (F5 = next N frames, Shift+F5 = next enemy turn)
+        self.profile_capture_frames = 300
+
+        # Command log for replays (see replay.py)
+        self.recorder = None
+        self.headless_replay = False  # Set by the replayer: no recording, autosaves or leaderboards
+
+    def initialize_game(self, difficulty, seed=None):
+        """Initialize the game with the selected difficulty (and optional map seed)"""
         self.difficulty = difficulty
         self.difficulty_dialog_open = False
 
         # Generate map with selected size
-        self.map_gen = MapGenerator(width=self.selected_map_size, height=self.selected_map_size)
+        self.map_gen = MapGenerator(width=self.selected_map_size, height=self.selected_map_size, seed=seed)
         map_grid = self.map_gen.generate()
 
-        # Initialize game state with research lab position and difficulty
-        self.game_state = GameState(map_grid, self.map_gen.resources, self.map_gen.research_lab_pos, difficulty)
+        # Initialize game state with research lab position and difficulty (same seed as the map)
+        self.game_state = GameState(map_grid, self.map_gen.resources, self.map_gen.research_lab_pos, difficulty, self.map_gen.seed)
 
         # Initialize renderer
         self.renderer = Renderer(self.screen_width, self.screen_height, self.tile_size)
@@ -126,6 +153,132 @@ class ZombieStrategyGame:
         self.log_message(f"Difficulty: {difficulty.upper()}")
         self.log_message("Find the Research Lab and manufacture The Cure to save humanity!")
 
+        self.start_session({'kind': 'new', 'seed': self.game_state.seed,
+                              'map_size': self.selected_map_size, 'difficulty': difficulty})
+
+    def start_loaded_game(self, loaded_state, camera_x, camera_y):
+        """Switch to a game state loaded from a save file"""
+        self.game_state = loaded_state
+        self.difficulty = loaded_state.difficulty  # Update main game difficulty
+        self.difficulty_dialog_open = False  # Game is now started
+
+        # Initialize renderer if not already done
+        if not self.renderer:
+            self.renderer = Renderer(self.screen_width, self.screen_height, self.tile_size)
+
+        self.renderer.camera_x = camera_x
+        self.renderer.camera_y = camera_y
+        self.selected_unit = None
+        self.selected_city = None
+        self.selected_tile = None
+        self.building_placement_mode = None
+        # Find the highest city number to continue naming correctly
+        max_num = 0
+        for city in self.game_state.cities:
+            if city.name.startswith("New Hope "):
+                try:
+                    num = int(city.name.split()[-1])
+                    max_num = max(max_num, num)
+                except:
+                    pass
+        self.city_name_counter = max_num + 1
+
+        # The replay starts from the loaded state itself, so it doesn't need the save file
+        self.start_session({'kind': 'load', 'save': loaded_state.to_save_data(camera_x, camera_y),
+                              'camera_x': camera_x, 'camera_y': camera_y})
+
+    def start_session(self, header):
+        """Begin the command log and session message log for the current game (ends any previous ones)"""
+        self.end_session()
+        if not self.headless_replay:
+            self.recorder = CommandRecorder(default_replay_path(), header)
+            self.message_log.start_file()
+
+    def end_session(self):
+        """Close the command log with a final checkpoint and finish writing the session and profile logs"""
+        if self.recorder:
+            self.record_checkpoint()
+            self.recorder.close()
+            self.recorder = None
+        self.message_log.close_file()
+        turn_profiler.close()
+
+    def record_command(self, name, **args):
+        """Append a player command to the replay log"""
+        if self.recorder:
+            self.recorder.record(self.game_state.turn, name, args)
+
+    def record_checkpoint(self):
+        """Append a digest of the current state for the replayer to verify"""
+        if self.recorder:
+            self.recorder.checkpoint(self.game_state.turn, self.game_state.state_digest())
+
+    def _unit_args(self, unit):
+        """Replay reference to a unit: its index in the unit list plus its position as a sanity check"""
+        return {'unit': self.game_state.units.index(unit), 'at': [unit.x, unit.y]}
+
+    def _city_args(self, city):
+        """Replay reference to a city: its index in the city list"""
+        return {'city': self.game_state.cities.index(city)}
+
+    def _resolve_unit(self, args):
+        """Find the unit a recorded command refers to"""
+        units = self.game_state.units
+        index = args['unit']
+        if not 0 <= index < len(units) or [units[index].x, units[index].y] != args['at']:
+            raise ReplayDivergence(f"no unit #{index} at {tuple(args['at'])}")
+        return units[index]
+
+    def _resolve_city(self, args):
+        """Find the city a recorded command refers to"""
+        index = args['city']
+        if not 0 <= index < len(self.game_state.cities):
+            raise ReplayDivergence(f"no city #{index}")
+        return self.game_state.cities[index]
+
+    def apply_command(self, name, args):
+        """Execute a recorded command (used by replay.py)"""
+        # Live input is blocked until every zombie has moved, so anything recorded during the
+        # zombie turn came after the AI finished: finish it here too before applying the command
+        if name != 'end_enemy_turn':
+            self.advance_ai_turn()
+        if name == 'move':
+            self.move_unit_toward(self._resolve_unit(args), *args['tile'])
+        elif name == 'skip':
+            self.skip_unit_turn(self._resolve_unit(args))
+        elif name == 'found_city':
+            self.found_city_with(self._resolve_unit(args))
+        elif name == 'scavenge':
+            self.scavenge(self._resolve_unit(args))
+        elif name == 'transfer':
+            self.deposit_resources(self._resolve_unit(args))
+        elif name == 'gather':
+            self.pickup_resources(self._resolve_unit(args))
+        elif name == 'heal':
+            self.heal_adjacent(self._resolve_unit(args))
+        elif name == 'triangulate':
+            self.triangulate(self._resolve_unit(args))
+        elif name == 'helicopter':
+            self.helicopter_transport(self._resolve_unit(args), self._resolve_city(args))
+        elif name == 'research':
+            self.research_tech(args['tech'])
+        elif name == 'upgrade':
+            self.upgrade_building_at(*args['tile'])
+        elif name == 'manufacture_cure':
+            self.start_cure_at(self._resolve_city(args))
+        elif name == 'recruit':
+            self.recruit_unit(self._resolve_city(args), args['unit_type'])
+        elif name == 'build':
+            self.place_building(self._resolve_city(args), args['building'], *args['tile'])
+        elif name == 'debug_resources':
+            self.debug_add_resources(self._resolve_unit(args))
+        elif name == 'end_turn':
+            self.confirm_end_turn()
+        elif name == 'end_enemy_turn':
+            self.complete_enemy_turn()
+        else:
+            raise ReplayDivergence(f"unknown command '{name}'")
+
     def toggle_fullscreen(self):
         """Toggle between fullscreen and windowed mode"""
         self.fullscreen = not self.fullscreen
@@ -150,10 +303,12 @@ class ZombieStrategyGame:
     def confirm_end_turn(self):
         """Actually end the player's turn (called after confirmation or if no units have moves)"""
         # Player ending turn - switch to enemy and start animation
+        self.record_command('end_turn')
+        profile_capture.enemy_turn_started()
+        turn_profiler.begin_turn(self.game_state.turn, len(self.game_state.map_grid))
         self.game_state.current_team = 'enemy'
-        for unit in self.game_state.units:
-            if unit.team == 'enemy':
-                unit.reset_moves()
+        with turn_profiler.phase('reset_moves'):
+            self.game_state.units.enemies.reset_moves()
         # Start zombie turn with animation
         self.start_zombie_turn_animated()
         self.selected_unit = None
@@ -175,12 +330,29 @@ class ZombieStrategyGame:
                     self.renderer.screen_width = self.screen_width
                     self.renderer.screen_height = self.screen_height
 
+            elif self.ai_turn is not None and (event.type == pygame.MOUSEBUTTONDOWN or (
+                    event.type == pygame.KEYDOWN and event.key not in (pygame.K_e, pygame.K_F3, pygame.K_F5, pygame.K_F11))):
+                # Zombies are still moving: nothing may change the game until the AI turn is done
+                # (E still skips ahead, and the camera keeps scrolling)
+                continue
+
             elif event.type == pygame.KEYDOWN:
                 # Toggle fullscreen with F11
                 if event.key == pygame.K_F11:
                     self.toggle_fullscreen()
                     continue
 
+                # Toggle frame profiler overlay with F3
+                if event.key == pygame.K_F3:
+                    frame_profiler.toggle()
+                    self.log_message(f"Frame profiler {'enabled' if frame_profiler.enabled else 'disabled'}")
+                    continue
+
+                # cProfile capture: F5 = next N frames, Shift+F5 = next enemy turn
+                if event.key == pygame.K_F5:
+                    self.request_profile_capture(bool(pygame.key.get_mods() & pygame.KMOD_SHIFT))
+                    continue
+
                 # Handle notification dialog (highest priority)
                 if self.notification_dialog_open:
                     if self.notification_dialog_data['type'] == 'info':
@@ -236,6 +408,7 @@ class ZombieStrategyGame:
                 if self.game_won:
                     if event.key == pygame.K_n:
                         # Start a new game
+                        self.end_session()
                         self.__init__()
                         return
                     elif event.key == pygame.K_ESCAPE:
@@ -253,6 +426,7 @@ class ZombieStrategyGame:
                 if self.game_over:
                     if event.key == pygame.K_n:
                         # Start a new game
+                        self.end_session()
                         self.__init__()
                         return
                     elif event.key == pygame.K_ESCAPE:
@@ -290,6 +464,7 @@ class ZombieStrategyGame:
                             # Save the game
                             filename = self.menu_input_text if self.menu_input_text.endswith('.json') else f"{self.menu_input_text}.json"
                             self.game_state.save_game(filename, self.renderer.camera_x, self.renderer.camera_y)
+                            self.record_checkpoint()
                             self.last_save_turn = self.game_state.turn
                             self.has_unsaved_changes = False
                             self.save_menu_open = False
@@ -299,24 +474,7 @@ class ZombieStrategyGame:
                             filename = self.menu_input_text if self.menu_input_text.endswith('.json') else f"{self.menu_input_text}.json"
                             result = GameState.load_game(filename)
                             if result:
-                                loaded_state, camera_x, camera_y = result
-                                self.game_state = loaded_state
-                                self.renderer.camera_x = camera_x
-                                self.renderer.camera_y = camera_y
-                                self.selected_unit = None
-                                self.selected_city = None
-                                self.selected_tile = None
-                                self.building_placement_mode = None
-                                # Find the highest city number to continue naming correctly
-                                max_num = 0
-                                for city in self.game_state.cities:
-                                    if city.name.startswith("New Hope "):
-                                        try:
-                                            num = int(city.name.split()[-1])
-                                            max_num = max(max_num, num)
-                                        except:
-                                            pass
-                                self.city_name_counter = max_num + 1
+                                self.start_loaded_game(*result)
                             self.load_menu_open = False
                             self.menu_input_text = ""
                     elif event.key == pygame.K_BACKSPACE:
@@ -354,7 +512,11 @@ class ZombieStrategyGame:
                 elif event.key == pygame.K_e:
                     if self.game_state.current_team == 'player':
                         # Check if any player units have moves remaining (exclude skipped units)
-                        units_with_moves = [u for u in self.game_state.units if u.team == 'player' and u.moves_remaining > 0 and not getattr(u, 'turn_skipped', False)]
+                        units_with_moves = [u for u in self.game_state.units if u.team == 'player' and u.moves_remaining > 0 and not u.turn_skipped]
+
+                        # Warn about units zombies can reach next turn
+                        threatened = self.game_state.get_threat_map().threatened_units(self.game_state.units.players)
+                        threat_lines = [f'{len(threatened)} unit(s) can be attacked by zombies next turn (Z to show).'] if threatened else []
 
                         if units_with_moves:
                             # Show confirmation dialog
@@ -363,6 +525,7 @@ class ZombieStrategyGame:
                                 'title': '⚠ Units Have Moves Remaining',
                                 'messages': [
                                     f'{unit_count} unit(s) still have movement points.',
+                                    *threat_lines,
                                     '',
                                     'Are you sure you want to end your turn?'
                                 ],
@@ -372,195 +535,48 @@ class ZombieStrategyGame:
                             self.notification_dialog_open = True
                         else:
                             # No units with moves, end turn normally
+                            if threatened:
+                                self.log_message(f"⚠ {threat_lines[0]}")
                             self.confirm_end_turn()
-                    else:
-                        # Enemy turn ending
-                        self.game_state.end_turn()
+                    elif self.animating_zombies:
+                        # Enemy turn ending - skip the rest of the animation
+                        self.complete_enemy_turn()
                         self.selected_unit = None
-                        self.has_unsaved_changes = True
+
+                # Toggle the zombie threat overlay
+                elif event.key == pygame.K_z:
+                    self.show_threat_map = not self.show_threat_map
+                    self.log_message(f"Zombie threat overlay {'on' if self.show_threat_map else 'off'}")
 
                 # Skip unit's turn (Space bar)
                 elif event.key == pygame.K_SPACE:
                     if self.selected_unit and self.selected_unit.team == 'player' and self.selected_unit.can_move():
-                        self.selected_unit.turn_skipped = True
-                        self.log_message(f"Skipped {self.selected_unit.unit_type.capitalize()}'s turn")
-                        # Auto-select next available unit
-                        self.auto_select_timer = self.auto_select_delay
+                        self.skip_unit_turn(self.selected_unit)
 
                 # Found city
                 elif event.key == pygame.K_f:
                     if self.selected_unit and self.selected_unit.team == 'player':
-                        city_name = f"New Hope {self.city_name_counter}"
-                        city = self.game_state.found_city(self.selected_unit.x, self.selected_unit.y, city_name)
-                        if city:
-                            self.city_name_counter += 1
-                            # Transfer unit's inventory to the new city
-                            transferred = {}
-                            for resource in ['food', 'materials', 'medicine']:
-                                amount = self.selected_unit.inventory[resource]
-                                if amount > 0:
-                                    city.resources[resource] += amount
-                                    transferred[resource] = amount
-
-                            if transferred:
-                                transfer_str = ', '.join([f"{v} {k}" for k, v in transferred.items()])
-                                self.log_message(f"Founded {city_name} at ({self.selected_unit.x}, {self.selected_unit.y}) with {transfer_str}")
-                            else:
-                                self.log_message(f"Founded {city_name} at ({self.selected_unit.x}, {self.selected_unit.y})")
-
-                            # Consume the unit that founded the city
-                            self.game_state.units.remove(self.selected_unit)
-                            self.selected_unit = None
-                        else:
-                            self.log_message(f"Cannot found city here! Cities must be at least 3 tiles apart.")
+                        self.found_city_with(self.selected_unit)
 
                 # Scavenge resources
                 elif event.key == pygame.K_r:
                     if self.selected_unit and self.selected_unit.team == 'player':
-                        pos = (self.selected_unit.x, self.selected_unit.y)
-                        if pos in self.game_state.resources:
-                            resources = self.game_state.resources[pos]
-
-                            # Check if cure is present and unit is not a medic
-                            if 'cure' in resources and resources.get('cure', 0) > 0:
-                                if self.selected_unit.unit_type != 'medic':
-                                    self.log_message("Only medics can handle The Cure!")
-                                    continue
-
-                            # Scavenge all resources
-                            scavenged = {}
-                            for resource, amount in resources.items():
-                                # Apply scavenging efficiency tech bonus
-                                if self.game_state.has_tech('scavenging_efficiency'):
-                                    amount = int(amount * 1.25)
-                                self.selected_unit.inventory[resource] += amount
-                                scavenged[resource] = amount
-                            del self.game_state.resources[pos]
-
-                            # Small chance (10%) to find a survivor when scavenging
-                            found_survivor = False
-                            if random.random() < 0.10:
-                                # Try to spawn survivor on adjacent tile
-                                adjacent_positions = [
-                                    (self.selected_unit.x + dx, self.selected_unit.y + dy)
-                                    for dx, dy in [(-1, 0), (1, 0), (0, -1), (0, 1), (-1, -1), (-1, 1), (1, -1), (1, 1)]
-                                ]
-                                # Filter valid positions (within bounds, not water, no units)
-                                from map_generator import TileType
-                                map_width = len(self.game_state.map_grid[0])
-                                map_height = len(self.game_state.map_grid)
-                                valid_positions = [
-                                    (x, y) for x, y in adjacent_positions
-                                    if (0 <= x < map_width and
-                                        0 <= y < map_height and
-                                        self.game_state.map_grid[y][x] != TileType.WATER and
-                                        not any(u.x == x and u.y == y for u in self.game_state.units))
-                                ]
-
-                                if valid_positions:
-                                    spawn_x, spawn_y = random.choice(valid_positions)
-                                    new_survivor = Unit(spawn_x, spawn_y, 'survivor', 'player', self.game_state.difficulty)
-                                    self.game_state.units.append(new_survivor)
-                                    found_survivor = True
-                                    self.log_message(f"Found a survivor! They joined your group at ({spawn_x}, {spawn_y})")
-
-                            # Show notification dialog with scavenged resources
-                            resource_lines = [f"{resource.capitalize()}: +{amount}" for resource, amount in scavenged.items()]
-                            messages = ['Successfully scavenged:'] + resource_lines + ['', 'Resources added to unit inventory.']
-                            if found_survivor:
-                                messages.append('')
-                                messages.append('BONUS: Found a survivor!')
-                                messages.append('A survivor has joined your group!')
-
-                            self.notification_dialog_data = {
-                                'title': '✓ Resources Scavenged',
-                                'messages': messages,
-                                'type': 'info',
-                                'callback': None
-                            }
-                            self.notification_dialog_open = True
-                            self.log_message(f"Scavenged: {scavenged} (now in unit's inventory)")
+                        self.scavenge(self.selected_unit)
 
                 # Deposit resources to city (T key)
                 elif event.key == pygame.K_t:
                     if self.selected_unit and self.selected_unit.team == 'player':
-                        city = self.game_state.get_city_at(self.selected_unit.x, self.selected_unit.y)
-                        if city:
-                            # Transfer all resources from unit to city
-                            transferred = {}
-                            for resource in ['food', 'materials', 'medicine', 'cure']:
-                                amount = self.selected_unit.inventory.get(resource, 0)
-                                if amount > 0:
-                                    city.resources[resource] = city.resources.get(resource, 0) + amount
-                                    transferred[resource] = amount
-                                    self.selected_unit.inventory[resource] = 0
-                            if transferred:
-                                self.log_message(f"Deposited to {city.name}: {transferred}")
-                            else:
-                                self.log_message("Unit has no resources to deposit")
-                        else:
-                            self.log_message("Unit must be in a city to deposit resources")
+                        self.deposit_resources(self.selected_unit)
 
                 # Pickup resources from city (G key)
                 elif event.key == pygame.K_g:
                     if self.selected_unit and self.selected_unit.team == 'player':
-                        city = self.game_state.get_city_at(self.selected_unit.x, self.selected_unit.y)
-                        if city:
-                            # Transfer all resources from city to unit
-                            transferred = {}
-                            for resource in ['food', 'materials', 'medicine', 'cure']:
-                                amount = city.resources.get(resource, 0)
-                                if amount > 0:
-                                    self.selected_unit.inventory[resource] = self.selected_unit.inventory.get(resource, 0) + amount
-                                    transferred[resource] = amount
-                                    city.resources[resource] = 0
-                            if transferred:
-                                self.log_message(f"Picked up from {city.name}: {transferred}")
-                            else:
-                                self.log_message("City has no resources to pick up")
-                        else:
-                            self.log_message("Unit must be in a city to pick up resources")
+                        self.pickup_resources(self.selected_unit)
 
                 # Heal adjacent unit (H key - medics only)
                 elif event.key == pygame.K_h:
                     if self.selected_unit and self.selected_unit.team == 'player' and self.selected_unit.unit_type == 'medic':
-                        if self.selected_unit.can_move():
-                            # Find adjacent friendly units that need healing
-                            healed = False
-                            for dx in [-1, 0, 1]:
-                                for dy in [-1, 0, 1]:
-                                    if dx == 0 and dy == 0:
-                                        continue
-                                    target_x = self.selected_unit.x + dx
-                                    target_y = self.selected_unit.y + dy
-                                    target_unit = self.game_state.get_unit_at(target_x, target_y)
-                                    if target_unit and target_unit.team == 'player' and target_unit.health < target_unit.max_health:
-                                        # Heal the unit (scales with medic level: 30 + 10 per level)
-                                        base_heal = 30
-                                        # Apply tactical_medicine tech for +20 healing
-                                        if self.game_state.has_tech('tactical_medicine'):
-                                            base_heal += 20
-                                        heal_amount = base_heal + (self.selected_unit.level - 1) * 10
-                                        old_health = target_unit.health
-                                        target_unit.health = min(target_unit.max_health, target_unit.health + heal_amount)
-                                        actual_heal = target_unit.health - old_health
-                                        self.log_message(f"Medic (Lvl {self.selected_unit.level}) healed {target_unit.unit_type} for {actual_heal} HP! (Now at {target_unit.health}/{target_unit.max_health})")
-
-                                        # Award XP to medic (1 XP per HP healed)
-                                        leveled_up = self.selected_unit.gain_xp(actual_heal)
-                                        self.log_message(f"Medic gained {actual_heal} XP! (Level {self.selected_unit.level}: {self.selected_unit.xp}/{self.selected_unit.xp_to_next_level} XP)")
-                                        if leveled_up:
-                                            self.log_message(f"LEVEL UP! Medic is now level {self.selected_unit.level}! HP: {self.selected_unit.max_health}, Attack: {self.selected_unit.attack_power}")
-
-                                        self.selected_unit.moves_remaining -= 1
-                                        healed = True
-                                        break
-                                if healed:
-                                    break
-                            if not healed:
-                                self.log_message("No adjacent friendly units need healing")
-                        else:
-                            self.log_message("Medic has no moves remaining")
+                        self.heal_adjacent(self.selected_unit)
                     elif self.selected_unit and self.selected_unit.unit_type != 'medic':
                         self.log_message("Only medics can heal units")
                     else:
@@ -569,44 +585,7 @@ class ZombieStrategyGame:
                 # Triangulate lab signals (Q key - scouts only)
                 elif event.key == pygame.K_q:
                     if self.selected_unit and self.selected_unit.team == 'player' and self.selected_unit.unit_type == 'scout':
-                        if self.selected_unit.moves_remaining >= self.selected_unit.max_moves:
-                            if self.game_state.triangulation_level < 4:
-                                # Use the scout's turn
-                                self.selected_unit.moves_remaining = 0
-                                self.game_state.triangulation_level += 1
-
-                                # Generate random offset for the circle (lab must still be inside)
-                                # The offset is in tile coordinates, will be scaled when rendering
-                                # Radius percentages match renderer: Level 1: 50%, Level 2: 30%, Level 3: 15%
-                                # Map these to approximate tile radii based on map size
-                                map_width = len(self.game_state.map_grid[0])
-                                map_height = len(self.game_state.map_grid)
-                                radius_percentages = {1: 0.50, 2: 0.30, 3: 0.15, 4: 0}
-                                # Calculate max offset (circle radius in tiles, minus some margin)
-                                circle_radius_tiles = min(map_width, map_height) * radius_percentages.get(self.game_state.triangulation_level, 0) * 0.5
-                                # Random offset within 70% of the radius so lab is comfortably inside
-                                max_offset = circle_radius_tiles * 0.7
-                                if max_offset > 0:
-                                    angle = random.uniform(0, 2 * math.pi)
-                                    distance = random.uniform(0, max_offset)
-                                    offset_x = distance * math.cos(angle)
-                                    offset_y = distance * math.sin(angle)
-                                    self.game_state.triangulation_circle_offset = (offset_x, offset_y)
-                                else:
-                                    self.game_state.triangulation_circle_offset = (0, 0)
-
-                                level_messages = {
-                                    1: "Scout detected faint radio signals from the lab. Area marked on minimap (very large radius).",
-                                    2: "Scout triangulated signals more precisely. Search area narrowed (large radius).",
-                                    3: "Scout is closing in on the signal source. Area significantly reduced (medium radius).",
-                                    4: "Scout pinpointed the exact lab location! Marked on minimap."
-                                }
-                                self.log_message(level_messages[self.game_state.triangulation_level])
-                                self.has_unsaved_changes = True
-                            else:
-                                self.log_message("Lab location already revealed!")
-                        else:
-                            self.log_message("Scout needs full movement points to triangulate signals")
+                        self.triangulate(self.selected_unit)
                     elif self.selected_unit and self.selected_unit.unit_type != 'scout':
                         self.log_message("Only scouts can triangulate lab signals")
                     else:
@@ -614,7 +593,7 @@ class ZombieStrategyGame:
 
                 # Helicopter transport (P key)
                 elif event.key == pygame.K_p:
-                    if self.game_state and self.game_state.has_tech('helicopter_transport'):
+                    if self.game_state and self.game_state.tech_modifiers.helicopter_transport:
                         if self.selected_unit and self.selected_unit.team == 'player':
                             # Check if unit is on a city tile
                             city = self.game_state.get_city_at(self.selected_unit.x, self.selected_unit.y)
@@ -710,7 +689,7 @@ class ZombieStrategyGame:
                     if self.game_state.current_team != 'player':
                         self.log_message("Cannot recruit units during enemy turn!")
                     elif self.selected_city:
-                        if self.game_state.has_tech('super_soldier_program'):
+                        if self.game_state.tech_modifiers.super_soldiers:
                             self.building_placement_mode = 'super_soldier'
                             self.log_message("Recruit Super Soldier unit at city location (elite)")
                         else:
@@ -734,9 +713,8 @@ class ZombieStrategyGame:
                                 self.log_message("🧪 Initiating cure manufacturing... Click city to confirm!")
                             else:
                                 # Show dynamic cost based on tech
-                                food_cost = 350 if self.game_state.has_tech('cure_research') else 500
-                                materials_cost = 350 if self.game_state.has_tech('cure_research') else 500
-                                self.log_message(f"Not enough resources! Need {food_cost} food, {materials_cost} materials, 200 medicine, and 1 cure.")
+                                cure_cost = rules.build_cost('manufacture_cure', self.game_state)
+                                self.log_message(f"Not enough resources! Need {cure_cost['food']} food, {cure_cost['materials']} materials, {cure_cost['medicine']} medicine, and {cure_cost['cure']} cure.")
                         else:
                             if 'hospital' not in self.selected_city.buildings:
                                 self.log_message("City needs a hospital to manufacture the cure!")
@@ -776,12 +754,7 @@ class ZombieStrategyGame:
                 # Debug: Give resources and tech points (F2)
                 elif event.key == pygame.K_F2:
                     if self.selected_unit and self.selected_unit.team == 'player':
-                        self.selected_unit.inventory['food'] += 1000
-                        self.selected_unit.inventory['materials'] += 1000
-                        self.selected_unit.inventory['medicine'] += 1000
-                        self.selected_unit.inventory['cure'] = self.selected_unit.inventory.get('cure', 0) + 1
-                        self.game_state.tech_points += 1000
-                        self.log_message("DEBUG: Added 1000 resources, 1 cure, and 1000 tech points to unit")
+                        self.debug_add_resources(self.selected_unit)
                     else:
                         self.log_message("DEBUG: Select a player unit first!")
 
@@ -821,71 +794,17 @@ class ZombieStrategyGame:
                     # Check if clicked on a city
                     destination_city = self.game_state.get_city_at(tile_x, tile_y)
                     if destination_city and self.teleporting_unit:
-                        # Get source city
-                        source_city = self.game_state.get_city_at(self.teleporting_unit.x, self.teleporting_unit.y)
-
-                        if destination_city == source_city:
-                            self.log_message("Already at this city!")
-                        else:
-                            # Teleport the unit
-                            self.teleporting_unit.x = destination_city.x
-                            self.teleporting_unit.y = destination_city.y
-                            self.teleporting_unit.moves_remaining = 0  # Use up movement
-                            self.log_message(f"🚁 {self.teleporting_unit.unit_type} teleported to {destination_city.name}!")
-                            self.has_unsaved_changes = True
-
-                            # Update fog of war
-                            self.game_state.update_visibility()
-
-                            # Close menu
-                            self.helicopter_menu_open = False
-                            self.teleporting_unit = None
+                        self.helicopter_transport(self.teleporting_unit, destination_city)
                     continue  # Don't process other click handlers
 
                 # Handle tech tree clicks
                 if self.tech_tree_open and event.button == 1:
-                    from tech_tree import TECH_TREE, can_research, get_tech_cost
                     # Check if any tech was clicked
                     if hasattr(self, 'tech_positions'):
                         for tech_id, (tx, ty, tw, th) in self.tech_positions.items():
                             if tx <= mouse_x <= tx + tw and ty <= mouse_y <= ty + th:
-                                # Check if can research
                                 if tech_id not in self.game_state.researched_techs:
-                                    can_afford = can_research(tech_id, self.game_state.researched_techs)
-                                    tech_cost = get_tech_cost(tech_id, self.game_state.researched_techs)
-                                    if can_afford and self.game_state.tech_points >= tech_cost:
-                                        # Research the tech!
-                                        self.game_state.tech_points -= tech_cost
-                                        self.game_state.researched_techs.add(tech_id)
-                                        self.log_message(f"Researched: {TECH_TREE[tech_id]['name']}!")
-                                        self.has_unsaved_changes = True
-
-                                        # Apply immediate effects for vision-related techs
-                                        if tech_id in ['scout_training', 'watchtower']:
-                                            self.game_state.update_visibility()
-
-                                        # Apply immediate effects for advanced_weaponry
-                                        if tech_id == 'advanced_weaponry':
-                                            for unit in self.game_state.units:
-                                                if unit.team == 'player' and unit.unit_type == 'soldier':
-                                                    unit.attack_power += 10
-                                                    self.log_message(f"Soldier at ({unit.x}, {unit.y}) attack increased to {unit.attack_power}!")
-
-                                        # Apply immediate effects for armor_plating
-                                        if tech_id == 'armor_plating':
-                                            for unit in self.game_state.units:
-                                                if unit.team == 'player':
-                                                    unit.max_health += 40
-                                                    unit.health += 40
-                                            self.log_message("All player units gained +40 max HP!")
-
-                                        # Apply immediate effects for rapid_response
-                                        if tech_id == 'rapid_response':
-                                            for unit in self.game_state.units:
-                                                if unit.team == 'player':
-                                                    unit.max_moves += 1
-                                                    unit.moves_remaining += 1
-                                            self.log_message("All player units gained +1 movement!")
+                                    self.research_tech(tech_id)
                                 break
                     continue
 
@@ -923,31 +842,7 @@ class ZombieStrategyGame:
                             # Load the clicked save file
                             result = GameState.load_game(clicked_save)
                             if result:
-                                loaded_state, camera_x, camera_y = result
-                                self.game_state = loaded_state
-                                self.difficulty = loaded_state.difficulty  # Update main game difficulty
-                                self.difficulty_dialog_open = False  # Game is now started
-
-                                # Initialize renderer if not already done
-                                if not self.renderer:
-                                    self.renderer = Renderer(self.screen_width, self.screen_height, self.tile_size)
-
-                                self.renderer.camera_x = camera_x
-                                self.renderer.camera_y = camera_y
-                                self.selected_unit = None
-                                self.selected_city = None
-                                self.selected_tile = None
-                                self.building_placement_mode = None
-                                # Find the highest city number to continue naming correctly
-                                max_num = 0
-                                for city in self.game_state.cities:
-                                    if city.name.startswith("New Hope "):
-                                        try:
-                                            num = int(city.name.split()[-1])
-                                            max_num = max(max_num, num)
-                                        except:
-                                            pass
-                                self.city_name_counter = max_num + 1
+                                self.start_loaded_game(*result)
                             self.load_menu_open = False
                         elif self.save_menu_open:
                             # Populate input with clicked filename (without .json extension)
@@ -963,145 +858,17 @@ class ZombieStrategyGame:
 
                         # Handle upgrade mode
                         if building_type == 'upgrade':
-                            building = self.game_state.get_building_at(tile_x, tile_y)
-                            if building:
-                                # Find which city owns this building
-                                for city in self.game_state.cities:
-                                    if (tile_x, tile_y) in city.building_locations:
-                                        if city.can_upgrade_building(tile_x, tile_y):
-                                            current_level = building['level']
-                                            if city.upgrade_building(tile_x, tile_y):
-                                                new_level = current_level + 1
-                                                self.log_message(f"Upgraded {building['type']} to level {new_level}!")
-                                            else:
-                                                self.log_message("Upgrade failed!")
-                                        else:
-                                            current_level = building.get('level', 1)
-                                            if current_level >= 3:
-                                                self.log_message("Building is already at max level (3)!")
-                                            else:
-                                                self.log_message("Not enough resources to upgrade!")
-                                        break
-                            else:
-                                self.log_message("No building at this location!")
-                            self.building_placement_mode = None
+                            self.upgrade_building_at(tile_x, tile_y)
 
-                        # Handle cure manufacturing (special case - triggers immediately)
+                        # Cure manufacturing triggers immediately
                         elif building_type == 'manufacture_cure':
-                            print(f"DEBUG: manufacture_cure clicked, can_build={self.selected_city.can_build('manufacture_cure', self.game_state)}")
-                            if self.selected_city.can_build('manufacture_cure', self.game_state):
-                                result = self.selected_city.build('manufacture_cure', self.selected_city.x, self.selected_city.y, 0, self.game_state)
-                                print(f"DEBUG: build() returned: {result}")
-                                if result == 'cure_manufactured':
-                                    # Start the cure manufacturing process
-                                    self.game_state.start_cure_manufacturing(self.selected_city)
-                                    turns_needed = self.game_state.cure_manufacturing_turns_required[self.game_state.difficulty]
-                                    self.log_message(f"🧪 Cure manufacturing started! {turns_needed} turns remaining. ALL ZOMBIES are now attracted to this city!")
-                            else:
-                                self.log_message("Not enough resources to manufacture cure!")
-                            self.building_placement_mode = None
+                            self.start_cure_at(self.selected_city)
 
-                        # Handle unit recruitment (special case - spawns at city, no adjacency needed)
+                        # Unit recruitment spawns at the city, no adjacency needed
                         elif building_type in ['survivor', 'scout', 'soldier', 'medic', 'super_soldier']:
-                            # Check if city tile is already occupied by a unit
-                            if self.game_state.get_unit_at(self.selected_city.x, self.selected_city.y):
-                                self.log_message("Cannot recruit - city tile is occupied by another unit!")
-                                self.building_placement_mode = None
-                            else:
-                                costs = {
-                                    'survivor': {'food': 20, 'materials': 10},
-                                    'scout': {'food': 15, 'materials': 5},
-                                    'soldier': {'food': 30, 'materials': 20},
-                                    'medic': {'food': 25, 'materials': 15, 'medicine': 10},
-                                    'super_soldier': {'food': 50, 'materials': 40}
-                                }
-                                cost = costs[building_type]
-
-                                # Check city resources
-                                can_afford = all(self.selected_city.resources.get(res, 0) >= amt
-                                                for res, amt in cost.items())
-                                if can_afford:
-                                    for res, amt in cost.items():
-                                        self.selected_city.resources[res] -= amt
-                                    new_unit = Unit(self.selected_city.x, self.selected_city.y, building_type, 'player', self.difficulty, self.game_state)
-
-                                    # Apply combat_training tech - new units spawn at level 2
-                                    if self.game_state.has_tech('combat_training'):
-                                        # Level units up to level 2 (which requires 10 XP)
-                                        while new_unit.level < 2:
-                                            new_unit.gain_xp(10)  # Give enough XP to level up
-
-                                    self.game_state.units.append(new_unit)
-                                    self.log_message(f"Recruited {building_type.replace('_', ' ').title()} at {self.selected_city.name}!")
-                                else:
-                                    cost_str = ', '.join([f"{amt} {res}" for res, amt in cost.items()])
-                                    self.log_message(f"Not enough city resources! {building_type.capitalize()} costs: {cost_str}")
-
-                                self.building_placement_mode = None
+                            self.recruit_unit(self.selected_city, building_type)
                         else:
-                            # Regular building placement
-                            from map_generator import TileType
-                            dist = max(abs(tile_x - self.selected_city.x), abs(tile_y - self.selected_city.y))
-
-                            # Walls have special placement rules: up to 6 tiles with line-of-sight
-                            if building_type == 'wall':
-                                max_dist = 6
-                            else:
-                                max_dist = 1  # Adjacent tile for other buildings
-
-                            if dist <= max_dist:
-                                # For walls, check line-of-sight
-                                has_los = True
-                                if building_type == 'wall' and dist > 1:
-                                    has_los = self.game_state.visible[tile_y][tile_x]
-
-                                if not has_los:
-                                    self.log_message("Wall placement requires line-of-sight from city!")
-                                    self.building_placement_mode = None
-                                # Check if tile is not occupied by city, building, or enemy unit
-                                else:
-                                    unit_at_tile = self.game_state.get_unit_at(tile_x, tile_y)
-                                    enemy_unit_blocking = unit_at_tile and unit_at_tile.team != 'player'
-
-                                    if not enemy_unit_blocking and \
-                                       not self.game_state.get_city_at(tile_x, tile_y) and \
-                                       not self.game_state.get_building_at(tile_x, tile_y):
-
-                                        terrain = self.game_state.map_grid[tile_y][tile_x]
-
-                                        # Special validation for dock - must be on water
-                                        if building_type == 'dock' and terrain != TileType.WATER:
-                                            self.log_message("Docks can only be built on water!")
-                                            self.building_placement_mode = None
-                                        else:
-                                            # Regular building placement using city resources
-                                            if self.selected_city.can_build(building_type, self.game_state):
-                                                result = self.selected_city.build(building_type, tile_x, tile_y, terrain, self.game_state)
-
-                                                # Check if cure was manufactured (special win condition)
-                                                if result == 'cure_manufactured':
-                                                    # Start the cure manufacturing process
-                                                    self.game_state.start_cure_manufacturing(self.selected_city)
-                                                    turns_needed = self.game_state.cure_manufacturing_turns_required[self.game_state.difficulty]
-                                                    self.log_message(f"🧪 Cure manufacturing started! {turns_needed} turns remaining. ALL ZOMBIES are now attracted to this city!")
-                                                else:
-                                                    self.log_message(f"Built {building_type} at ({tile_x}, {tile_y})!")
-                                            else:
-                                                self.log_message(f"Not enough city resources!")
-
-                                            self.building_placement_mode = None
-                                            self.game_state.update_visibility()
-                                    else:
-                                        if enemy_unit_blocking:
-                                            self.log_message("Cannot build here - enemy unit in the way!")
-                                        else:
-                                            self.log_message("Cannot build here - tile is occupied!")
-                            else:
-                                if building_type == 'wall':
-                                    self.log_message("Wall must be within 6 tiles of city!")
-                                else:
-                                    self.log_message("Building must be adjacent to city!")
-                                self.building_placement_mode = None
+                            self.place_building(self.selected_city, building_type, tile_x, tile_y)
                     else:
                         # Normal selection mode
                         # Check if Shift is held - if so, prioritize city selection
@@ -1148,297 +915,704 @@ class ZombieStrategyGame:
                         if 0 <= tile_x < len(self.game_state.map_grid[0]) and 0 <= tile_y < len(self.game_state.map_grid):
                             self.selected_tile = (tile_x, tile_y)
 
-                elif event.button == 3:  # Right click - move unit
-                    if self.selected_unit and self.selected_unit.team == 'player' and self.selected_unit.can_move():
-                        # Calculate path (simple: move one step towards target)
-                        dx = tile_x - self.selected_unit.x
-                        dy = tile_y - self.selected_unit.y
-
-                        # Normalize to single step
-                        step_x = 0 if dx == 0 else (1 if dx > 0 else -1)
-                        step_y = 0 if dy == 0 else (1 if dy > 0 else -1)
-
-                        new_x = self.selected_unit.x + step_x
-                        new_y = self.selected_unit.y + step_y
-
-                        # Check if position is valid and not occupied
-                        if (0 <= new_x < len(self.game_state.map_grid[0]) and
-                            0 <= new_y < len(self.game_state.map_grid)):
-
-                            blocking_unit = self.game_state.get_unit_at(new_x, new_y)
-
-                            if blocking_unit:
-                                # Attack if enemy
-                                if blocking_unit.team != self.selected_unit.team:
-                                    blocking_unit.health -= self.selected_unit.attack_power
-                                    self.log_message(f"Attack! {blocking_unit.unit_type} health: {blocking_unit.health}")
-                                    if blocking_unit.health <= 0:
-                                        # Drop inventory before removing unit
-                                        self.game_state.drop_unit_inventory(blocking_unit)
-
-                                        # Award tech points for killing enemies (player only)
-                                        if self.selected_unit.team == 'player' and blocking_unit.team == 'enemy':
-                                            tech_points = 5 if blocking_unit.size > 1 else 2  # 20 for super zombies, 5 for regular
-                                            self.game_state.tech_points += tech_points
-                                            self.game_state.zombies_killed_count += 1
-
-                                        self.game_state.units.remove(blocking_unit)
-                                        self.log_message(f"{blocking_unit.unit_type} defeated!")
-
-                                        # Award XP to the attacker (player units only)
-                                        if self.selected_unit.team == 'player':
-                                            xp_gained = 50  # Base XP for defeating an enemy
-                                            leveled_up = self.selected_unit.gain_xp(xp_gained)
-                                            self.log_message(f"{self.selected_unit.unit_type} gained {xp_gained} XP! (Level {self.selected_unit.level}: {self.selected_unit.xp}/{self.selected_unit.xp_to_next_level} XP)")
-                                            if leveled_up:
-                                                self.log_message(f"LEVEL UP! {self.selected_unit.unit_type} is now level {self.selected_unit.level}! HP: {self.selected_unit.max_health}, Attack: {self.selected_unit.attack_power}")
-
-                                        # Update fog of war when unit dies
-                                        self.game_state.update_visibility()
-                                    self.selected_unit.moves_remaining -= 1
-                            else:
-                                # Move to empty tile
-                                from map_generator import TileType
-                                terrain = self.game_state.map_grid[new_y][new_x]
+                elif event.button == 3:  # Right click - move unit (a unit out of moves sets off next turn)
+                    if self.selected_unit and self.selected_unit.team == 'player':
+                        self.move_unit_toward(self.selected_unit, tile_x, tile_y)
+
+    def skip_unit_turn(self, unit):
+        """Mark a unit as done for this turn (Space)"""
+        self.record_command('skip', **self._unit_args(unit))
+        unit.turn_skipped = True
+        self.log_message(f"Skipped {unit.unit_type.capitalize()}'s turn")
+        # Auto-select next available unit
+        self.auto_select_timer = self.auto_select_delay
+
+    def found_city_with(self, unit):
+        """Found a new city with a unit, consuming it (F)"""
+        self.record_command('found_city', **self._unit_args(unit))
+        city_name = f"New Hope {self.city_name_counter}"
+        city = self.game_state.found_city(unit.x, unit.y, city_name)
+        if city:
+            self.city_name_counter += 1
+            # Transfer unit's inventory to the new city
+            transferred = {}
+            for resource in ['food', 'materials', 'medicine']:
+                amount = unit.inventory[resource]
+                if amount > 0:
+                    city.resources[resource] += amount
+                    transferred[resource] = amount
+
+            if transferred:
+                transfer_str = ', '.join([f"{v} {k}" for k, v in transferred.items()])
+                self.log_message(f"Founded {city_name} at ({unit.x}, {unit.y}) with {transfer_str}")
+            else:
+                self.log_message(f"Founded {city_name} at ({unit.x}, {unit.y})")
 
-                                # Block movement into water
-                                if terrain == TileType.WATER:
-                                    self.log_message("Cannot move into water!")
-                                else:
-                                    self.selected_unit.move(step_x, step_y, terrain)
-
-                                    # Award XP to scouts for exploring new tiles
-                                    if self.selected_unit.unit_type == 'scout' and self.selected_unit.team == 'player':
-                                        tile_pos = (new_x, new_y)
-                                        if tile_pos not in self.selected_unit.tiles_explored:
-                                            self.selected_unit.tiles_explored.add(tile_pos)
-                                            xp_gained = 1  # 1 XP per new tile explored
-                                            leveled_up = self.selected_unit.gain_xp(xp_gained)
-                                            if leveled_up:
-                                                self.log_message(f"LEVEL UP! Scout is now level {self.selected_unit.level}! HP: {self.selected_unit.max_health}, Attack: {self.selected_unit.attack_power}")
-
-                                    # Update fog of war after movement
-                                    self.game_state.update_visibility()
-
-                                    # Auto-scavenge resources if present on the new tile
-                                    pos = (new_x, new_y)
-                                    if pos in self.game_state.resources:
-                                        resources = self.game_state.resources[pos]
-
-                                        # Check if cure is present - only medics can pick up cure
-                                        can_scavenge = True
-                                        if 'cure' in resources and resources.get('cure', 0) > 0:
-                                            if self.selected_unit.unit_type != 'medic':
-                                                # Can scavenge other resources but not cure
-                                                resources_without_cure = {k: v for k, v in resources.items() if k != 'cure'}
-                                                if resources_without_cure:
-                                                    resources = resources_without_cure
-                                                    self.log_message("Only medics can pick up The Cure!")
-                                                else:
-                                                    can_scavenge = False
-
-                                        if can_scavenge and resources:
-                                            scavenged = {}
-                                            for resource, amount in resources.items():
-                                                # Apply scavenging efficiency tech bonus
-                                                if self.game_state.has_tech('scavenging_efficiency'):
-                                                    amount = int(amount * 1.25)
-                                                self.selected_unit.inventory[resource] = self.selected_unit.inventory.get(resource, 0) + amount
-                                                scavenged[resource] = amount
-
-                                            # Remove scavenged resources (or just the non-cure ones)
-                                            if 'cure' in self.game_state.resources[pos] and self.selected_unit.unit_type != 'medic':
-                                                # Keep only the cure at this location
-                                                self.game_state.resources[pos] = {'cure': self.game_state.resources[pos]['cure']}
-                                            else:
-                                                del self.game_state.resources[pos]
-
-                                            scav_str = ', '.join([f"{r}: +{a}" for r, a in scavenged.items()])
-                                            self.log_message(f"Auto-scavenged: {scav_str}")
-
-                                            # Show notification dialog with scavenged resources
-                                            resource_lines = [f"{resource.capitalize()}: +{amount}" for resource, amount in scavenged.items()]
-                                            messages = ['Resources found:'] + resource_lines + ['', 'Added to unit inventory.']
-                                            self.notification_dialog_data = {
-                                                'title': '✓ Resources Scavenged',
-                                                'messages': messages,
-                                                'type': 'info',
-                                                'callback': None
-                                            }
-                                            self.notification_dialog_open = True
-
-                                    # If unit is out of moves, start timer to auto-select next unit
-                                    if not self.selected_unit.can_move():
-                                        self.auto_select_timer = self.auto_select_delay
+            # Consume the unit that founded the city
+            self.game_state.units.remove(unit)
+            self.selected_unit = None
+        else:
+            self.log_message(f"Cannot found city here! Cities must be at least 3 tiles apart.")
+
+    def scavenge(self, unit):
+        """Scavenge the resource pile under a unit (R)"""
+        self.record_command('scavenge', **self._unit_args(unit))
+        pos = (unit.x, unit.y)
+        if pos in self.game_state.resources:
+            resources = self.game_state.resources[pos]
+
+            # Check if cure is present and unit is not a medic
+            if 'cure' in resources and resources.get('cure', 0) > 0:
+                if unit.unit_type != 'medic':
+                    self.log_message("Only medics can handle The Cure!")
+                    return
+
+            # Scavenge all resources
+            scavenged = {}
+            scavenge_multiplier = self.game_state.tech_modifiers.scavenge_multiplier
+            for resource, amount in resources.items():
+                # Apply scavenging efficiency tech bonus
+                if scavenge_multiplier != 1:
+                    amount = int(amount * scavenge_multiplier)
+                unit.inventory[resource] += amount
+                scavenged[resource] = amount
+            del self.game_state.resources[pos]
+
+            # Small chance (10%) to find a survivor when scavenging
+            found_survivor = False
+            if self.game_state.rng.loot.random() < 0.10:
+                # Try to spawn survivor on adjacent tile
+                adjacent_positions = [
+                    (unit.x + dx, unit.y + dy)
+                    for dx, dy in [(-1, 0), (1, 0), (0, -1), (0, 1), (-1, -1), (-1, 1), (1, -1), (1, 1)]
+                ]
+                # Filter valid positions (within bounds, not water, no units)
+                from map_generator import TileType
+                map_width = len(self.game_state.map_grid[0])
+                map_height = len(self.game_state.map_grid)
+                valid_positions = [
+                    (x, y) for x, y in adjacent_positions
+                    if (0 <= x < map_width and
+                        0 <= y < map_height and
+                        self.game_state.map_grid[y][x] != TileType.WATER and
+                        not any(u.x == x and u.y == y for u in self.game_state.units))
+                ]
+
+                if valid_positions:
+                    spawn_x, spawn_y = self.game_state.rng.loot.choice(valid_positions)
+                    new_survivor = Unit(spawn_x, spawn_y, 'survivor', 'player', self.game_state.difficulty)
+                    self.game_state.units.append(new_survivor)
+                    found_survivor = True
+                    self.log_message(f"Found a survivor! They joined your group at ({spawn_x}, {spawn_y})")
+
+            # Show notification dialog with scavenged resources
+            resource_lines = [f"{resource.capitalize()}: +{amount}" for resource, amount in scavenged.items()]
+            messages = ['Successfully scavenged:'] + resource_lines + ['', 'Resources added to unit inventory.']
+            if found_survivor:
+                messages.append('')
+                messages.append('BONUS: Found a survivor!')
+                messages.append('A survivor has joined your group!')
+
+            self.notification_dialog_data = {
+                'title': '✓ Resources Scavenged',
+                'messages': messages,
+                'type': 'info',
+                'callback': None
+            }
+            self.notification_dialog_open = True
+            self.log_message(f"Scavenged: {scavenged} (now in unit's inventory)")
+
+    def deposit_resources(self, unit):
+        """Transfer a unit's inventory to the city it stands in (T)"""
+        self.record_command('transfer', **self._unit_args(unit))
+        city = self.game_state.get_city_at(unit.x, unit.y)
+        if city:
+            # Transfer all resources from unit to city
+            transferred = {}
+            for resource in ['food', 'materials', 'medicine', 'cure']:
+                amount = unit.inventory.get(resource, 0)
+                if amount > 0:
+                    city.resources[resource] = city.resources.get(resource, 0) + amount
+                    transferred[resource] = amount
+                    unit.inventory[resource] = 0
+            if transferred:
+                self.log_message(f"Deposited to {city.name}: {transferred}")
+            else:
+                self.log_message("Unit has no resources to deposit")
+        else:
+            self.log_message("Unit must be in a city to deposit resources")
+
+    def pickup_resources(self, unit):
+        """Transfer a city's stockpile to a unit standing in it (G)"""
+        self.record_command('gather', **self._unit_args(unit))
+        city = self.game_state.get_city_at(unit.x, unit.y)
+        if city:
+            # Transfer all resources from city to unit
+            transferred = {}
+            for resource in ['food', 'materials', 'medicine', 'cure']:
+                amount = city.resources.get(resource, 0)
+                if amount > 0:
+                    unit.inventory[resource] = unit.inventory.get(resource, 0) + amount
+                    transferred[resource] = amount
+                    city.resources[resource] = 0
+            if transferred:
+                self.log_message(f"Picked up from {city.name}: {transferred}")
+            else:
+                self.log_message("City has no resources to pick up")
+        else:
+            self.log_message("Unit must be in a city to pick up resources")
+
+    def heal_adjacent(self, unit):
+        """Medic heals the first wounded adjacent friendly unit (H)"""
+        self.record_command('heal', **self._unit_args(unit))
+        if unit.can_move():
+            # Find adjacent friendly units that need healing
+            healed = False
+            for dx in [-1, 0, 1]:
+                for dy in [-1, 0, 1]:
+                    if dx == 0 and dy == 0:
+                        continue
+                    target_x = unit.x + dx
+                    target_y = unit.y + dy
+                    target_unit = self.game_state.get_unit_at(target_x, target_y)
+                    if target_unit and target_unit.team == 'player' and target_unit.health < target_unit.max_health:
+                        # Heal the unit (scales with medic level: 30 + 10 per level)
+                        base_heal = 30
+                        # Apply tactical_medicine tech for +20 healing
+                        base_heal += self.game_state.tech_modifiers.medic_heal_bonus
+                        heal_amount = base_heal + (unit.level - 1) * 10
+                        old_health = target_unit.health
+                        target_unit.health = min(target_unit.max_health, target_unit.health + heal_amount)
+                        actual_heal = target_unit.health - old_health
+                        self.log_message(f"Medic (Lvl {unit.level}) healed {target_unit.unit_type} for {actual_heal} HP! (Now at {target_unit.health}/{target_unit.max_health})")
+
+                        # Award XP to medic (1 XP per HP healed)
+                        leveled_up = unit.gain_xp(actual_heal)
+                        self.log_message(f"Medic gained {actual_heal} XP! (Level {unit.level}: {unit.xp}/{unit.xp_to_next_level} XP)")
+                        if leveled_up:
+                            self.log_message(f"LEVEL UP! Medic is now level {unit.level}! HP: {unit.max_health}, Attack: {unit.attack_power}")
+
+                        unit.moves_remaining -= 1
+                        healed = True
+                        break
+                if healed:
+                    break
+            if not healed:
+                self.log_message("No adjacent friendly units need healing")
+        else:
+            self.log_message("Medic has no moves remaining")
+
+    def triangulate(self, unit):
+        """Scout spends its turn narrowing down the lab location (Q)"""
+        self.record_command('triangulate', **self._unit_args(unit))
+        if unit.moves_remaining >= unit.max_moves:
+            if self.game_state.triangulation_level < 4:
+                # Use the scout's turn
+                unit.moves_remaining = 0
+                self.game_state.triangulation_level += 1
+
+                # Generate random offset for the circle (lab must still be inside)
+                # The offset is in tile coordinates, will be scaled when rendering
+                # Radius percentages match renderer: Level 1: 50%, Level 2: 30%, Level 3: 15%
+                # Map these to approximate tile radii based on map size
+                map_width = len(self.game_state.map_grid[0])
+                map_height = len(self.game_state.map_grid)
+                radius_percentages = {1: 0.50, 2: 0.30, 3: 0.15, 4: 0}
+                # Calculate max offset (circle radius in tiles, minus some margin)
+                circle_radius_tiles = min(map_width, map_height) * radius_percentages.get(self.game_state.triangulation_level, 0) * 0.5
+                # Random offset within 70% of the radius so lab is comfortably inside
+                max_offset = circle_radius_tiles * 0.7
+                if max_offset > 0:
+                    angle = self.game_state.rng.loot.uniform(0, 2 * math.pi)
+                    distance = self.game_state.rng.loot.uniform(0, max_offset)
+                    offset_x = distance * math.cos(angle)
+                    offset_y = distance * math.sin(angle)
+                    self.game_state.triangulation_circle_offset = (offset_x, offset_y)
+                else:
+                    self.game_state.triangulation_circle_offset = (0, 0)
+
+                level_messages = {
+                    1: "Scout detected faint radio signals from the lab. Area marked on minimap (very large radius).",
+                    2: "Scout triangulated signals more precisely. Search area narrowed (large radius).",
+                    3: "Scout is closing in on the signal source. Area significantly reduced (medium radius).",
+                    4: "Scout pinpointed the exact lab location! Marked on minimap."
+                }
+                self.log_message(level_messages[self.game_state.triangulation_level])
+                self.has_unsaved_changes = True
+            else:
+                self.log_message("Lab location already revealed!")
+        else:
+            self.log_message("Scout needs full movement points to triangulate signals")
 
-    def start_zombie_turn_animated(self):
-        """Start the animated zombie turn"""
-        # Capture all zombie positions and moves before AI turn
-        self.zombie_positions_snapshot = {}
-        self.zombie_action_log = {}
-
-        for unit in self.game_state.units:
-            if unit.team == 'enemy' and (unit.unit_type == 'zombie' or unit.unit_type == 'super_zombie'):
-                self.zombie_positions_snapshot[unit] = (unit.x, unit.y)
-                # Track initial moves to count attacks
-                self.zombie_action_log[unit] = {'start_moves': unit.max_moves, 'actions': []}
-
-        # Execute AI turn - zombies will move to new positions
-        self.game_state.execute_ai_turn()
-
-        # Build animation dict with start and end positions, and count actions
-        self.zombie_animations = {}
-        for unit in self.game_state.units:
-            if unit.team == 'enemy' and (unit.unit_type == 'zombie' or unit.unit_type == 'super_zombie'):
-                if unit in self.zombie_positions_snapshot:
-                    start_x, start_y = self.zombie_positions_snapshot[unit]
-                    end_x, end_y = unit.x, unit.y
-
-                    # Calculate how many moves were used
-                    if unit in self.zombie_action_log:
-                        moves_used = self.zombie_action_log[unit]['start_moves'] - unit.moves_remaining
+    def helicopter_transport(self, unit, destination_city):
+        """Fly a unit from its city to another city (P menu)"""
+        self.record_command('helicopter', **self._unit_args(unit), **self._city_args(destination_city))
+        source_city = self.game_state.get_city_at(unit.x, unit.y)
+
+        if destination_city == source_city:
+            self.log_message("Already at this city!")
+        else:
+            # Teleport the unit
+            unit.x = destination_city.x
+            unit.y = destination_city.y
+            unit.moves_remaining = 0  # Use up movement
+            self.log_message(f"🚁 {unit.unit_type} teleported to {destination_city.name}!")
+            self.has_unsaved_changes = True
+
+            # Update fog of war
+            self.game_state.update_visibility()
+
+            # Close menu
+            self.helicopter_menu_open = False
+            self.teleporting_unit = None
+
+    def research_tech(self, tech_id):
+        """Spend tech points on a technology (tech tree click)"""
+        from tech_tree import TECH_TREE, can_research, get_tech_cost
+        self.record_command('research', tech=tech_id)
+        can_afford = can_research(tech_id, self.game_state.researched_techs)
+        tech_cost = get_tech_cost(tech_id, self.game_state.researched_techs)
+        if can_afford and self.game_state.tech_points >= tech_cost:
+            # Research the tech!
+            self.game_state.tech_points -= tech_cost
+            units_updated = self.game_state.add_researched_tech(tech_id)
+            self.log_message(f"Researched: {TECH_TREE[tech_id]['name']}!")
+            self.has_unsaved_changes = True
+
+            # Retroactive effects (stats of existing units, vision, production) were applied
+            # by add_researched_tech in one batch pass
+            if tech_id == 'advanced_weaponry' and units_updated:
+                self.log_message(f"{units_updated} soldiers' attack increased by 10!")
+            elif tech_id == 'armor_plating':
+                self.log_message("All player units gained +40 max HP!")
+            elif tech_id == 'rapid_response':
+                self.log_message("All player units gained +1 movement!")
+
+    def upgrade_building_at(self, tile_x, tile_y):
+        """Upgrade the building on a tile (U mode click)"""
+        self.record_command('upgrade', tile=[tile_x, tile_y])
+        building = self.game_state.get_building_at(tile_x, tile_y)
+        if building:
+            # Find which city owns this building
+            for city in self.game_state.cities:
+                if (tile_x, tile_y) in city.building_locations:
+                    if city.can_upgrade_building(tile_x, tile_y):
+                        current_level = building['level']
+                        if city.upgrade_building(tile_x, tile_y):
+                            new_level = current_level + 1
+                            self.log_message(f"Upgraded {building['type']} to level {new_level}!")
+                        else:
+                            self.log_message("Upgrade failed!")
                     else:
-                        moves_used = 0
-
-                    # Calculate distance moved (Chebyshev distance)
-                    distance_moved = max(abs(end_x - start_x), abs(end_y - start_y))
-
-                    # If moves used exceeds distance moved, zombie attacked
-                    attacks_made = max(0, moves_used - distance_moved)
-
-                    # Determine animation type
-                    if distance_moved > 0 and attacks_made == 0:
-                        # Pure movement - show moving to final position
-                        self.zombie_animations[unit] = {
-                            'type': 'move',
-                            'start': (start_x, start_y),
-                            'end': (end_x, end_y),
-                            'attack_count': 0
-                        }
-                    elif distance_moved > 0 and attacks_made > 0:
-                        # Moved and attacked - show move then attack from final position
-                        attack_target = self._find_nearest_target_for_attack_animation(unit)
-                        if attack_target:
-                            self.zombie_animations[unit] = {
-                                'type': 'move_attack',
-                                'start': (start_x, start_y),
-                                'end': (end_x, end_y),
-                                'attack_target': attack_target,
-                                'attack_count': attacks_made
-                            }
+                        current_level = building.get('level', 1)
+                        if current_level >= 3:
+                            self.log_message("Building is already at max level (3)!")
                         else:
-                            # No target found, just show movement
-                            self.zombie_animations[unit] = {
-                                'type': 'move',
-                                'start': (start_x, start_y),
-                                'end': (end_x, end_y),
-                                'attack_count': 0
-                            }
-                    elif distance_moved == 0 and attacks_made > 0:
-                        # Pure attack - no movement
-                        attack_target = self._find_nearest_target_for_attack_animation(unit)
-                        if attack_target:
-                            self.zombie_animations[unit] = {
-                                'type': 'attack',
-                                'start': (end_x, end_y),
-                                'end': attack_target,
-                                'attack_count': attacks_made
-                            }
-
-        # Start animation
-        self.animating_zombies = True
-        self.animation_start_time = pygame.time.get_ticks()
+                            self.log_message("Not enough resources to upgrade!")
+                    break
+        else:
+            self.log_message("No building at this location!")
+        self.building_placement_mode = None
+
+    def start_cure_at(self, city):
+        """Begin manufacturing The Cure in a city (C mode click)"""
+        self.record_command('manufacture_cure', **self._city_args(city))
+        print(f"DEBUG: manufacture_cure clicked, can_build={city.can_build('manufacture_cure', self.game_state)}")
+        if city.can_build('manufacture_cure', self.game_state):
+            result = city.build('manufacture_cure', city.x, city.y, 0, self.game_state)
+            print(f"DEBUG: build() returned: {result}")
+            if result == 'cure_manufactured':
+                # Start the cure manufacturing process
+                self.game_state.start_cure_manufacturing(city)
+                turns_needed = self.game_state.cure_manufacturing_turns_required
+                self.log_message(f"🧪 Cure manufacturing started! {turns_needed} turns remaining. ALL ZOMBIES are now attracted to this city!")
+        else:
+            self.log_message("Not enough resources to manufacture cure!")
+        self.building_placement_mode = None
+
+    def recruit_unit(self, city, unit_type):
+        """Recruit a unit on a city tile (6-0 keys)"""
+        self.record_command('recruit', **self._city_args(city), unit_type=unit_type)
+        # Check if city tile is already occupied by a unit
+        if self.game_state.get_unit_at(city.x, city.y):
+            self.log_message("Cannot recruit - city tile is occupied by another unit!")
+            self.building_placement_mode = None
+        else:
+            cost = rules.unit_costs[unit_type]
+
+            # Check city resources
+            can_afford = all(city.resources.get(res, 0) >= amt
+                            for res, amt in cost.items())
+            if can_afford:
+                for res, amt in cost.items():
+                    city.resources[res] -= amt
+                new_unit, = self.game_state.spawn_units(unit_type, [(city.x, city.y)])
+
+                # Apply combat_training tech - new units spawn at level 2
+                recruit_level = self.game_state.tech_modifiers.recruit_level
+                while new_unit.level < recruit_level:
+                    new_unit.gain_xp(10)  # Give enough XP to level up (level 2 requires 10 XP)
+
+                self.log_message(f"Recruited {unit_type.replace('_', ' ').title()} at {city.name}!")
+            else:
+                cost_str = ', '.join([f"{amt} {res}" for res, amt in cost.items()])
+                self.log_message(f"Not enough city resources! {unit_type.capitalize()} costs: {cost_str}")
 
-    def _find_nearest_target_for_attack_animation(self, zombie):
-        """Find the actual target tile for attack animation"""
-        # Use the recorded attack target if available
-        if hasattr(zombie, 'last_attack_target') and zombie.last_attack_target:
-            return zombie.last_attack_target
+            self.building_placement_mode = None
 
-        # Fallback: check all adjacent tiles for units, cities, or buildings
-        # (This shouldn't happen if the zombie attacked, but provides backward compatibility)
-        for dy in [-1, 0, 1]:
-            for dx in [-1, 0, 1]:
-                if dx == 0 and dy == 0:
-                    continue
-                check_x = zombie.x + dx
-                check_y = zombie.y + dy
+    def place_building(self, city, building_type, tile_x, tile_y):
+        """Build a structure for a city on a tile (building mode click)"""
+        self.record_command('build', **self._city_args(city), building=building_type, tile=[tile_x, tile_y])
+        from map_generator import TileType
+        dist = max(abs(tile_x - city.x), abs(tile_y - city.y))
 
-                # Check if there's a unit, city, or building there
-                target_unit = self.game_state.get_unit_at(check_x, check_y)
-                if target_unit and target_unit.team != zombie.team:
-                    return (check_x, check_y)
+        # Walls have special placement rules: up to 6 tiles with line-of-sight
+        if building_type == 'wall':
+            max_dist = 6
+        else:
+            max_dist = 1  # Adjacent tile for other buildings
+
+        if dist <= max_dist:
+            # For walls, check line-of-sight
+            has_los = True
+            if building_type == 'wall' and dist > 1:
+                has_los = self.game_state.visible[tile_y][tile_x]
+
+            if not has_los:
+                self.log_message("Wall placement requires line-of-sight from city!")
+                self.building_placement_mode = None
+            # Check if tile is not occupied by city, building, or enemy unit
+            else:
+                unit_at_tile = self.game_state.get_unit_at(tile_x, tile_y)
+                enemy_unit_blocking = unit_at_tile and unit_at_tile.team != 'player'
 
-                target_city = self.game_state.get_city_at(check_x, check_y)
-                if target_city:
-                    return (check_x, check_y)
+                if not enemy_unit_blocking and \
+                   not self.game_state.get_city_at(tile_x, tile_y) and \
+                   not self.game_state.get_building_at(tile_x, tile_y):
 
-                target_building = self.game_state.get_building_at(check_x, check_y)
-                if target_building:
-                    return (check_x, check_y)
+                    terrain = self.game_state.map_grid[tile_y][tile_x]
 
-        return None
+                    # Special validation for dock - must be on water
+                    if building_type == 'dock' and terrain != TileType.WATER:
+                        self.log_message("Docks can only be built on water!")
+                        self.building_placement_mode = None
+                    else:
+                        # Regular building placement using city resources
+                        if city.can_build(building_type, self.game_state):
+                            result = city.build(building_type, tile_x, tile_y, terrain, self.game_state)
+
+                            # Check if cure was manufactured (special win condition)
+                            if result == 'cure_manufactured':
+                                # Start the cure manufacturing process
+                                self.game_state.start_cure_manufacturing(city)
+                                turns_needed = self.game_state.cure_manufacturing_turns_required
+                                self.log_message(f"🧪 Cure manufacturing started! {turns_needed} turns remaining. ALL ZOMBIES are now attracted to this city!")
+                            else:
+                                self.log_message(f"Built {building_type} at ({tile_x}, {tile_y})!")
+                        else:
+                            self.log_message(f"Not enough city resources!")
 
-    def get_unit_render_position(self, unit):
-        """Get the position where a unit should be rendered (handles animation)"""
-        if self.animating_zombies and unit in self.zombie_animations:
-            elapsed = (pygame.time.get_ticks() - self.animation_start_time) / 1000.0
-            progress = min(1.0, elapsed / self.animation_duration)
-
-            anim = self.zombie_animations[unit]
-
-            if anim['type'] == 'move':
-                # Linear interpolation for movement
-                start_x, start_y = anim['start']
-                end_x, end_y = anim['end']
-                render_x = start_x + (end_x - start_x) * progress
-                render_y = start_y + (end_y - start_y) * progress
-                return (render_x, render_y)
-
-            elif anim['type'] == 'attack':
-                # Bumping animation for attacks
-                start_x, start_y = anim['start']
-                end_x, end_y = anim['end']
-                attack_count = anim['attack_count']
-                # Each attack gets equal time in the 1-second duration
-                time_per_attack = 1.0 / max(1, attack_count)
-                # Progress within current attack cycle (0 to 1)
-                cycle_progress = (progress % time_per_attack) / time_per_attack
-
-                # Bump 30% toward target, then return (sine wave for smooth motion)
-                bump_amount = 0.3 * math.sin(cycle_progress * math.pi)
-                render_x = start_x + (end_x - start_x) * bump_amount
-                render_y = start_y + (end_y - start_y) * bump_amount
-                return (render_x, render_y)
-
-            elif anim['type'] == 'move_attack':
-                # Combined movement and attack animation
-                # First half: move to final position
-                # Second half: attack from final position
-                start_x, start_y = anim['start']
-                end_x, end_y = anim['end']
-                attack_target_x, attack_target_y = anim['attack_target']
-                attack_count = anim['attack_count']
-
-                if progress < 0.5:
-                    # First half: movement (0 to 0.5 progress maps to 0 to 1 movement)
-                    move_progress = progress * 2.0
-                    render_x = start_x + (end_x - start_x) * move_progress
-                    render_y = start_y + (end_y - start_y) * move_progress
-                    return (render_x, render_y)
+                        self.building_placement_mode = None
+                        self.game_state.update_visibility()
                 else:
-                    # Second half: attack animation (0.5 to 1.0 progress maps to attack cycle)
-                    attack_progress = (progress - 0.5) * 2.0  # Normalize to 0-1
-                    time_per_attack = 1.0 / max(1, attack_count)
-                    cycle_progress = (attack_progress % time_per_attack) / time_per_attack
-
-                    # Bump 30% toward target, then return
-                    bump_amount = 0.3 * math.sin(cycle_progress * math.pi)
-                    render_x = end_x + (attack_target_x - end_x) * bump_amount
-                    render_y = end_y + (attack_target_y - end_y) * bump_amount
-                    return (render_x, render_y)
+                    if enemy_unit_blocking:
+                        self.log_message("Cannot build here - enemy unit in the way!")
+                    else:
+                        self.log_message("Cannot build here - tile is occupied!")
         else:
-            return (unit.x, unit.y)
+            if building_type == 'wall':
+                self.log_message("Wall must be within 6 tiles of city!")
+            else:
+                self.log_message("Building must be adjacent to city!")
+            self.building_placement_mode = None
+
+    def move_unit_toward(self, unit, tile_x, tile_y):
+        """Order a unit to walk to a tile and start walking (right click); the order stands
+        across turns until the unit arrives, attacks or has no path left"""
+        self.record_command('move', **self._unit_args(unit), tile=[tile_x, tile_y])
+        unit.goto = (tile_x, tile_y)
+        self.follow_goto(unit)
+
+    def follow_goto(self, unit):
+        """Walk a unit along its A* path toward its goto tile while it has moves left"""
+        game_state = self.game_state
+        while unit.goto and unit.can_move():
+            goal = unit.goto
+            if (unit.x, unit.y) == goal:
+                unit.goto = None
+                break
+            path = game_state.find_path(unit, goal)
+            if not path:
+                self.log_message(f"{unit.unit_type.capitalize()} has no path to ({goal[0]}, {goal[1]})")
+                unit.goto = None
+                break
+            # Keep the rest of the path cached for the next step (or next turn)
+            game_state.get_path_cache().advance((unit.x, unit.y), goal)
+            if not self.step_unit(unit, *path[0]):
+                unit.goto = None  # Attacked the unit on the goal tile, or was stopped
+                break
+        if unit.goto and (unit.x, unit.y) == unit.goto:
+            unit.goto = None
+
+    def step_unit(self, unit, new_x, new_y):
+        """Move a unit onto an adjacent tile, attacking an enemy standing there and
+        auto-scavenging resources; returns True if the unit moved"""
+        step_x = new_x - unit.x
+        step_y = new_y - unit.y
+
+        # Check if position is valid and not occupied
+        if (0 <= new_x < len(self.game_state.map_grid[0]) and
+            0 <= new_y < len(self.game_state.map_grid)):
+
+            blocking_unit = self.game_state.get_unit_at(new_x, new_y)
+
+            if blocking_unit:
+                # Attack if enemy
+                if blocking_unit.team != unit.team:
+                    blocking_unit.health -= unit.attack_power
+                    self.log_message(f"Attack! {blocking_unit.unit_type} health: {blocking_unit.health}")
+                    if blocking_unit.health <= 0:
+                        # Drop inventory before removing unit
+                        self.game_state.drop_unit_inventory(blocking_unit)
+
+                        # Award tech points for killing enemies (player only)
+                        if unit.team == 'player' and blocking_unit.team == 'enemy':
+                            tech_points = 5 if blocking_unit.size > 1 else 2  # 20 for super zombies, 5 for regular
+                            self.game_state.tech_points += tech_points
+                            self.game_state.zombies_killed_count += 1
+
+                        self.game_state.units.remove(blocking_unit)
+                        self.log_message(f"{blocking_unit.unit_type} defeated!")
+
+                        # Award XP to the attacker (player units only)
+                        if unit.team == 'player':
+                            xp_gained = 50  # Base XP for defeating an enemy
+                            leveled_up = unit.gain_xp(xp_gained)
+                            self.log_message(f"{unit.unit_type} gained {xp_gained} XP! (Level {unit.level}: {unit.xp}/{unit.xp_to_next_level} XP)")
+                            if leveled_up:
+                                self.log_message(f"LEVEL UP! {unit.unit_type} is now level {unit.level}! HP: {unit.max_health}, Attack: {unit.attack_power}")
+
+                        # Update fog of war when unit dies
+                        self.game_state.update_visibility()
+                    unit.moves_remaining -= 1
+            else:
+                # Move to empty tile
+                from map_generator import TileType
+                terrain = self.game_state.map_grid[new_y][new_x]
+
+                # Block movement into water
+                if terrain == TileType.WATER:
+                    self.log_message("Cannot move into water!")
+                elif unit.move(step_x, step_y, terrain):
+
+                    # Award XP to scouts for exploring new tiles
+                    if unit.unit_type == 'scout' and unit.team == 'player':
+                        tile_pos = (new_x, new_y)
+                        if tile_pos not in unit.tiles_explored:
+                            unit.tiles_explored.add(tile_pos)
+                            xp_gained = 1  # 1 XP per new tile explored
+                            leveled_up = unit.gain_xp(xp_gained)
+                            if leveled_up:
+                                self.log_message(f"LEVEL UP! Scout is now level {unit.level}! HP: {unit.max_health}, Attack: {unit.attack_power}")
+
+                    # Update fog of war after movement
+                    self.game_state.update_visibility()
+
+                    # Auto-scavenge resources if present on the new tile
+                    pos = (new_x, new_y)
+                    if pos in self.game_state.resources:
+                        resources = self.game_state.resources[pos]
+
+                        # Check if cure is present - only medics can pick up cure
+                        can_scavenge = True
+                        if 'cure' in resources and resources.get('cure', 0) > 0:
+                            if unit.unit_type != 'medic':
+                                # Can scavenge other resources but not cure
+                                resources_without_cure = {k: v for k, v in resources.items() if k != 'cure'}
+                                if resources_without_cure:
+                                    resources = resources_without_cure
+                                    self.log_message("Only medics can pick up The Cure!")
+                                else:
+                                    can_scavenge = False
+
+                        if can_scavenge and resources:
+                            scavenged = {}
+                            scavenge_multiplier = self.game_state.tech_modifiers.scavenge_multiplier
+                            for resource, amount in resources.items():
+                                # Apply scavenging efficiency tech bonus
+                                if scavenge_multiplier != 1:
+                                    amount = int(amount * scavenge_multiplier)
+                                unit.inventory[resource] = unit.inventory.get(resource, 0) + amount
+                                scavenged[resource] = amount
+
+                            # Remove scavenged resources (or just the non-cure ones)
+                            if 'cure' in self.game_state.resources[pos] and unit.unit_type != 'medic':
+                                # Keep only the cure at this location
+                                self.game_state.resources[pos] = {'cure': self.game_state.resources[pos]['cure']}
+                            else:
+                                del self.game_state.resources[pos]
+
+                            scav_str = ', '.join([f"{r}: +{a}" for r, a in scavenged.items()])
+                            self.log_message(f"Auto-scavenged: {scav_str}")
+
+                            # Show notification dialog with scavenged resources
+                            resource_lines = [f"{resource.capitalize()}: +{amount}" for resource, amount in scavenged.items()]
+                            messages = ['Resources found:'] + resource_lines + ['', 'Added to unit inventory.']
+                            self.notification_dialog_data = {
+                                'title': '✓ Resources Scavenged',
+                                'messages': messages,
+                                'type': 'info',
+                                'callback': None
+                            }
+                            self.notification_dialog_open = True
+
+                    # If unit is out of moves, start timer to auto-select next unit
+                    if not unit.can_move():
+                        self.auto_select_timer = self.auto_select_delay
+                    return True
+        return False
+
+    def debug_add_resources(self, unit):
+        """DEBUG: give a unit resources, a cure and tech points (F2)"""
+        self.record_command('debug_resources', **self._unit_args(unit))
+        unit.inventory['food'] += 1000
+        unit.inventory['materials'] += 1000
+        unit.inventory['medicine'] += 1000
+        unit.inventory['cure'] = unit.inventory.get('cure', 0) + 1
+        self.game_state.tech_points += 1000
+        self.log_message("DEBUG: Added 1000 resources, 1 cure, and 1000 tech points to unit")
+
+    def complete_enemy_turn(self):
+        """Finish the enemy turn after the zombie animation and start the player's turn"""
+        # Skipping the animation (E) can land here before every zombie has moved
+        if self.ai_turn is not None:
+            self.advance_ai_turn()
+        self.record_command('end_enemy_turn')
+        self.animating_zombies = False
+        self.zombie_animator = None
+
+        # Now end enemy turn and start player turn
+        self.game_state.current_team = 'player'
+        self.game_state.turn += 1
+        # Reset player unit moves
+        with turn_profiler.phase('reset_moves'):
+            for unit in self.game_state.units:
+                if unit.team == 'player':
+                    unit.reset_moves()
+
+        # Units with standing goto orders carry on walking
+        with turn_profiler.phase('goto_orders'):
+            for unit in list(self.game_state.units.players):
+                if unit.goto:
+                    self.follow_goto(unit)
+
+        # Award tech points for surviving (1 per turn)
+        self.game_state.tech_points += 1
+
+        # Handle cure manufacturing progress
+        with turn_profiler.phase('cure'):
+            if self.game_state.cure_manufacturing_city:
+                self.game_state.cure_manufacturing_turns_remaining -= 1
+                self.log_message(f"🧪 Cure manufacturing: {self.game_state.cure_manufacturing_turns_remaining} turns remaining!")
+                if self.game_state.cure_manufacturing_turns_remaining <= 0:
+                    # Cure is complete!
+                    self.game_state.manufacture_cure()
+                    self.log_message(f"🎉 CURE COMPLETE! The city survived the onslaught!")
+
+        # Autosave at the start of player's turn
+        if not self.headless_replay:
+            with turn_profiler.phase('autosave'):
+                self.game_state.autosave(self.renderer.camera_x, self.renderer.camera_y)
+        # Produce resources in all cities
+        with turn_profiler.phase('production'):
+            for city in self.game_state.cities:
+                production = city.produce_resources(self.game_state)
+                if any(production.values()):
+                    prod_str = ', '.join([f"{k}: +{v}" for k, v in production.items() if v > 0])
+                    self.log_message(f"{city.name} produced: {prod_str}")
+        # Check for cure manufacturing completion
+        if self.game_state.game_won:
+            if not self.headless_replay:
+                self.cure_leaderboard = GameState.save_cure_victory(self.game_state.turn, self.game_state.difficulty)
+            self.game_won = True
+            self.victory_panel_open = True
+            self.final_score = self.game_state.turn
+            self.log_message(f"🎉 VICTORY! Cure manufactured on turn {self.game_state.turn}!")
+
+        # Check if cure manufacturing city was destroyed
+        if self.game_state.cure_manufacturing_city:
+            if self.game_state.cure_manufacturing_city not in self.game_state.cities:
+                self.log_message(f"💀 GAME OVER! The city manufacturing the cure was destroyed!")
+                self.game_over = True
+                self.game_state.cure_manufacturing_city = None
+                self.game_state.cure_manufacturing_turns_remaining = 0
+
+        # Apply automated defenses damage to adjacent zombies
+        with turn_profiler.phase('defenses'):
+            defense_results = self.game_state.apply_automated_defenses()
+        if defense_results['damaged'] > 0 or defense_results['killed'] > 0:
+            killed = defense_results['killed']
+            damaged = defense_results['damaged'] - killed  # Subtract killed from total damaged
+            if killed > 0 and damaged > 0:
+                self.log_message(f"⚡ Automated Defenses: {killed} zombie(s) destroyed, {damaged} damaged!")
+            elif killed > 0:
+                self.log_message(f"⚡ Automated Defenses: {killed} zombie(s) destroyed!")
+            elif damaged > 0:
+                self.log_message(f"⚡ Automated Defenses: {damaged} zombie(s) damaged!")
+        # Spawn new zombies
+        with turn_profiler.phase('spawn'):
+            self.game_state.spawn_zombies()
+        # Update fog of war
+        with turn_profiler.phase('visibility'):
+            self.game_state.update_visibility()
+        # Work out which tiles the zombies threaten this turn (for the Z overlay, warnings and auto-select),
+        # now that this turn's spawns, defense kills and fog are all in
+        with turn_profiler.phase('threat_map'):
+            self.game_state.get_threat_map()
+        self.game_state.finish_turn_profile()
+        if profile_capture.turn_done():
+            self.finish_profile_capture()
+        # Checkpoint after every full round so the replayer can verify it
+        self.record_checkpoint()
+
+    def start_zombie_turn_animated(self):
+        """Start the zombie turn: the AI runs a slice per frame and zombies animate as soon as they have moved"""
+        self.ai_turn = self.game_state.iter_ai_turn()
+        with turn_profiler.phase('ai_turn'):
+            self.ai_turn_total = next(self.ai_turn)  # Ages zombies and picks targets
+        self.ai_turn_done = 0
+        self.ai_actions_animated = 0
+
+        self.zombie_animator = ZombieAnimator(self.animation_duration)
+        self.animating_zombies = True
+        self.animation_start_time = pygame.time.get_ticks()
+
+        # The first batch starts animating straight away
+        self.advance_ai_turn(self.ai_frame_budget)
+
+    def advance_ai_turn(self, budget=None):
+        """Move zombies for up to `budget` seconds (the rest of the turn if None) and animate the new steps"""
+        if self.ai_turn is None:
+            return
+        deadline = None if budget is None else time.perf_counter() + budget
+        with turn_profiler.phase('ai_turn'), turn_profiler.phase('ai_movement'):
+            for done in self.ai_turn:
+                self.ai_turn_done = done
+                if deadline is not None and time.perf_counter() >= deadline:
+                    break
+            else:
+                self.ai_turn = None  # Every zombie has moved
+
+        actions = self.game_state.ai_actions
+        self.zombie_animator.add(actions[self.ai_actions_animated:], pygame.time.get_ticks() / 1000.0)
+        self.ai_actions_animated = len(actions)
+
+    def animated_unit_positions(self, start_col, start_row, end_col, end_row):
+        """Render positions of the zombies animating inside the given tile range, computed in one pass"""
+        if not self.animating_zombies or self.zombie_animator is None:
+            return {}
+        now = pygame.time.get_ticks() / 1000.0
+        return self.zombie_animator.positions(now, start_col, start_row, end_col, end_row)
 
     def update(self):
         """Update game logic"""
@@ -1465,78 +1639,15 @@ class ZombieStrategyGame:
             if keys[pygame.K_d]:
                 self.renderer.move_camera(scroll_speed, 0)
 
-        # Handle zombie animation
+        # Handle the zombie turn: run the next AI slice, or end the turn once every zombie has animated
         if self.animating_zombies:
-            elapsed = (pygame.time.get_ticks() - self.animation_start_time) / 1000.0
-            if elapsed >= self.animation_duration:
-                # Animation complete, end enemy turn
-                self.animating_zombies = False
-                self.zombie_animations = {}
-
-                # Clear last_attack_target from all zombies
-                for unit in self.game_state.units:
-                    if unit.team == 'enemy' and hasattr(unit, 'last_attack_target'):
-                        unit.last_attack_target = None
-
-                # Now end enemy turn and start player turn
-                self.game_state.current_team = 'player'
-                self.game_state.turn += 1
-                # Reset player unit moves
-                for unit in self.game_state.units:
-                    if unit.team == 'player':
-                        unit.reset_moves()
-
-                # Award tech points for surviving (1 per turn)
-                self.game_state.tech_points += 1
-
-                # Handle cure manufacturing progress
-                if self.game_state.cure_manufacturing_city:
-                    self.game_state.cure_manufacturing_turns_remaining -= 1
-                    self.log_message(f"🧪 Cure manufacturing: {self.game_state.cure_manufacturing_turns_remaining} turns remaining!")
-                    if self.game_state.cure_manufacturing_turns_remaining <= 0:
-                        # Cure is complete!
-                        self.game_state.manufacture_cure()
-                        self.log_message(f"🎉 CURE COMPLETE! The city survived the onslaught!")
-
-                # Autosave at the start of player's turn
-                self.game_state.autosave(self.renderer.camera_x, self.renderer.camera_y)
-                # Produce resources in all cities
-                for city in self.game_state.cities:
-                    production = city.produce_resources(self.game_state)
-                    if any(production.values()):
-                        prod_str = ', '.join([f"{k}: +{v}" for k, v in production.items() if v > 0])
-                        self.log_message(f"{city.name} produced: {prod_str}")
-                # Check for cure manufacturing completion
-                if self.game_state.game_won:
-                    self.cure_leaderboard = GameState.save_cure_victory(self.game_state.turn, self.game_state.difficulty)
-                    self.game_won = True
-                    self.victory_panel_open = True
-                    self.final_score = self.game_state.turn
-                    self.log_message(f"🎉 VICTORY! Cure manufactured on turn {self.game_state.turn}!")
-
-                # Check if cure manufacturing city was destroyed
-                if self.game_state.cure_manufacturing_city:
-                    if self.game_state.cure_manufacturing_city not in self.game_state.cities:
-                        self.log_message(f"💀 GAME OVER! The city manufacturing the cure was destroyed!")
-                        self.game_over = True
-                        self.game_state.cure_manufacturing_city = None
-                        self.game_state.cure_manufacturing_turns_remaining = 0
-
-                # Apply automated defenses damage to adjacent zombies
-                defense_results = self.game_state.apply_automated_defenses()
-                if defense_results['damaged'] > 0 or defense_results['killed'] > 0:
-                    killed = defense_results['killed']
-                    damaged = defense_results['damaged'] - killed  # Subtract killed from total damaged
-                    if killed > 0 and damaged > 0:
-                        self.log_message(f"⚡ Automated Defenses: {killed} zombie(s) destroyed, {damaged} damaged!")
-                    elif killed > 0:
-                        self.log_message(f"⚡ Automated Defenses: {killed} zombie(s) destroyed!")
-                    elif damaged > 0:
-                        self.log_message(f"⚡ Automated Defenses: {damaged} zombie(s) damaged!")
-                # Spawn new zombies
-                self.game_state.spawn_zombies()
-                # Update fog of war
-                self.game_state.update_visibility()
+            if self.ai_turn is not None:
+                self.advance_ai_turn(self.ai_frame_budget)
+            else:
+                now = pygame.time.get_ticks()
+                if (now - self.animation_start_time) / 1000.0 >= self.animation_duration and self.zombie_animator.finished(now / 1000.0):
+                    # Animation complete, end enemy turn
+                    self.complete_enemy_turn()
             return  # Skip normal updates during animation
 
         # Update hovered tile based on mouse position
@@ -1552,17 +1663,19 @@ class ZombieStrategyGame:
             self.auto_select_timer -= dt
             if self.auto_select_timer <= 0:
                 self.auto_select_timer = 0
-                # Find nearest available unit with moves (skip units with turn_skipped)
+                # Find nearest available unit with moves (skip units with turn_skipped),
+                # units that zombies can attack next turn first
                 next_unit = None
-                best_dist = float('inf')
+                best_key = None
                 ref_x = self.selected_unit.x if self.selected_unit else 0
                 ref_y = self.selected_unit.y if self.selected_unit else 0
+                threat = self.game_state.get_threat_map()
                 for unit in self.game_state.units:
-                    if unit.team == 'player' and unit.can_move() and not getattr(unit, 'turn_skipped', False):
+                    if unit.team == 'player' and unit.can_move() and not unit.turn_skipped:
                         if unit is not self.selected_unit:
-                            dist = abs(unit.x - ref_x) + abs(unit.y - ref_y)
-                            if dist < best_dist:
-                                best_dist = dist
+                            key = (threat.at(unit.x, unit.y) == 0, abs(unit.x - ref_x) + abs(unit.y - ref_y))
+                            if best_key is None or key < best_key:
+                                best_key = key
                                 next_unit = unit
 
                 if next_unit:
@@ -1582,6 +1695,26 @@ class ZombieStrategyGame:
             self.log_message(f"You survived {self.final_score} turns!")
             self.log_message(f"All units and cities have been destroyed.")
 
+    def request_profile_capture(self, whole_turn=False):
+        """Start a cProfile capture of the next enemy turn or the next N frames"""
+        if profile_capture.active:
+            self.log_message("⏱ A profile capture is already in progress")
+        elif whole_turn:
+            profile_capture.arm_turn()
+            self.log_message("⏱ Profiling the next enemy turn...")
+        else:
+            profile_capture.start_frames(self.profile_capture_frames)
+            self.log_message(f"⏱ Profiling the next {self.profile_capture_frames} frames...")
+
+    def finish_profile_capture(self):
+        """Stop the running cProfile capture and report where it was written"""
+        import os
+        turn = self.game_state.turn if self.game_state else 0
+        map_size = len(self.game_state.map_grid) if self.game_state else 0
+        path = profile_capture.stop(turn, map_size)
+        if path:
+            self.log_message(f"⏱ Profile saved: saves/profiles/{os.path.basename(path)} (+ .collapsed)")
+
     def refresh_save_list(self):
         """Get list of available save files"""
         import os
@@ -1610,14 +1743,7 @@ class ZombieStrategyGame:
 
     def log_message(self, message):
         """Add a message to the console log"""
-        import datetime
-        timestamp = datetime.datetime.now().strftime("%H:%M:%S")
-        self.message_log.append(f"[{timestamp}] {message}")
-        # Keep only last 50 messages
-        if len(self.message_log) > 50:
-            self.message_log.pop(0)
-        # Also print to console
-        print(message)
+        self.message_log.add(message)
 
     def get_difficulty_button_clicked(self, mouse_x, mouse_y):
         """Check if a difficulty button was clicked and return the difficulty level"""
@@ -1673,8 +1799,24 @@ class ZombieStrategyGame:
         box_y = 10
         return box_x <= mouse_x <= box_x + box_width and box_y <= mouse_y <= box_y + box_height
 
+    def render_ai_progress(self):
+        """Progress bar for the zombie turn (top centre)"""
+        bar_width = 300
+        bar_height = 22
+        bar_x = (self.screen_width - bar_width) // 2
+        bar_y = 70
+        fraction = self.ai_turn_done / self.ai_turn_total if self.ai_turn_total else 1.0
+        pygame.draw.rect(self.screen, (40, 20, 20), (bar_x, bar_y, bar_width, bar_height))
+        pygame.draw.rect(self.screen, (200, 50, 50), (bar_x, bar_y, int(bar_width * fraction), bar_height))
+        pygame.draw.rect(self.screen, (255, 255, 255), (bar_x, bar_y, bar_width, bar_height), 2)
+        font = pygame.font.Font(None, 22)
+        text = font.render(f"Zombies moving... {self.ai_turn_done}/{self.ai_turn_total}", True, (255, 255, 255))
+        self.screen.blit(text, text.get_rect(center=(self.screen_width // 2, bar_y + bar_height // 2)))
+
     def render(self):
         """Render the game"""
+        frame_profiler.begin_frame()
+
         # Show difficulty dialog if game not started
         if self.difficulty_dialog_open:
             self.render_difficulty_dialog()
@@ -1687,6 +1829,10 @@ class ZombieStrategyGame:
         # Normal game rendering
         self.renderer.render(self.screen, self.game_state, self.selected_unit, self.selected_city, self.selected_tile, self.hovered_tile, self.building_placement_mode, self.debug_reveal_map, self)
 
+        # Progress of the zombie turn while it is still being worked out
+        if self.ai_turn is not None:
+            self.render_ai_progress()
+
         # Render victory banner if panel is closed
         if self.game_won and not self.victory_panel_open:
             banner_height = 60
@@ -1705,39 +1851,53 @@ class ZombieStrategyGame:
             self.screen.blit(hint_text, hint_rect)
 
         # Render message box (always visible in top right)
-        self.render_message_box()
+        with frame_profiler.section('message_box'):
+            self.render_message_box()
 
         # Render message log if open
         if self.message_log_open:
-            self.render_message_log()
+            with frame_profiler.section('message_log'):
+                self.render_message_log()
 
         # Render save/load menu on top
         if self.save_menu_open:
-            self.render_save_menu()
+            with frame_profiler.section('save_menu'):
+                self.render_save_menu()
         elif self.load_menu_open:
-            self.render_load_menu()
+            with frame_profiler.section('load_menu'):
+                self.render_load_menu()
         elif self.exit_confirmation_open:
-            self.render_exit_confirmation()
+            with frame_profiler.section('exit_confirm'):
+                self.render_exit_confirmation()
         elif self.game_won and self.victory_panel_open:
-            self.render_victory()
+            with frame_profiler.section('victory'):
+                self.render_victory()
         elif self.game_over:
-            self.render_game_over()
+            with frame_profiler.section('game_over'):
+                self.render_game_over()
 
         # Render notification dialog on top of everything
         if self.notification_dialog_open:
-            self.render_notification_dialog()
+            with frame_profiler.section('notification'):
+                self.render_notification_dialog()
 
         # Render tech tree on top of everything
         if self.tech_tree_open:
-            self.render_tech_tree()
+            with frame_profiler.section('tech_tree'):
+                self.render_tech_tree()
 
         # Render help panel on top of everything
         if self.help_panel_open:
-            self.render_help_panel()
+            with frame_profiler.section('help_panel'):
+                self.render_help_panel()
 
         # Render helicopter menu on top of everything
         if self.helicopter_menu_open:
-            self.render_helicopter_menu()
+            with frame_profiler.section('helicopter'):
+                self.render_helicopter_menu()
+
+        # Render frame profiler overlay (F3) above all panels
+        frame_profiler.draw_overlay(self.screen)
 
         pygame.display.flip()
 
@@ -2112,6 +2272,7 @@ class ZombieStrategyGame:
                 ("Right Click", "Move unit / Attack / Heal"),
                 ("Space", "Skip unit's turn"),
                 ("E", "End turn"),
+                ("Z", "Show zombie threat for next turn"),
             ]),
             ("CITY MANAGEMENT (City Selected)", [
                 ("1/2/3", "Build Farm/Workshop/Hospital"),
@@ -2248,7 +2409,7 @@ class ZombieStrategyGame:
 
     def render_tech_tree(self):
         """Render the tech tree interface"""
-        from tech_tree import TECH_TREE, can_research, get_tech_cost
+        from tech_tree import TECH_TREE, TECH_BITS, get_tech_cost
 
         # Semi-transparent overlay
         overlay = pygame.Surface((self.screen_width, self.screen_height))
@@ -2333,15 +2494,18 @@ class ZombieStrategyGame:
                     pygame.draw.line(self.screen, (80, 80, 100), (start_x, start_y), (end_x, end_y), 2)
 
         # Draw tech boxes
+        researched = self.game_state.researched_techs
+        researched_mask = researched.mask
+        prereqs_met_mask = researched_mask | researched.researchable  # Researchable is kept up to date on research
         for tech_id, pos in tech_positions.items():
             tech = TECH_TREE[tech_id]
             box_width = 200
             box_height = 70
 
-            # Determine tech state
-            is_researched = tech_id in self.game_state.researched_techs
-            can_afford = can_research(tech_id, self.game_state.researched_techs)
-            tech_cost = get_tech_cost(tech_id, self.game_state.researched_techs)
+            # Determine tech state (bitmask checks against the researched techs)
+            is_researched = bool(researched_mask & TECH_BITS[tech_id])
+            can_afford = bool(prereqs_met_mask & TECH_BITS[tech_id])
+            tech_cost = get_tech_cost(tech_id, researched)
             has_points = self.game_state.tech_points >= tech_cost
 
             # Check if mouse is hovering
@@ -2653,79 +2817,119 @@ class ZombieStrategyGame:
         pygame.draw.rect(self.screen, (30, 30, 40), (box_x, box_y, box_width, box_height))
         pygame.draw.rect(self.screen, (100, 100, 120), (box_x, box_y, box_width, box_height), 2)
 
-        # Get most recent message
-        if self.message_log:
-            recent_message = self.message_log[-1]
-            # Strip timestamp for display in box
-            if ']' in recent_message:
-                display_message = recent_message.split(']', 1)[1].strip()
-            else:
-                display_message = recent_message
-
-            # Truncate if too long
-            msg_font = pygame.font.Font(None, 18)
-            if len(display_message) > 70:
-                display_message = display_message[:67] + "..."
-
-            msg_surface = msg_font.render(display_message, True, (220, 220, 220))
-            self.screen.blit(msg_surface, (box_x + 5, box_y + 8))
+        # Most recent message (timestamp stripped and truncated when it was logged)
+        latest = self.message_log.latest()
+        if latest:
+            self.screen.blit(latest.box_surface, (box_x + 5, box_y + 8))
 
         # Hint text
-        hint_font = pygame.font.Font(None, 14)
-        hint_text = hint_font.render("(click for log)", True, (150, 150, 150))
-        hint_rect = hint_text.get_rect(right=box_x + box_width - 5, centery=box_y + box_height // 2)
-        self.screen.blit(hint_text, hint_rect)
+        if self.message_box_hint is None:
+            hint_font = pygame.font.Font(None, 14)
+            self.message_box_hint = hint_font.render("(click for log)", True, (150, 150, 150))
+        hint_rect = self.message_box_hint.get_rect(right=box_x + box_width - 5, centery=box_y + box_height // 2)
+        self.screen.blit(self.message_box_hint, hint_rect)
 
     def render_message_log(self):
         """Render the message log dialog"""
-        # Semi-transparent overlay
-        overlay = pygame.Surface((self.screen_width, self.screen_height))
-        overlay.set_alpha(180)
-        overlay.fill((0, 0, 0))
-        self.screen.blit(overlay, (0, 0))
-
-        # Log panel
         log_width = 700
         log_height = 500
         log_x = self.screen_width // 2 - log_width // 2
         log_y = self.screen_height // 2 - log_height // 2
 
-        pygame.draw.rect(self.screen, (30, 30, 40), (log_x, log_y, log_width, log_height))
-        pygame.draw.rect(self.screen, (100, 150, 200), (log_x, log_y, log_width, log_height), 3)
+        # The overlay and the panel (frame, title, instructions) only change with the window size
+        size = (self.screen_width, self.screen_height)
+        if self.message_log_panel is None or self.message_log_panel[0] != size:
+            # Semi-transparent overlay
+            overlay = pygame.Surface(size)
+            overlay.set_alpha(180)
+            overlay.fill((0, 0, 0))
 
-        # Title
-        title_font = pygame.font.Font(None, 32)
-        title = title_font.render("Message Log", True, (200, 220, 255))
-        title_rect = title.get_rect(center=(self.screen_width // 2, log_y + 30))
-        self.screen.blit(title, title_rect)
+            # Log panel
+            panel = pygame.Surface((log_width, log_height))
+            panel.fill((30, 30, 40))
+            pygame.draw.rect(panel, (100, 150, 200), (0, 0, log_width, log_height), 3)
 
-        # Display last 20 messages (newest at bottom)
-        msg_font = pygame.font.Font(None, 18)
-        start_y = log_y + 70
-        max_messages = 20
-        messages_to_show = self.message_log[-max_messages:] if len(self.message_log) > max_messages else self.message_log
+            # Title
+            title_font = pygame.font.Font(None, 32)
+            title = title_font.render("Message Log", True, (200, 220, 255))
+            panel.blit(title, title.get_rect(center=(log_width // 2, 30)))
 
-        for i, message in enumerate(messages_to_show):
-            msg_surface = msg_font.render(message, True, (220, 220, 220))
-            self.screen.blit(msg_surface, (log_x + 15, start_y + i * 20))
+            # Instructions
+            help_font = pygame.font.Font(None, 20)
+            help_text = help_font.render("Click message box or press ESC to close", True, (150, 150, 150))
+            panel.blit(help_text, help_text.get_rect(center=(log_width // 2, log_height - 25)))
 
-        # Instructions
-        help_font = pygame.font.Font(None, 20)
-        help_text = help_font.render("Click message box or press ESC to close", True, (150, 150, 150))
-        help_rect = help_text.get_rect(center=(self.screen_width // 2, log_y + log_height - 25))
-        self.screen.blit(help_text, help_rect)
+            self.message_log_panel = (size, overlay, panel)
+
+        _, overlay, panel = self.message_log_panel
+        self.screen.blit(overlay, (0, 0))
+        self.screen.blit(panel, (log_x, log_y))
+
+        # Display last 20 messages (newest at bottom), rendered when they were logged
+        start_y = log_y + 70
+        for i, line in enumerate(self.message_log.recent(20)):
+            self.screen.blit(line.surface, (log_x + 15, start_y + i * 20))
+
+    def poll_rules(self):
+        """Reload rules.json if it changed (checked about once a second)"""
+        now = pygame.time.get_ticks()
+        if now < self.next_rules_check:
+            return
+        self.next_rules_check = now + 1000
+        if rules.reload_if_changed():
+            # Cached production was compiled from the old yields
+            if self.game_state:
+                for city in self.game_state.cities:
+                    city.invalidate_production()
+                self.game_state.apply_difficulty_rules()
+                self.game_state.refresh_tech_modifiers()  # Tech production bonuses come from the rules
+            self.log_message("Rules reloaded from rules.json")
 
     def run(self):
         """Main game loop"""
         while self.running:
+            if self.hot_reload_rules:
+                self.poll_rules()
             self.handle_events()
             self.update()
             self.render()
+            if profile_capture.frame_done():
+                self.finish_profile_capture()
             self.clock.tick(60)
 
+        self.end_session()
         pygame.quit()
         sys.exit()
 
 if __name__ == "__main__":
+    import argparse
+    import os
+
+    parser = argparse.ArgumentParser(description="Zombie Apocalypse Strategy")
+    parser.add_argument('--profile-turns', metavar='FILE', nargs='?',
+                        const=os.path.join(os.path.dirname(__file__), '..', 'saves', 'profiles', 'turns.csv'),
+                        help="Record per-turn phase timings to FILE (.csv or .json, default saves/profiles/turns.csv)")
+    parser.add_argument('--cprofile-frames', metavar='N', type=int,
+                        help="cProfile the first N frames, and use N for the F5 hotkey")
+    parser.add_argument('--cprofile-turn', action='store_true',
+                        help="cProfile the first enemy turn")
+    parser.add_argument('--log-level', default='info', choices=['debug', 'info', 'warning', 'error'],
+                        help="Game event log level (debug includes every zombie attack)")
+    parser.add_argument('--hot-reload-rules', action='store_true',
+                        help="Reload src/rules.json whenever it changes (for tuning)")
+    args = parser.parse_args()
+
+    game_log.set_level(args.log_level)
+
+    if args.profile_turns:
+        turn_profiler.enable(args.profile_turns)
+        print(f"⏱ Turn profiling enabled, writing to {args.profile_turns}")
+
     game = ZombieStrategyGame()
+    game.hot_reload_rules = args.hot_reload_rules
+    if args.cprofile_frames:
+        game.profile_capture_frames = args.cprofile_frames
+        profile_capture.start_frames(args.cprofile_frames)
+    elif args.cprofile_turn:
+        profile_capture.arm_turn()
     game.run()
@@ -1,5 +1,5 @@
-import random
 import math
+from game_random import GameRandom, make_stream
 
 class TileType:
     GRASS = 0
@@ -15,8 +15,9 @@ class MapGenerator:
     def __init__(self, width, height, seed=None):
         self.width = width
         self.height = height
-        self.seed = seed if seed else random.randint(0, 999999)
-        random.seed(self.seed)
+        # Map generation draws only from its own stream, never the global random module
+        self.seed = seed if seed is not None else GameRandom().seed
+        self.rng = make_stream(self.seed, 'map')
 
     def _simple_noise(self, x, y):
         """Simple noise function using sine waves"""
@@ -71,10 +72,10 @@ class MapGenerator:
 
     def _generate_ruined_city(self, map_grid):
         """Generate a dense cluster of ruined buildings with city-like patterns"""
-        center_x = random.randint(8, self.width - 8)
-        center_y = random.randint(8, self.height - 8)
-        city_size = random.randint(25, 45)  # Increased from 8-15
-        city_radius = random.randint(6, 10)  # Tighter clustering
+        center_x = self.rng.randint(8, self.width - 8)
+        center_y = self.rng.randint(8, self.height - 8)
+        city_size = self.rng.randint(25, 45)  # Increased from 8-15
+        city_radius = self.rng.randint(6, 10)  # Tighter clustering
 
         # First pass: Create a grid-like road network within the city
         for i in range(-city_radius, city_radius + 1, 5):  # Roads every 5 tiles (reduced from 3)
@@ -95,19 +96,19 @@ class MapGenerator:
 
         # Second pass: Place buildings in a denser pattern
         for _ in range(city_size):
-            offset_x = random.randint(-city_radius, city_radius)
-            offset_y = random.randint(-city_radius, city_radius)
+            offset_x = self.rng.randint(-city_radius, city_radius)
+            offset_y = self.rng.randint(-city_radius, city_radius)
             x = max(0, min(self.width - 1, center_x + offset_x))
             y = max(0, min(self.height - 1, center_y + offset_y))
 
             # Don't place buildings on water or roads (unless it's a corner)
             if map_grid[y][x] == TileType.WATER:
                 continue
-            if map_grid[y][x] == TileType.ROAD and random.random() < 0.7:
+            if map_grid[y][x] == TileType.ROAD and self.rng.random() < 0.7:
                 continue
 
             # 60% ruined, 40% intact buildings (more intact for better resources)
-            if random.random() < 0.6:
+            if self.rng.random() < 0.6:
                 map_grid[y][x] = TileType.BUILDING_RUINED
             else:
                 map_grid[y][x] = TileType.BUILDING_INTACT
@@ -131,7 +132,7 @@ class MapGenerator:
                         if near_building:
                             break
 
-                    if near_building and random.random() < 0.4:
+                    if near_building and self.rng.random() < 0.4:
                         map_grid[y][x] = TileType.RUBBLE
 
     def _generate_roads(self, map_grid):
@@ -144,19 +145,19 @@ class MapGenerator:
 
         min_roads = max(3, int(3 * scale_factor))
         max_roads = max(5, int(5 * scale_factor))
-        num_roads = random.randint(min_roads, max_roads)
+        num_roads = self.rng.randint(min_roads, max_roads)
 
         # Simple horizontal and vertical roads
         for _ in range(num_roads):
-            if random.random() < 0.5:
+            if self.rng.random() < 0.5:
                 # Horizontal road
-                y = random.randint(0, self.height - 1)
+                y = self.rng.randint(0, self.height - 1)
                 for x in range(self.width):
                     if map_grid[y][x] not in [TileType.BUILDING_RUINED, TileType.BUILDING_INTACT, TileType.WATER]:
                         map_grid[y][x] = TileType.ROAD
             else:
                 # Vertical road
-                x = random.randint(0, self.width - 1)
+                x = self.rng.randint(0, self.width - 1)
                 for y in range(self.height):
                     if map_grid[y][x] not in [TileType.BUILDING_RUINED, TileType.BUILDING_INTACT, TileType.WATER]:
                         map_grid[y][x] = TileType.ROAD
@@ -166,8 +167,8 @@ class MapGenerator:
         # Find a suitable location (not water, not on the edge)
         attempts = 0
         while attempts < 100:
-            x = random.randint(10, self.width - 10)
-            y = random.randint(10, self.height - 10)
+            x = self.rng.randint(10, self.width - 10)
+            y = self.rng.randint(10, self.height - 10)
 
             # Make sure it's on grass or road
             if map_grid[y][x] in [TileType.GRASS, TileType.ROAD]:
@@ -192,17 +193,17 @@ class MapGenerator:
                 # Buildings have higher chance of resources
                 # Medicine is not found on the map - must be produced by hospitals
                 if tile == TileType.BUILDING_RUINED:
-                    if random.random() < 0.6:
+                    if self.rng.random() < 0.6:
                         resources[(x, y)] = {
-                            'food': random.randint(8, 20),
-                            'materials': random.randint(15, 35),
+                            'food': self.rng.randint(8, 20),
+                            'materials': self.rng.randint(15, 35),
                             'medicine': 0
                         }
                 elif tile == TileType.BUILDING_INTACT:
-                    if random.random() < 0.8:
+                    if self.rng.random() < 0.8:
                         resources[(x, y)] = {
-                            'food': random.randint(15, 40),
-                            'materials': random.randint(20, 45),
+                            'food': self.rng.randint(15, 40),
+                            'materials': self.rng.randint(20, 45),
                             'medicine': 0
                         }
 
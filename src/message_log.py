@@ -0,0 +1,109 @@
+"""In-game message log: bounded history with pre-rendered text and a session log file"""
+import datetime
+import itertools
+import os
+import queue
+import threading
+from collections import deque
+
+import pygame
+
+
+class LogLine:
+    """One log message plus the surfaces it is drawn with, rendered once when added"""
+    __slots__ = ('text', 'message', 'surface', 'box_surface')
+
+    def __init__(self, text, message, surface, box_surface):
+        self.text = text              # "[HH:MM:SS] message", as shown in the log panel
+        self.message = message        # Message without the timestamp
+        self.surface = surface        # Rendered line for the message log panel
+        self.box_surface = box_surface  # Rendered (truncated) line for the top-right message box
+
+
+class SessionLogWriter:
+    """Appends log lines to a file on a background thread.
+
+    log_message() only enqueues the line; the writer thread does the file I/O and
+    flushes whenever it catches up, so a burst of messages costs one flush.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.queue = queue.Queue()
+        self.thread = threading.Thread(target=self._run, name='session-log-writer', daemon=True)
+        self.thread.start()
+
+    def write(self, line):
+        self.queue.put(line)
+
+    def _run(self):
+        with open(self.path, 'a', encoding='utf-8', buffering=64 * 1024) as f:
+            while True:
+                line = self.queue.get()
+                if line is None:
+                    break
+                f.write(line + '\n')
+                if self.queue.empty():
+                    f.flush()
+
+    def close(self):
+        """Write out everything queued so far and stop the thread"""
+        self.queue.put(None)
+        self.thread.join()
+
+
+def default_session_log_path():
+    """New timestamped log path in saves/logs/"""
+    timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+    return os.path.join(os.path.dirname(__file__), '..', 'saves', 'logs', f"session_{timestamp}.log")
+
+
+class MessageLog:
+    """The last `capacity` messages, each with its text surfaces already rendered"""
+
+    LINE_COLOR = (220, 220, 220)
+    BOX_MAX_CHARS = 70  # Longer messages are truncated in the message box
+
+    def __init__(self, capacity=50):
+        self.lines = deque(maxlen=capacity)
+        self.font = pygame.font.Font(None, 18)
+        self.writer = None
+
+    def add(self, message):
+        """Timestamp a message, render it and append it (dropping the oldest if full)"""
+        timestamp = datetime.datetime.now().strftime("%H:%M:%S")
+        text = f"[{timestamp}] {message}"
+
+        box_message = message if len(message) <= self.BOX_MAX_CHARS else message[:self.BOX_MAX_CHARS - 3] + "..."
+        line = LogLine(text, message,
+                       self.font.render(text, True, self.LINE_COLOR),
+                       self.font.render(box_message, True, self.LINE_COLOR))
+        self.lines.append(line)
+
+        if self.writer:
+            self.writer.write(text)
+
+    def recent(self, count):
+        """The last `count` lines, oldest first"""
+        return list(itertools.islice(self.lines, max(0, len(self.lines) - count), None))
+
+    def latest(self):
+        return self.lines[-1] if self.lines else None
+
+    def start_file(self, path=None):
+        """Stream this session's messages to a file (starting with the ones already logged)"""
+        self.close_file()
+        self.writer = SessionLogWriter(path or default_session_log_path())
+        for line in self.lines:
+            self.writer.write(line.text)
+
+    def close_file(self):
+        if self.writer:
+            self.writer.close()
+            self.writer = None
+
+    def __len__(self):
+        return len(self.lines)
@@ -0,0 +1,237 @@
+"""A* pathfinding for click-to-move.
+
+Moving onto a tile costs what Unit.move charges for it: 0.5 on roads, 1
+elsewhere; water can't be entered. Units move 8 ways, like the single step
+they took before, and tiles with a unit on them are blocked (except the goal,
+so a right-click on a zombie walks up to it and attacks):
+
+    costs = MovementCosts(map_grid)
+    path = find_path(costs, occupancy, (x, y), goal)   # [(x1, y1), ..., goal] or None
+
+PathCache keeps computed paths keyed by (start, goal) and remembers which tiles
+each one crosses. It hooks into the OccupancyGrid, so a path is dropped only when
+a unit steps onto one of its tiles - a unit walking a standing goto order reuses
+its path turn after turn. The map's terrain never changes after generation, so
+the cost grid is built once and never invalidates anything.
+
+ReachableArea is the bounded Dijkstra behind the selected unit's move overlay:
+every tile the unit can walk to with its remaining moves, kept until the unit
+moves, spends moves or a unit appears or leaves within its range.
+"""
+import heapq
+import math
+
+# 8-way neighbour offsets, in a fixed order so ties always resolve the same way
+NEIGHBOR_OFFSETS = ((0, -1), (1, 0), (0, 1), (-1, 0), (1, -1), (1, 1), (-1, 1), (-1, -1))
+
+# Cheapest tile to enter (roads); keeps the heuristic admissible
+MIN_STEP_COST = 0.5
+
+
+def terrain_cost(terrain):
+    """Movement points spent entering a tile of this terrain (None if it can't be entered)"""
+    from map_generator import TileType
+
+    if terrain == TileType.WATER:
+        return None
+    if terrain == TileType.ROAD:
+        return 0.5
+    return 1
+
+
+class MovementCosts:
+    """Per-tile movement cost grid, built once from the map"""
+
+    def __init__(self, map_grid):
+        self.width = len(map_grid[0])
+        self.height = len(map_grid)
+        self.costs = [terrain_cost(terrain) for row in map_grid for terrain in row]  # Tile index -> cost or None
+
+
+def find_path(costs, occupancy, start, goal):
+    """Cheapest 8-way path from start to goal as a list of tiles (start excluded), or None"""
+    width = costs.width
+    height = costs.height
+    goal_x, goal_y = goal
+    if not (0 <= goal_x < width and 0 <= goal_y < height) or start == goal:
+        return None
+    start_index = start[1] * width + start[0]
+    goal_index = goal_y * width + goal_x
+    tile_costs = costs.costs
+    if tile_costs[goal_index] is None:
+        return None
+    occupied = occupancy.occupied
+
+    best = {start_index: 0}
+    came_from = {}
+    # (estimated total, cost so far, tie-break counter, tile index)
+    counter = 0
+    open_heap = [(0, 0, counter, start_index)]
+    while open_heap:
+        _, cost, _, index = heapq.heappop(open_heap)
+        if index == goal_index:
+            path = []
+            while index != start_index:
+                path.append((index % width, index // width))
+                index = came_from[index]
+            path.reverse()
+            return path
+        if cost > best[index]:
+            continue  # Stale heap entry
+        x = index % width
+        y = index // width
+        for dx, dy in NEIGHBOR_OFFSETS:
+            nx = x + dx
+            ny = y + dy
+            if not (0 <= nx < width and 0 <= ny < height):
+                continue
+            neighbor = ny * width + nx
+            step_cost = tile_costs[neighbor]
+            if step_cost is None or (occupied[neighbor] and neighbor != goal_index):
+                continue
+            new_cost = cost + step_cost
+            if new_cost < best.get(neighbor, float('inf')):
+                best[neighbor] = new_cost
+                came_from[neighbor] = index
+                # Chebyshev distance times the cheapest step never overestimates
+                estimate = new_cost + max(abs(goal_x - nx), abs(goal_y - ny)) * MIN_STEP_COST
+                counter += 1
+                heapq.heappush(open_heap, (estimate, new_cost, counter, neighbor))
+    return None
+
+
+class PathCache:
+    """Computed paths, dropped only when a unit steps onto one of their tiles"""
+
+    MAX_PATHS = 256  # Forget everything past this many (abandoned orders leave paths behind)
+
+    def __init__(self, costs, occupancy):
+        self.costs = costs
+        self.occupancy = occupancy
+        self.paths = {}        # (start, goal) -> list of tiles
+        self.tile_paths = {}   # Tile index -> set of (start, goal) keys whose path crosses it
+        self.attach()
+
+    def attach(self):
+        """Hook into the occupancy grid so it reports tiles units step onto"""
+        self.occupancy.watched_tiles = self.tile_paths
+        self.occupancy.on_tile_entered = self.tile_changed
+
+    def get(self, start, goal):
+        """Cached path from start to goal, computing and caching it on a miss (None if unreachable)"""
+        key = (start, goal)
+        path = self.paths.get(key)
+        if path is None:
+            path = find_path(self.costs, self.occupancy, start, goal)
+            if path:
+                self.put(start, goal, path)
+        return path
+
+    def put(self, start, goal, path):
+        if len(self.paths) >= self.MAX_PATHS:
+            self.clear()
+        key = (start, goal)
+        self.paths[key] = path
+        width = self.costs.width
+        # The goal may have a unit on it (an attack target), so only the tiles before it are watched
+        for x, y in path[:-1]:
+            self.tile_paths.setdefault(y * width + x, set()).add(key)
+
+    def advance(self, start, goal):
+        """Cache the rest of a path under its first tile, before the unit steps onto it
+        (entering that tile drops the old entry)"""
+        path = self.paths.get((start, goal))
+        if path and len(path) > 1:
+            self.put(path[0], goal, path[1:])
+
+    def tile_changed(self, index):
+        """Drop every cached path crossing tile `index`"""
+        keys = self.tile_paths.pop(index, None)
+        if not keys:
+            return
+        width = self.costs.width
+        for key in keys:
+            path = self.paths.pop(key, None)
+            if path is None:
+                continue
+            for x, y in path:
+                tile = y * width + x
+                if tile != index and tile in self.tile_paths:
+                    self.tile_paths[tile].discard(key)
+                    if not self.tile_paths[tile]:
+                        del self.tile_paths[tile]
+
+    def clear(self):
+        self.paths.clear()
+        self.tile_paths.clear()
+
+
+def reachable_tiles(costs, occupancy, start, moves):
+    """Tiles a unit at `start` can walk to with `moves` points, as {(x, y): points spent}.
+
+    Bounded Dijkstra over the same costs and blocking as find_path. A step may be taken
+    while the unit has any points left, like Unit.move (the last step can overdraw).
+    """
+    width = costs.width
+    height = costs.height
+    tile_costs = costs.costs
+    occupied = occupancy.occupied
+    start_index = start[1] * width + start[0]
+    best = {start_index: 0}
+    open_heap = [(0, start_index)]
+    while open_heap:
+        spent, index = heapq.heappop(open_heap)
+        if spent > best[index] or spent >= moves:
+            continue  # Stale entry, or no points left to step further
+        x = index % width
+        y = index // width
+        for dx, dy in NEIGHBOR_OFFSETS:
+            nx = x + dx
+            ny = y + dy
+            if not (0 <= nx < width and 0 <= ny < height):
+                continue
+            neighbor = ny * width + nx
+            step_cost = tile_costs[neighbor]
+            if step_cost is None or occupied[neighbor]:
+                continue
+            new_spent = spent + step_cost
+            if new_spent < best.get(neighbor, float('inf')):
+                best[neighbor] = new_spent
+                heapq.heappush(open_heap, (new_spent, neighbor))
+    del best[start_index]
+    return {(index % width, index // width): spent for index, spent in best.items()}
+
+
+class ReachableArea:
+    """Reachable tiles of one unit, valid until it moves or its neighbourhood changes"""
+    __slots__ = ('x', 'y', 'moves', 'tiles', 'box', 'snapshot', 'version')
+
+    def __init__(self, costs, occupancy, x, y, moves):
+        self.x = x
+        self.y = y
+        self.moves = moves
+        self.tiles = reachable_tiles(costs, occupancy, (x, y), moves)
+
+        # Nothing outside this box can change the result: every step costs at least MIN_STEP_COST
+        radius = math.ceil(moves / MIN_STEP_COST)
+        self.box = (max(x - radius, 0), max(y - radius, 0),
+                    min(x + radius + 1, costs.width), min(y + radius + 1, costs.height))
+        self.snapshot = self._occupied_in_box(occupancy)
+        self.version = occupancy.version
+
+    def _occupied_in_box(self, occupancy):
+        left, top, right, bottom = self.box
+        width = occupancy.width
+        occupied = occupancy.occupied
+        return b''.join(occupied[row * width + left:row * width + right] for row in range(top, bottom))
+
+    def is_current(self, occupancy, x, y, moves):
+        """True if the unit is still at (x, y) with `moves` points and nothing nearby moved"""
+        if x != self.x or y != self.y or moves != self.moves:
+            return False
+        if occupancy.version != self.version:
+            # Something moved somewhere; only a change inside the box matters
+            if self._occupied_in_box(occupancy) != self.snapshot:
+                return False
+            self.version = occupancy.version
+        return True
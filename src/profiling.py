@@ -0,0 +1,479 @@
+"""Lightweight timing instrumentation for turn processing and frame rendering"""
+import csv
+import io
+import json
+import os
+import time
+from collections import deque
+
+
+class _NullPhase:
+    """Shared do-nothing context manager returned while profiling is disabled"""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_PHASE = _NullPhase()
+
+
+class _Phase:
+    """Times one phase and adds the elapsed milliseconds to the current turn record"""
+    __slots__ = ('record', 'name', 'start')
+
+    def __init__(self, record, name):
+        self.record = record
+        self.name = name
+        self.start = 0.0
+
+    def __enter__(self):
+        self.record['depth'] += 1
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        elapsed = (time.perf_counter() - self.start) * 1000.0
+        record = self.record
+        phases = record['phases']
+        phases[self.name] = phases.get(self.name, 0.0) + elapsed
+        record['depth'] -= 1
+        # Only outermost phases count toward the total so nested phases aren't double counted
+        if record['depth'] == 0:
+            record['total_ms'] += elapsed
+        return False
+
+
+def _csv_columns(records):
+    """Phase and counter names seen in any of the records, in first-seen order"""
+    phase_names = []
+    counter_names = []
+    for record in records:
+        for name in record['phases']:
+            if name not in phase_names:
+                phase_names.append(name)
+        for name in record['counters']:
+            if name not in counter_names:
+                counter_names.append(name)
+    return phase_names, counter_names
+
+
+def _csv_header(phase_names, counter_names):
+    return ['turn', 'map_size', 'total_ms', 'wall_ms'] + [f"{name}_ms" for name in phase_names] + counter_names
+
+
+def _csv_row(record, phase_names, counter_names):
+    return ([record['turn'], record['map_size'], f"{record['total_ms']:.3f}", f"{record['wall_ms']:.3f}"] +
+            [f"{record['phases'].get(name, 0.0):.3f}" for name in phase_names] +
+            [record['counters'].get(name, 0) for name in counter_names])
+
+
+def _csv_line(values):
+    buffer = io.StringIO()
+    csv.writer(buffer, lineterminator='').writerow(values)
+    return buffer.getvalue()
+
+
+class TurnProfiler:
+    """Collects per-turn phase timings and counters, exported to CSV or JSON.
+
+    While disabled, phase() returns a shared no-op context manager and count()
+    returns immediately, so the hooks left in the turn code cost one attribute
+    check each.
+
+    A CSV output gets one row appended per turn by a background writer thread.
+    The columns are fixed by the turns seen so far; a turn with a new phase or
+    counter rewrites the file once with the wider header. A JSON output is
+    written by close(), at the end of each session.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.output_path = None
+        self.records = []  # Finished turn records, oldest first
+        self.current = None  # Record for the turn being processed
+        self.writer = None  # SessionLogWriter appending CSV rows, once the header is written
+        self.columns = None  # (phase names, counter names) of the CSV header
+
+    def enable(self, output_path=None):
+        """Start collecting; records go to output_path (.csv rows each turn, .json on close())"""
+        self.enabled = True
+        self.output_path = output_path
+
+    def disable(self):
+        """Finish writing, stop collecting and drop any half-finished turn"""
+        self.close()
+        self.enabled = False
+        self.current = None
+
+    def begin_turn(self, turn, map_size=None):
+        """Open a record for this turn (no-op if one is already open)"""
+        if not self.enabled or self.current is not None:
+            return
+        self.current = {
+            'turn': turn,
+            'map_size': map_size,
+            'started': time.perf_counter(),
+            'total_ms': 0.0,  # Sum of outermost phases (excludes animation/idle time)
+            'depth': 0,
+            'phases': {},
+            'counters': {}
+        }
+
+    def phase(self, name):
+        """Context manager timing a named phase of the current turn"""
+        if self.current is None:
+            return _NULL_PHASE
+        return _Phase(self.current, name)
+
+    def count(self, name, amount=1):
+        """Add to a named counter on the current turn"""
+        if self.current is None:
+            return
+        counters = self.current['counters']
+        counters[name] = counters.get(name, 0) + amount
+
+    def end_turn(self, **totals):
+        """Close the current record, attach totals (e.g. unit counts) and export"""
+        if self.current is None:
+            return
+        record = self.current
+        self.current = None
+        del record['depth']
+        record['wall_ms'] = (time.perf_counter() - record.pop('started')) * 1000.0
+        record['counters'].update(totals)
+        self.records.append(record)
+        if self.output_path and not self.output_path.endswith('.json'):
+            self._append_csv(record)
+
+    def _append_csv(self, record):
+        """Queue the record's row, rewriting the whole file first if it needs new columns"""
+        phase_names, counter_names = self.columns or ([], [])
+        if (self.writer is None or any(name not in phase_names for name in record['phases']) or
+                any(name not in counter_names for name in record['counters'])):
+            self.close()
+            self.export(self.output_path)
+            self.columns = _csv_columns(self.records)
+            from message_log import SessionLogWriter
+            self.writer = SessionLogWriter(self.output_path)
+            return
+        self.writer.write(_csv_line(_csv_row(record, phase_names, counter_names)))
+
+    def close(self):
+        """Finish the CSV rows queued so far, or write the JSON output"""
+        if self.writer:
+            self.writer.close()
+            self.writer = None
+        elif self.output_path and self.output_path.endswith('.json') and self.records:
+            self.export(self.output_path)
+
+    def export(self, path):
+        """Write all records to path, as JSON if it ends in .json and CSV otherwise"""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        if path.endswith('.json'):
+            with open(path, 'w') as f:
+                json.dump(self.records, f, indent=2)
+            return
+
+        # CSV: one row per turn, one column per phase/counter seen in any turn
+        phase_names, counter_names = _csv_columns(self.records)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(_csv_line(_csv_header(phase_names, counter_names)) + '\n')
+            for record in self.records:
+                f.write(_csv_line(_csv_row(record, phase_names, counter_names)) + '\n')
+
+
+class _Section:
+    """Times one render section and adds the elapsed milliseconds to the current frame"""
+    __slots__ = ('profiler', 'name', 'start')
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.profiler.add(self.name, (time.perf_counter() - self.start) * 1000.0)
+        return False
+
+
+class FrameProfiler:
+    """Rolling per-frame timings for the F3 overlay.
+
+    Long straight-line render code uses lap(name), which closes the running
+    section and opens the next; short calls use the section(name) context
+    manager. Both return immediately while the overlay is off.
+    """
+
+    # Draw order for the overlay; sections not listed here are appended after
+    SECTION_ORDER = ['terrain', 'buildings', 'cities', 'units', 'ui', 'minimap', 'message_box']
+
+    def __init__(self, history=120):
+        self.enabled = False
+        self.frame_times = deque(maxlen=history)  # Full frame interval in ms (includes clock.tick wait)
+        self.render_times = deque(maxlen=history)  # Time spent inside timed sections in ms
+        self.section_history = {}  # Section name -> deque of per-frame ms
+        self.history = history
+        self.frame_start = None
+        self.sections = {}  # Section name -> ms accumulated this frame
+        self.lap_name = None
+        self.lap_start = 0.0
+        self.font = None
+
+    def toggle(self):
+        """Turn the overlay on/off, discarding stale history"""
+        self.enabled = not self.enabled
+        self.frame_times.clear()
+        self.render_times.clear()
+        self.section_history = {}
+        self.frame_start = None
+        self.sections = {}
+        self.lap_name = None
+
+    def begin_frame(self):
+        """Mark the start of a frame; the previous frame's numbers are committed here"""
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        if self.frame_start is not None:
+            self.frame_times.append((now - self.frame_start) * 1000.0)
+            self.render_times.append(sum(self.sections.values()))
+            for name, history in self.section_history.items():
+                history.append(self.sections.get(name, 0.0))
+            for name, elapsed in self.sections.items():
+                if name not in self.section_history:
+                    self.section_history[name] = deque([elapsed], maxlen=self.history)
+        self.frame_start = now
+        self.sections = {}
+
+    def add(self, name, elapsed_ms):
+        """Add time to a section of the current frame"""
+        self.sections[name] = self.sections.get(name, 0.0) + elapsed_ms
+
+    def section(self, name):
+        """Context manager timing a section of the current frame"""
+        if not self.enabled:
+            return _NULL_PHASE
+        return _Section(self, name)
+
+    def lap(self, name=None):
+        """Close the running lap section (if any) and start timing name (None just closes)"""
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        if self.lap_name is not None:
+            self.add(self.lap_name, (now - self.lap_start) * 1000.0)
+        self.lap_name = name
+        self.lap_start = now
+
+    def draw_overlay(self, screen):
+        """Draw the frame time, FPS, section breakdown and sparkline in the top-right corner"""
+        if not self.enabled or not self.frame_times:
+            return
+        import pygame
+
+        if self.font is None:
+            self.font = pygame.font.Font(None, 20)
+
+        frame_avg = sum(self.frame_times) / len(self.frame_times)
+        render_avg = sum(self.render_times) / len(self.render_times)
+        fps = 1000.0 / frame_avg if frame_avg > 0 else 0.0
+
+        names = [name for name in self.SECTION_ORDER if name in self.section_history]
+        names += sorted(name for name in self.section_history if name not in self.SECTION_ORDER)
+
+        panel_width = 320
+        line_height = 18
+        spark_height = 40
+        panel_height = 10 + line_height * (2 + len(names)) + spark_height + 16
+        panel_x = screen.get_width() - panel_width - 10
+        panel_y = 50  # Below the message box
+
+        panel = pygame.Surface((panel_width, panel_height), pygame.SRCALPHA)
+        panel.fill((0, 0, 0, 190))
+        screen.blit(panel, (panel_x, panel_y))
+        pygame.draw.rect(screen, (100, 255, 100), (panel_x, panel_y, panel_width, panel_height), 1)
+
+        y = panel_y + 6
+        text = self.font.render(f"Frame: {frame_avg:5.1f} ms  ({fps:4.0f} FPS)   max {max(self.frame_times):5.1f} ms",
+                                True, (100, 255, 100))
+        screen.blit(text, (panel_x + 8, y))
+        y += line_height
+        text = self.font.render(f"Render work: {render_avg:5.1f} ms", True, (200, 200, 200))
+        screen.blit(text, (panel_x + 8, y))
+        y += line_height
+
+        # Per-section averages with proportional bars
+        for name in names:
+            history = self.section_history[name]
+            avg = sum(history) / len(history)
+            text = self.font.render(name, True, (220, 220, 220))
+            screen.blit(text, (panel_x + 8, y))
+            text = self.font.render(f"{avg:6.2f} ms", True, (220, 220, 220))
+            screen.blit(text, text.get_rect(topright=(panel_x + 160, y)))
+            bar_width = int(140 * min(1.0, avg / max(render_avg, 0.001)))
+            pygame.draw.rect(screen, (80, 160, 255), (panel_x + 170, y + 3, bar_width, line_height - 8))
+            y += line_height
+
+        # Sparkline of frame times, scaled so the 60 FPS budget line sits mid-height
+        spark_x = panel_x + 8
+        spark_y = y + 6
+        spark_width = panel_width - 16
+        scale_max = max(33.4, max(self.frame_times))
+        pygame.draw.rect(screen, (40, 40, 40), (spark_x, spark_y, spark_width, spark_height))
+        budget_y = spark_y + spark_height - int(spark_height * 16.7 / scale_max)
+        pygame.draw.line(screen, (120, 120, 0), (spark_x, budget_y), (spark_x + spark_width, budget_y))
+        if len(self.frame_times) > 1:
+            step = spark_width / (self.frame_times.maxlen - 1)
+            points = [(spark_x + int(i * step), spark_y + spark_height - int(spark_height * min(t, scale_max) / scale_max))
+                      for i, t in enumerate(self.frame_times)]
+            pygame.draw.lines(screen, (100, 255, 100), False, points)
+
+
+class ProfileCapture:
+    """On-demand cProfile session covering the next N frames or the next enemy turn.
+
+    Each capture is written to saves/profiles/ as a .pstats file (for pstats,
+    snakeviz, etc.) and a .collapsed file with one "frame;frame;frame count"
+    line per stack, which flamegraph.pl and speedscope read directly.
+    """
+
+    def __init__(self):
+        self.profile = None
+        self.mode = None  # None, 'frames' or 'turn'
+        self.frames_remaining = 0
+        self.turn_armed = False  # Waiting for the next enemy turn to begin
+        self.output_dir = os.path.join(os.path.dirname(__file__), '..', 'saves', 'profiles')
+
+    @property
+    def active(self):
+        return self.profile is not None or self.turn_armed
+
+    def start_frames(self, frames):
+        """Start profiling immediately and stop after the given number of frames"""
+        if self.active:
+            return False
+        self._start()
+        self.mode = 'frames'
+        self.frames_remaining = frames
+        return True
+
+    def arm_turn(self):
+        """Profile the next enemy turn, from end-turn until the player's turn begins"""
+        if self.active:
+            return False
+        self.turn_armed = True
+        self.mode = 'turn'
+        return True
+
+    def enemy_turn_started(self):
+        """Called when the enemy turn begins; starts an armed turn capture"""
+        if self.turn_armed:
+            self.turn_armed = False
+            self._start()
+
+    def frame_done(self):
+        """Called once per frame; returns True when a frame capture has just run out"""
+        if self.mode != 'frames' or self.profile is None:
+            return False
+        self.frames_remaining -= 1
+        return self.frames_remaining <= 0
+
+    def turn_done(self):
+        """Returns True if a turn capture is running and should now be stopped"""
+        return self.mode == 'turn' and self.profile is not None
+
+    def _start(self):
+        import cProfile
+        self.profile = cProfile.Profile()
+        self.profile.enable()
+
+    def stop(self, turn, map_size):
+        """Stop the running capture and write it out; returns the .pstats path"""
+        import datetime
+        import pstats
+
+        if self.profile is None:
+            return None
+        self.profile.disable()
+        profile = self.profile
+        mode = self.mode
+        self.profile = None
+        self.mode = None
+
+        os.makedirs(self.output_dir, exist_ok=True)
+        timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+        base = os.path.join(self.output_dir, f"profile_turn{turn}_map{map_size}_{mode}_{timestamp}")
+        pstats_path = base + '.pstats'
+        profile.dump_stats(pstats_path)
+
+        with open(base + '.collapsed', 'w') as f:
+            for stack, microseconds in collapse_stacks(pstats.Stats(profile).stats):
+                f.write(f"{stack} {microseconds}\n")
+        return pstats_path
+
+
+def _frame_label(func):
+    """Readable flamegraph frame name for a pstats function key"""
+    filename, lineno, name = func
+    if filename == '~':
+        label = name  # Built-in function, e.g. <built-in method builtins.len>
+    else:
+        label = f"{os.path.basename(filename)}:{lineno}:{name}"
+    return label.replace(';', ':').replace(' ', '_')
+
+
+def collapse_stacks(stats, min_microseconds=1):
+    """Approximate collapsed stacks from a pstats caller graph.
+
+    cProfile only records caller->callee edges, not full stacks, so each
+    function's time is split across its callers in proportion to the time
+    recorded on each edge (the same approximation flameprof uses).
+    Yields (stack_string, self_time_microseconds).
+    """
+    children = {}
+    for func, (cc, nc, tt, ct, callers) in stats.items():
+        for caller, edge in callers.items():
+            edge_ct = edge[3] if isinstance(edge, tuple) else 0.0
+            children.setdefault(caller, []).append((func, edge_ct))
+
+    roots = [func for func, value in stats.items() if not value[4] or set(value[4]) == {func}]
+    totals = {}
+
+    def walk(func, path, labels, fraction):
+        cc, nc, tt, ct, callers = stats[func]
+        labels = labels + [_frame_label(func)]
+        self_time = int(tt * fraction * 1e6)
+        if self_time >= min_microseconds:
+            key = ';'.join(labels)
+            totals[key] = totals.get(key, 0) + self_time
+        for child, edge_ct in children.get(func, []):
+            if child in path:
+                continue  # Recursion: time is already counted higher up this stack
+            child_ct = stats[child][3]
+            if child_ct <= 0:
+                continue
+            child_fraction = fraction * edge_ct / child_ct
+            if child_fraction * child_ct * 1e6 < min_microseconds:
+                continue
+            walk(child, path | {child}, labels, child_fraction)
+
+    for root in roots:
+        walk(root, {root}, [], 1.0)
+    return sorted(totals.items())
+
+
+# Shared instances used by game_state.py, renderer.py and main.py
+turn_profiler = TurnProfiler()
+frame_profiler = FrameProfiler()
+profile_capture = ProfileCapture()
@@ -0,0 +1,294 @@
+"""Offscreen renderer benchmark.
+
+Draws synthetic late-game states to an offscreen surface using the SDL dummy
+video driver, so it runs without a display. The camera sweeps across the map
+while every render phase is timed, and p50/p95/p99 frame times are reported
+per phase, map size and fog setting.
+
+Usage:
+    cd src
+    python render_benchmark.py
+    python render_benchmark.py --sizes 60 100 --frames 200 --json results.json
+"""
+import os
+
+# Must be set before pygame initializes its video subsystem
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import argparse
+import json
+import math
+import random
+import time
+
+import pygame
+
+from map_generator import MapGenerator, TileType
+from game_state import GameState, Unit
+
+# Modal panels drawn by ZombieStrategyGame on top of the world view
+MODAL_PANELS = [
+    'render_message_box',
+    'render_message_log',
+    'render_tech_tree',
+    'render_help_panel',
+    'render_save_menu',
+    'render_load_menu',
+    'render_notification_dialog',
+    'render_helicopter_menu',
+    'render_exit_confirmation',
+    'render_game_over',
+    'render_victory',
+]
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, math.ceil(pct / 100.0 * len(sorted_values)) - 1))
+    return sorted_values[rank]
+
+
+def build_late_game_state(map_size, seed=1234):
+    """Build a synthetic late-game state: many cities, buildings and zombies"""
+    map_gen = MapGenerator(width=map_size, height=map_size, seed=seed)
+    map_grid = map_gen.generate()
+    game_state = GameState(map_grid, map_gen.resources, map_gen.research_lab_pos, 'medium', seed)
+    rng = random.Random(seed)
+
+    game_state.turn = 60
+    game_state.triangulation_level = 2
+    for tech_id in ('advanced_farming', 'industrial_workshops', 'basic_medicine'):
+        game_state.add_researched_tech(tech_id)
+
+    # Scatter cities on a coarse grid, each ringed with buildings and a wall
+    building_types = ['farm', 'workshop', 'hospital', 'research_center', 'farm', 'workshop', 'wall', 'wall']
+    spacing = 12
+    city_number = 1
+    for cy in range(6, map_size - 6, spacing):
+        for cx in range(6, map_size - 6, spacing):
+            x = cx + rng.randint(-2, 2)
+            y = cy + rng.randint(-2, 2)
+            if map_grid[y][x] == TileType.WATER:
+                continue
+            city = game_state.found_city(x, y, f"New Hope {city_number}")
+            if not city:
+                continue
+            city_number += 1
+            city.resources['food'] = rng.randint(50, 400)
+            city.resources['materials'] = rng.randint(50, 400)
+            city.resources['medicine'] = rng.randint(0, 100)
+            for building_type, (dx, dy) in zip(building_types, [(-1, -1), (0, -1), (1, -1), (-1, 0), (1, 0), (-1, 1), (0, 1), (1, 1)]):
+                bx, by = x + dx, y + dy
+                if map_grid[by][bx] == TileType.WATER:
+                    continue
+                health = 200 if building_type == 'wall' else 20
+                city.buildings.append(building_type)
+                city.building_locations[(bx, by)] = {
+                    'type': building_type,
+                    'terrain': map_grid[by][bx],
+                    'level': rng.randint(1, 3),
+                    'health': rng.randint(health // 2, health),
+                    'max_health': health
+                }
+
+    game_state.invalidate_defense_coverage()  # Buildings were placed directly
+
+    if game_state.cities:
+        game_state.cure_manufacturing_city = game_state.cities[len(game_state.cities) // 2]
+        game_state.cure_manufacturing_turns_remaining = 3
+
+    # Player army, spread around the cities
+    occupied = {(u.x, u.y) for u in game_state.units}
+    for i, city in enumerate(game_state.cities):
+        for unit_type in ['soldier', 'scout', 'medic']:
+            x = max(0, min(map_size - 1, city.x + rng.randint(-3, 3)))
+            y = max(0, min(map_size - 1, city.y + rng.randint(-3, 3)))
+            if (x, y) in occupied or map_grid[y][x] == TileType.WATER:
+                continue
+            unit = Unit(x, y, unit_type, 'player', game_state.difficulty, game_state)
+            unit.level = rng.randint(1, 4)
+            unit.health = rng.randint(unit.max_health // 3, unit.max_health)
+            game_state.units.append(unit)
+            occupied.add((x, y))
+
+    # Late-game horde: roughly one zombie per 25 tiles, plus some super zombies
+    zombie_count = (map_size * map_size) // 25
+    attempts = 0
+    while zombie_count > 0 and attempts < zombie_count * 20:
+        attempts += 1
+        x = rng.randint(0, map_size - 1)
+        y = rng.randint(0, map_size - 1)
+        if (x, y) in occupied or map_grid[y][x] == TileType.WATER:
+            continue
+        unit = Unit(x, y, 'zombie', 'enemy', game_state.difficulty)
+        unit.level = rng.randint(1, 4)
+        unit.health = rng.randint(unit.max_health // 3, unit.max_health)
+        game_state.units.append(unit)
+        occupied.add((x, y))
+        zombie_count -= 1
+
+    for _ in range(map_size // 10):
+        x = rng.randint(0, map_size - 2)
+        y = rng.randint(0, map_size - 2)
+        footprint = [(x, y), (x + 1, y), (x, y + 1), (x + 1, y + 1)]
+        if any(tile in occupied for tile in footprint):
+            continue
+        game_state.units.append(Unit(x, y, 'super_zombie', 'enemy', game_state.difficulty))
+        occupied.update(footprint)
+
+    # Explore the region around every city so fog has a realistic mix of states
+    for city in game_state.cities:
+        game_state._reveal_area(city.x, city.y, 8)
+    game_state.update_visibility()
+
+    return game_state
+
+
+def camera_sweep(map_size, tile_size, screen_width, screen_height, frames):
+    """Yield camera positions for a serpentine sweep across the whole map"""
+    world_width = map_size * tile_size
+    world_height = map_size * tile_size
+    max_x = max(0, world_width - screen_width)
+    max_y = max(0, world_height - screen_height)
+    rows = 4
+    frames_per_row = max(1, frames // rows)
+
+    for frame in range(frames):
+        row = min(rows - 1, frame // frames_per_row)
+        progress = (frame % frames_per_row) / max(1, frames_per_row - 1)
+        if row % 2 == 1:
+            progress = 1.0 - progress  # Sweep back the other way on odd rows
+        camera_x = int(max_x * progress)
+        camera_y = int(max_y * row / max(1, rows - 1))
+        yield camera_x, camera_y
+
+
+def _timed(method, samples):
+    """Wrap a bound method so each call appends its duration (ms) to samples"""
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        result = method(*args, **kwargs)
+        samples.append((time.perf_counter() - start) * 1000.0)
+        return result
+    return wrapper
+
+
+def run_scenario(game, map_size, fog, frames):
+    """Run one camera sweep and return {phase: [frame times in ms]}"""
+    from renderer import Renderer
+
+    game.game_state = build_late_game_state(map_size)
+    game.renderer = Renderer(game.screen_width, game.screen_height, game.tile_size)
+    game.debug_reveal_map = not fog
+    game.selected_city = game.game_state.cities[0] if game.game_state.cities else None
+    game.selected_unit = next((u for u in game.game_state.units if u.team == 'player'), None)
+    game.selected_tile = (game.selected_unit.x, game.selected_unit.y) if game.selected_unit else None
+    game.final_score = game.game_state.turn
+    game.high_scores = [{'turns': 100 - i * 5, 'date': '2025-01-01 12:00:00'} for i in range(10)]
+    game.cure_leaderboard = [{'turns': 40 + i * 3, 'difficulty': 'medium', 'date': '2025-01-01 12:00:00'} for i in range(10)]
+    game.available_saves = [f"save_{i}.json" for i in range(25)]
+    game.notification_dialog_data = {
+        'title': 'Benchmark',
+        'messages': ['Successfully scavenged:', 'Food: +20', 'Materials: +35', '', 'Resources added to unit inventory.'],
+        'type': 'info',
+        'callback': None
+    }
+    for i in range(50):
+        game.message_log.add(f"Zombie attacks soldier for 20 damage! Health: {100 - i}")
+
+    samples = {'render': [], 'render_ui': [], 'render_minimap': []}
+    for panel in MODAL_PANELS:
+        samples[panel] = []
+
+    # Shadow the sub-phase methods on this renderer instance so the calls made
+    # from inside Renderer.render are timed individually
+    renderer = game.renderer
+    renderer.render_ui = _timed(renderer.render_ui, samples['render_ui'])
+    renderer.render_minimap = _timed(renderer.render_minimap, samples['render_minimap'])
+
+    for camera_x, camera_y in camera_sweep(map_size, game.tile_size, game.screen_width, game.screen_height, frames):
+        renderer.camera_x = camera_x
+        renderer.camera_y = camera_y
+
+        start = time.perf_counter()
+        renderer.render(game.screen, game.game_state, game.selected_unit, game.selected_city,
+                        game.selected_tile, game.hovered_tile, game.building_placement_mode,
+                        game.debug_reveal_map, game)
+        samples['render'].append((time.perf_counter() - start) * 1000.0)
+
+        for panel in MODAL_PANELS:
+            start = time.perf_counter()
+            getattr(game, panel)()
+            samples[panel].append((time.perf_counter() - start) * 1000.0)
+
+    # Everything in Renderer.render that is not UI or minimap: terrain, buildings, cities, units
+    samples['render_world'] = [total - ui - minimap for total, ui, minimap in
+                               zip(samples['render'], samples['render_ui'], samples['render_minimap'])]
+    return samples
+
+
+def summarize(samples):
+    """Reduce raw samples to mean/p50/p95/p99 per phase"""
+    summary = {}
+    for phase, values in samples.items():
+        ordered = sorted(values)
+        summary[phase] = {
+            'frames': len(ordered),
+            'mean': sum(ordered) / len(ordered) if ordered else 0.0,
+            'p50': percentile(ordered, 50),
+            'p95': percentile(ordered, 95),
+            'p99': percentile(ordered, 99),
+        }
+    return summary
+
+
+def print_report(results):
+    """Print a fixed-width table of the benchmark results"""
+    header = f"{'map':>5} {'fog':>4} {'phase':<28} {'mean':>8} {'p50':>8} {'p95':>8} {'p99':>8}"
+    print(header)
+    print('-' * len(header))
+    for result in results:
+        for phase, stats in result['phases'].items():
+            print(f"{result['map_size']:>5} {'on' if result['fog'] else 'off':>4} {phase:<28} "
+                  f"{stats['mean']:8.2f} {stats['p50']:8.2f} {stats['p95']:8.2f} {stats['p99']:8.2f}")
+        print()
+    print("All times in milliseconds per frame.")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offscreen render benchmark (SDL dummy driver)")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[60, 100, 250], help="Map sizes to benchmark")
+    parser.add_argument('--frames', type=int, default=120, help="Frames per camera sweep")
+    parser.add_argument('--json', dest='json_path', default=None, help="Also write results to this JSON file")
+    args = parser.parse_args()
+
+    # Import after the dummy driver is configured; ZombieStrategyGame opens its
+    # display on construction, which is also what sprite loading needs
+    from main import ZombieStrategyGame
+    game = ZombieStrategyGame()
+    game.difficulty_dialog_open = False
+    game.screen = pygame.Surface((game.screen_width, game.screen_height))
+
+    results = []
+    for map_size in args.sizes:
+        for fog in (True, False):
+            print(f"Benchmarking {map_size}x{map_size} map, fog {'on' if fog else 'off'}...")
+            samples = run_scenario(game, map_size, fog, args.frames)
+            results.append({'map_size': map_size, 'fog': fog, 'phases': summarize(samples)})
+
+    print()
+    print_report(results)
+
+    if args.json_path:
+        with open(args.json_path, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"Results written to {args.json_path}")
+
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
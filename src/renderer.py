@@ -1,6 +1,14 @@
 import pygame
 import os
 from map_generator import TileType
+from profiling import frame_profiler
+from rules import rules
+from footprint import footprint_visible
+
+# How resources are named in production tooltips
+RESOURCE_LABELS = {'tech_points': 'tech points'}
+# ...and abbreviated in the city build menu
+COST_LABELS = {'materials': 'mat', 'medicine': 'med'}
 
 class Renderer:
     def __init__(self, screen_width, screen_height, tile_size):
@@ -39,6 +47,17 @@ class Renderer:
         # Load terrain sprites
         self.terrain_sprites = self._load_terrain_sprites()
 
+        # Selected unit's reachable tiles, drawn once into a surface and rebuilt only when the area changes
+        self.reachable_overlay = None
+        self.reachable_overlay_area = None
+
+        # One translucent tile per zombie threat level (index = threat level)
+        self.threat_tiles = [None]
+        for color in ((255, 140, 0, 70), (220, 0, 0, 90)):
+            tile = pygame.Surface((tile_size, tile_size), pygame.SRCALPHA)
+            tile.fill(color)
+            self.threat_tiles.append(tile)
+
     def _load_sprites(self):
         """Load unit sprites from PNG files"""
         sprites = {}
@@ -101,6 +120,7 @@ class Renderer:
 
     def render(self, screen, game_state, selected_unit=None, selected_city=None, selected_tile=None, hovered_tile=None, building_placement_mode=None, debug_reveal_map=False, game_instance=None):
         """Render the game world"""
+        frame_profiler.lap('terrain')
         screen.fill((0, 0, 0))
 
         # Calculate visible tiles
@@ -198,24 +218,32 @@ class Renderer:
 
                     # Draw grid lines
                     pygame.draw.rect(screen, (50, 50, 50), (x, y, self.tile_size, self.tile_size), 1)
-
-                    # Draw resource indicators on explored tiles (visible or in fog)
-                    if (col, row) in game_state.resources:
-                        if is_visible:
-                            # Bright gold when visible
-                            pygame.draw.circle(screen, (255, 215, 0),
-                                             (x + self.tile_size // 2, y + self.tile_size // 2),
-                                             5)
-                        else:
-                            # Dimmer when in fog of war
-                            pygame.draw.circle(screen, (128, 108, 0),
-                                             (x + self.tile_size // 2, y + self.tile_size // 2),
-                                             5)
                 else:
                     # Unexplored - pure black
                     pygame.draw.rect(screen, (0, 0, 0), (x, y, self.tile_size, self.tile_size))
                     pygame.draw.rect(screen, (30, 30, 30), (x, y, self.tile_size, self.tile_size), 1)
 
+        # Draw resource indicators on explored tiles (visible or in fog), only for the piles in view
+        half_tile = self.tile_size // 2
+        for col, row in game_state.resources.in_rect(start_col, start_row, end_col, end_row):
+            if debug_reveal_map or game_state.visible[row][col]:
+                color = (255, 215, 0)  # Bright gold when visible
+            elif game_state.explored[row][col]:
+                color = (128, 108, 0)  # Dimmer when in fog of war
+            else:
+                continue
+            pygame.draw.circle(screen, color,
+                               (col * self.tile_size - self.camera_x + half_tile, row * self.tile_size - self.camera_y + half_tile),
+                               5)
+
+        # Zombie threat overlay (Z): tiles zombies can walk onto, and tiles they can only attack
+        if game_instance is not None and game_instance.show_threat_map:
+            self.render_threat_overlay(screen, game_state.get_threat_map(), start_col, end_col, start_row, end_row)
+
+        # Shade the tiles the selected unit can reach this turn
+        if selected_unit is not None and selected_unit.team == 'player' and selected_unit.can_move():
+            self.render_reachable_overlay(screen, game_state.get_reachable_area(selected_unit))
+
         # Highlight selected tile
         if selected_tile and not building_placement_mode:
             tile_x, tile_y = selected_tile
@@ -236,6 +264,7 @@ class Renderer:
                     pygame.draw.rect(screen, (100, 255, 100), (x, y, self.tile_size, self.tile_size), 2)
 
         # Render placed buildings
+        frame_profiler.lap('buildings')
         for city in game_state.cities:
             for (bx, by), building_info in city.building_locations.items():
                 if game_state.visible[by][bx]:
@@ -286,6 +315,7 @@ class Renderer:
                         pygame.draw.rect(screen, (0, 200, 0), (bar_x, bar_y, filled_width, bar_height))
 
         # Render cities (only if visible)
+        frame_profiler.lap('cities')
         for city in game_state.cities:
             if game_state.visible[city.y][city.x]:
                 x = city.x * self.tile_size - self.camera_x
@@ -325,31 +355,20 @@ class Renderer:
                     pygame.draw.rect(screen, (0, 200, 0), (bar_x, bar_y, filled_width, bar_height))
 
         # Render units (only if visible or in debug mode)
+        frame_profiler.lap('units')
+        # Positions of zombies animating on screen this frame, interpolated in one pass
+        animated_positions = game_instance.animated_unit_positions(start_col, start_row, end_col, end_row) if game_instance else {}
         for unit in game_state.units:
-            # For multi-tile units, check if ANY tile is visible
-            unit_size = getattr(unit, 'size', 1)
-            is_visible = False
-
-            if debug_reveal_map or unit.team == 'player':
-                is_visible = True
-            else:
-                # Check all tiles the unit occupies
-                for dy in range(unit_size):
-                    for dx in range(unit_size):
-                        check_x = unit.x + dx
-                        check_y = unit.y + dy
-                        if (0 <= check_y < len(game_state.visible) and
-                            0 <= check_x < len(game_state.visible[0]) and
-                            game_state.visible[check_y][check_x]):
-                            is_visible = True
-                            break
-                    if is_visible:
-                        break
+            # For multi-tile units, check if ANY tile is visible (one row-slice test per footprint row)
+            unit_size = unit.size
+            is_visible = (debug_reveal_map or unit.team == 'player' or
+                          footprint_visible(game_state.visible, unit.x, unit.y, unit_size))
 
             if is_visible:
-                # Get render position (handles animation if active)
-                if game_instance:
-                    render_x, render_y = game_instance.get_unit_render_position(unit)
+                # Get render position (mid-animation zombies are drawn between tiles)
+                animated = animated_positions.get(unit) if animated_positions else None
+                if animated is not None:
+                    render_x, render_y = animated
                 else:
                     render_x, render_y = unit.x, unit.y
 
@@ -357,7 +376,7 @@ class Renderer:
                 y = render_y * self.tile_size - self.camera_y
 
                 # Determine size of unit
-                unit_size = getattr(unit, 'size', 1)
+                unit_size = unit.size
 
                 # Try to use sprite, fallback to colored circle
                 sprite = self.unit_sprites.get(unit.unit_type)
@@ -386,7 +405,7 @@ class Renderer:
                     pygame.draw.rect(screen, (0, 255, 0),
                                    (x + 2, y + self.tile_size - 6, int(health_bar_width * health_ratio), 4))
                 else:
-                    # Draw 2x2 super zombie
+                    # Draw NxN unit (super zombies are 2x2)
                     rect_width = self.tile_size * unit_size
                     rect_height = self.tile_size * unit_size
 
@@ -409,7 +428,7 @@ class Renderer:
                     if selected_unit == unit:
                         pygame.draw.rect(screen, (255, 255, 0), (x, y, rect_width, rect_height), 5)
 
-                    # Draw health bar (wider for 2x2 unit)
+                    # Draw health bar (as wide as the footprint)
                     health_bar_width = rect_width - 4
                     health_ratio = unit.health / unit.max_health
                     bar_y = y + rect_height + 2
@@ -421,7 +440,7 @@ class Renderer:
                 # Draw movement indicator for player units
                 if unit.team == 'player' and unit.can_move():
                     # Yellow dot if turn is skipped, green dot otherwise
-                    dot_color = (255, 255, 0) if getattr(unit, 'turn_skipped', False) else (0, 255, 0)
+                    dot_color = (255, 255, 0) if unit.turn_skipped else (0, 255, 0)
                     pygame.draw.circle(screen, dot_color,
                                      (x + self.tile_size - 6, y + 6),
                                      4)
@@ -434,7 +453,7 @@ class Renderer:
                         level_y = y + 4
                         font_size = 16
                     else:
-                        # For 2x2 units, position in top-left
+                        # For multi-tile units, position in top-left
                         level_x = x + 6
                         level_y = y + 6
                         font_size = 24
@@ -457,11 +476,21 @@ class Renderer:
                     level_rect = level_text.get_rect(center=(level_x + 8, level_y + 8))
                     screen.blit(level_text, level_rect)
 
+        # Mark the selected unit's standing goto tile
+        if selected_unit is not None and selected_unit.goto:
+            goal_x, goal_y = selected_unit.goto
+            center = (goal_x * self.tile_size - self.camera_x + self.tile_size // 2,
+                      goal_y * self.tile_size - self.camera_y + self.tile_size // 2)
+            pygame.draw.circle(screen, (255, 255, 0), center, self.tile_size // 4, 2)
+
         # Render UI
+        frame_profiler.lap('ui')
         self.render_ui(screen, game_state, selected_unit, selected_city, selected_tile, hovered_tile, building_placement_mode)
 
         # Render mini-map
+        frame_profiler.lap('minimap')
         self.render_minimap(screen, game_state)
+        frame_profiler.lap()
 
     def render_minimap(self, screen, game_state):
         """Render a clickable mini-map in the bottom-right corner"""
@@ -562,12 +591,13 @@ class Renderer:
                 pygame.draw.circle(screen, (200, 150, 255), (pixel_x, pixel_y), 4)
 
         # Draw units (player = blue, enemy = red)
+        visible = game_state.visible
         for unit in game_state.units:
-            if game_state.visible[unit.y][unit.x]:
+            if footprint_visible(visible, unit.x, unit.y, unit.size):
                 pixel_x = minimap_x + int(unit.x * scale_x)
                 pixel_y = minimap_y + int(unit.y * scale_y)
                 color = (100, 200, 255) if unit.team == 'player' else (200, 50, 50)
-                size = 2 if unit.size == 1 else 3  # Super zombies slightly larger
+                size = 1 + unit.size  # Multi-tile units (super zombies) slightly larger
                 pygame.draw.circle(screen, color, (pixel_x, pixel_y), size)
 
         # Draw camera viewport indicator
@@ -648,6 +678,35 @@ class Renderer:
         }
         return tile_names.get(tile_type, "Unknown")
 
+    def render_reachable_overlay(self, screen, area):
+        """Blit the cached overlay of a unit's reachable tiles (rebuilt only for a new area)"""
+        left, top, right, bottom = area.box
+        if area is not self.reachable_overlay_area:
+            overlay = pygame.Surface(((right - left) * self.tile_size, (bottom - top) * self.tile_size), pygame.SRCALPHA)
+            for tile_x, tile_y in area.tiles:
+                rect = ((tile_x - left) * self.tile_size, (tile_y - top) * self.tile_size, self.tile_size, self.tile_size)
+                overlay.fill((80, 160, 255, 60), rect)
+                pygame.draw.rect(overlay, (120, 190, 255, 140), rect, 1)
+            self.reachable_overlay = overlay
+            self.reachable_overlay_area = area
+        screen.blit(self.reachable_overlay, (left * self.tile_size - self.camera_x, top * self.tile_size - self.camera_y))
+
+    def render_threat_overlay(self, screen, threat, start_col, end_col, start_row, end_row):
+        """Tint the on-screen tiles of the zombie threat map"""
+        levels = threat.levels
+        width = threat.width
+        threat_tiles = self.threat_tiles
+        for row in range(start_row, end_row):
+            row_start = row * width
+            # Skip safe rows with one slice test
+            if not any(levels[row_start + start_col:row_start + end_col]):
+                continue
+            y = row * self.tile_size - self.camera_y
+            for col in range(start_col, end_col):
+                level = levels[row_start + col]
+                if level:
+                    screen.blit(threat_tiles[level], (col * self.tile_size - self.camera_x, y))
+
     def render_ui(self, screen, game_state, selected_unit, selected_city, selected_tile, hovered_tile=None, building_placement_mode=None):
         """Render UI elements"""
         font = pygame.font.Font(None, 24)
@@ -742,31 +801,32 @@ class Renderer:
             panel_y = 80
             panel_width = 410
 
-            # Calculate cure cost based on tech
-            cure_food = 350 if game_state.has_tech('cure_research') else 500
-            cure_materials = 350 if game_state.has_tech('cure_research') else 500
+            # Costs come from the rules registry (the cure is cheaper with cure_research)
+            def cost_text(item):
+                cost = rules.build_cost(item, game_state)
+                return ', '.join(f"{amount} {COST_LABELS.get(resource, resource)}" for resource, amount in cost.items())
 
             buildings = [
-                ("1: Farm", "30 mat (place on tile)"),
-                ("2: Workshop", "50 mat (place on tile)"),
-                ("3: Hospital", "40 mat (place on tile)"),
-                ("4: Wall", "5 mat (place on tile)"),
-                ("5: Dock", "40 mat (place on water)"),
-                ("6: Survivor", "20 food, 10 mat"),
-                ("7: Scout", "15 food, 5 mat (fast)"),
-                ("8: Soldier", "30 food, 20 mat (strong)"),
-                ("9: Medic", "25 food, 15 mat, 10 med"),
-                ("B: Research Ctr", "30 mat (tech points)"),
+                ("1: Farm", f"{cost_text('farm')} (place on tile)"),
+                ("2: Workshop", f"{cost_text('workshop')} (place on tile)"),
+                ("3: Hospital", f"{cost_text('hospital')} (place on tile)"),
+                ("4: Wall", f"{cost_text('wall')} (place on tile)"),
+                ("5: Dock", f"{cost_text('dock')} (place on water)"),
+                ("6: Survivor", cost_text('survivor')),
+                ("7: Scout", f"{cost_text('scout')} (fast)"),
+                ("8: Soldier", f"{cost_text('soldier')} (strong)"),
+                ("9: Medic", cost_text('medic')),
+                ("B: Research Ctr", f"{cost_text('research_center')} (tech points)"),
                 ("U: Upgrade", "Click building to upgrade")
             ]
 
             # Add super soldier option if tech is researched
-            if game_state.has_tech('super_soldier_program'):
-                buildings.append(("0: Super Soldier", "50 food, 40 mat (elite)"))
+            if game_state.tech_modifiers.super_soldiers:
+                buildings.append(("0: Super Soldier", f"{cost_text('super_soldier')} (elite)"))
 
             # Add cure manufacturing option if city has hospital and the cure
             if selected_city and 'hospital' in selected_city.buildings and selected_city.resources.get('cure', 0) > 0:
-                buildings.append(("C: MANUFACTURE CURE", f"{cure_food} food, {cure_materials} mat, 200 med, 1 cure"))
+                buildings.append(("C: MANUFACTURE CURE", cost_text('manufacture_cure')))
 
             # Calculate dynamic panel height based on content
             # Base: 142 (title + stats + production) + 22 (menu title) + 22 (help text) + 45 (spacing before items) + (items * 20) + 10 (bottom padding)
@@ -927,14 +987,7 @@ class Renderer:
 
                     # Calculate what production would be if built here
                     if preview_building == 'farm':
-                        prod = 0
-                        if tile_type == TileType.GRASS:
-                            prod = 6
-                        elif tile_type == TileType.FOREST:
-                            prod = 3
-                        # Apply tech bonus
-                        if game_state.has_tech('advanced_farming'):
-                            prod += 2
+                        _, prod = self.building_output(game_state, 'farm', tile_type)
                         if prod > 0:
                             preview_text = preview_font.render(f"PREVIEW: {preview_building.capitalize()} would produce {prod} food/turn", True, (100, 255, 100))
                         else:
@@ -942,33 +995,20 @@ class Renderer:
                         screen.blit(preview_text, (panel_x + 10, panel_y + y_offset))
                     elif preview_building == 'dock':
                         if tile_type == TileType.WATER:
-                            preview_text = preview_font.render(f"PREVIEW: {preview_building.capitalize()} would produce 12 food/turn", True, (100, 255, 100))
+                            _, prod = self.building_output(game_state, 'dock', tile_type)
+                            preview_text = preview_font.render(f"PREVIEW: {preview_building.capitalize()} would produce {prod} food/turn", True, (100, 255, 100))
                         else:
                             preview_text = preview_font.render(f"PREVIEW: Docks must be on water!", True, (255, 100, 100))
                         screen.blit(preview_text, (panel_x + 10, panel_y + y_offset))
                     elif preview_building == 'workshop':
-                        prod = 0
-                        if tile_type == TileType.RUBBLE:
-                            prod = 2
-                        elif tile_type in [TileType.BUILDING_RUINED, TileType.ROAD]:
-                            prod = 4
-                        elif tile_type == TileType.BUILDING_INTACT:
-                            prod = 8
-                        # Apply tech bonus
-                        if game_state.has_tech('industrial_workshops'):
-                            prod += 3
+                        _, prod = self.building_output(game_state, 'workshop', tile_type)
                         if prod > 0:
                             preview_text = preview_font.render(f"PREVIEW: {preview_building.capitalize()} would produce {prod} materials/turn", True, (100, 255, 100))
                         else:
                             preview_text = preview_font.render(f"PREVIEW: {preview_building.capitalize()} - poor location (0 materials)", True, (255, 100, 100))
                         screen.blit(preview_text, (panel_x + 10, panel_y + y_offset))
                     elif preview_building == 'hospital':
-                        prod = 2
-                        if tile_type == TileType.BUILDING_INTACT:
-                            prod += 4
-                        # Apply tech bonus
-                        if game_state.has_tech('basic_medicine'):
-                            prod += 2
+                        _, prod = self.building_output(game_state, 'hospital', tile_type)
                         preview_text = preview_font.render(f"PREVIEW: {preview_building.capitalize()} would produce {prod} medicine/turn", True, (100, 255, 100))
                         screen.blit(preview_text, (panel_x + 10, panel_y + y_offset))
                     elif preview_building == 'wall':
@@ -984,116 +1024,27 @@ class Renderer:
                         current_level = building.get('level', 1)
                         preview_font = pygame.font.Font(None, 22)
 
-                        if current_level < 3:
+                        upgrade_cost = rules.upgrade_cost(building_type, current_level)
+                        if upgrade_cost is not None:
                             next_level = current_level + 1
-
-                            # Upgrade costs match game_state.py: base_cost * (current_level + 1)
-                            upgrade_costs = {
-                                'farm': 15 * (current_level + 1),
-                                'workshop': 25 * (current_level + 1),
-                                'hospital': 20 * (current_level + 1),
-                                'wall': 12 * (current_level + 1),
-                                'dock': 20 * (current_level + 1),
-                                'research_center': 15 * (current_level + 1)
-                            }
-                            upgrade_cost = upgrade_costs.get(building_type, 20 * current_level)
-
-                            # Calculate current and next production
-                            if building_type == 'farm':
-                                current_prod = 0
-                                if terrain == TileType.GRASS:
-                                    current_prod = 6
-                                elif terrain == TileType.FOREST:
-                                    current_prod = 3
-                                # Apply tech bonus
-                                tech_bonus = 2 if game_state.has_tech('advanced_farming') else 0
-                                current_prod = (current_prod + tech_bonus) * current_level
-                                next_prod = (current_prod // current_level) * next_level if current_level > 0 else 0
-
-                                upgrade_text = preview_font.render(f"UPGRADE: {building_type.capitalize()} L{current_level} → L{next_level}", True, (100, 255, 255))
-                                screen.blit(upgrade_text, (panel_x + 10, panel_y + y_offset))
-                                y_offset += 20
-                                cost_text = preview_font.render(f"Cost: {upgrade_cost} materials", True, (255, 200, 100))
-                                screen.blit(cost_text, (panel_x + 10, panel_y + y_offset))
-                                y_offset += 20
-                                prod_text = preview_font.render(f"Production: {current_prod} → {next_prod} food/turn", True, (100, 255, 100))
-                                screen.blit(prod_text, (panel_x + 10, panel_y + y_offset))
-
-                            elif building_type == 'dock':
-                                current_prod = 12 * current_level
-                                next_prod = 12 * next_level
-
-                                upgrade_text = preview_font.render(f"UPGRADE: {building_type.capitalize()} L{current_level} → L{next_level}", True, (100, 255, 255))
-                                screen.blit(upgrade_text, (panel_x + 10, panel_y + y_offset))
-                                y_offset += 20
-                                cost_text = preview_font.render(f"Cost: {upgrade_cost} materials", True, (255, 200, 100))
-                                screen.blit(cost_text, (panel_x + 10, panel_y + y_offset))
-                                y_offset += 20
-                                prod_text = preview_font.render(f"Production: {current_prod} → {next_prod} food/turn", True, (100, 255, 100))
-                                screen.blit(prod_text, (panel_x + 10, panel_y + y_offset))
-
-                            elif building_type == 'workshop':
-                                current_prod = 0
-                                if terrain == TileType.RUBBLE:
-                                    current_prod = 2
-                                elif terrain in [TileType.BUILDING_RUINED, TileType.ROAD]:
-                                    current_prod = 4
-                                elif terrain == TileType.BUILDING_INTACT:
-                                    current_prod = 8
-                                # Apply tech bonus
-                                tech_bonus = 3 if game_state.has_tech('industrial_workshops') else 0
-                                current_prod = (current_prod + tech_bonus) * current_level
-                                next_prod = (current_prod // current_level) * next_level if current_level > 0 else 0
-
-                                upgrade_text = preview_font.render(f"UPGRADE: {building_type.capitalize()} L{current_level} → L{next_level}", True, (100, 255, 255))
-                                screen.blit(upgrade_text, (panel_x + 10, panel_y + y_offset))
-                                y_offset += 20
-                                cost_text = preview_font.render(f"Cost: {upgrade_cost} materials", True, (255, 200, 100))
-                                screen.blit(cost_text, (panel_x + 10, panel_y + y_offset))
-                                y_offset += 20
-                                prod_text = preview_font.render(f"Production: {current_prod} → {next_prod} materials/turn", True, (100, 255, 100))
-                                screen.blit(prod_text, (panel_x + 10, panel_y + y_offset))
-
-                            elif building_type == 'hospital':
-                                current_prod = 2
-                                if terrain == TileType.BUILDING_INTACT:
-                                    current_prod += 4
-                                # Apply tech bonus
-                                tech_bonus = 2 if game_state.has_tech('basic_medicine') else 0
-                                current_prod = (current_prod + tech_bonus) * current_level
-                                next_prod = (current_prod // current_level) * next_level if current_level > 0 else 0
-
-                                upgrade_text = preview_font.render(f"UPGRADE: {building_type.capitalize()} L{current_level} → L{next_level}", True, (100, 255, 255))
-                                screen.blit(upgrade_text, (panel_x + 10, panel_y + y_offset))
-                                y_offset += 20
-                                cost_text = preview_font.render(f"Cost: {upgrade_cost} materials", True, (255, 200, 100))
-                                screen.blit(cost_text, (panel_x + 10, panel_y + y_offset))
-                                y_offset += 20
-                                prod_text = preview_font.render(f"Production: {current_prod} → {next_prod} medicine/turn", True, (100, 255, 100))
-                                screen.blit(prod_text, (panel_x + 10, panel_y + y_offset))
-
-                            elif building_type == 'wall':
-                                upgrade_text = preview_font.render(f"UPGRADE: {building_type.capitalize()} L{current_level} → L{next_level}", True, (100, 255, 255))
-                                screen.blit(upgrade_text, (panel_x + 10, panel_y + y_offset))
-                                y_offset += 20
-                                cost_text = preview_font.render(f"Cost: {upgrade_cost} materials", True, (255, 200, 100))
-                                screen.blit(cost_text, (panel_x + 10, panel_y + y_offset))
-                                y_offset += 20
+                            title = "Research Center" if building_type == 'research_center' else building_type.capitalize()
+
+                            upgrade_text = preview_font.render(f"UPGRADE: {title} L{current_level} → L{next_level}", True, (100, 255, 255))
+                            screen.blit(upgrade_text, (panel_x + 10, panel_y + y_offset))
+                            y_offset += 20
+                            cost_text = preview_font.render(f"Cost: {upgrade_cost['materials']} materials", True, (255, 200, 100))
+                            screen.blit(cost_text, (panel_x + 10, panel_y + y_offset))
+                            y_offset += 20
+
+                            # Current and next production (tech bonuses are flat, as the city counts them)
+                            resource, current_prod = self.building_output(game_state, building_type, terrain, current_level)
+                            if resource:
+                                _, next_prod = self.building_output(game_state, building_type, terrain, next_level)
+                                unit_name = RESOURCE_LABELS.get(resource, resource)
+                                prod_text = preview_font.render(f"Production: {current_prod} → {next_prod} {unit_name}/turn", True, (100, 255, 100))
+                            else:
                                 prod_text = preview_font.render(f"Effect: Increased defensive bonus", True, (100, 255, 100))
-                                screen.blit(prod_text, (panel_x + 10, panel_y + y_offset))
-
-                            elif building_type == 'research_center':
-                                current_prod = 2 * current_level
-                                next_prod = 2 * next_level
-
-                                upgrade_text = preview_font.render(f"UPGRADE: Research Center L{current_level} → L{next_level}", True, (100, 255, 255))
-                                screen.blit(upgrade_text, (panel_x + 10, panel_y + y_offset))
-                                y_offset += 20
-                                cost_text = preview_font.render(f"Cost: {upgrade_cost} materials", True, (255, 200, 100))
-                                screen.blit(cost_text, (panel_x + 10, panel_y + y_offset))
-                                y_offset += 20
-                                prod_text = preview_font.render(f"Production: {current_prod} → {next_prod} tech points/turn", True, (100, 255, 100))
-                                screen.blit(prod_text, (panel_x + 10, panel_y + y_offset))
+                            screen.blit(prod_text, (panel_x + 10, panel_y + y_offset))
                         else:
                             max_text = preview_font.render(f"{building_type.capitalize()} is at MAX LEVEL", True, (255, 100, 100))
                             screen.blit(max_text, (panel_x + 10, panel_y + y_offset))
@@ -1107,47 +1058,25 @@ class Renderer:
                         level = building.get('level', 1)
 
                         # Calculate production for this building
-                        if building_type == 'farm':
-                            prod = 0
-                            if terrain == TileType.GRASS:
-                                prod = 6
-                            elif terrain == TileType.FOREST:
-                                prod = 3
-                            # Apply tech bonus
-                            tech_bonus = 2 if game_state.has_tech('advanced_farming') else 0
-                            prod = (prod + tech_bonus) * level
-                            prod_text = bonus_font.render(f"Current: {building_type.capitalize()} L{level} producing {prod} food/turn", True, (255, 255, 100))
-                            screen.blit(prod_text, (panel_x + 10, panel_y + y_offset))
-                        elif building_type == 'dock':
-                            prod = 12 * level
-                            prod_text = bonus_font.render(f"Current: {building_type.capitalize()} L{level} producing {prod} food/turn", True, (255, 255, 100))
-                            screen.blit(prod_text, (panel_x + 10, panel_y + y_offset))
-                        elif building_type == 'workshop':
-                            prod = 0
-                            if terrain == TileType.RUBBLE:
-                                prod = 2
-                            elif terrain in [TileType.BUILDING_RUINED, TileType.ROAD]:
-                                prod = 4
-                            elif terrain == TileType.BUILDING_INTACT:
-                                prod = 8
-                            # Apply tech bonus
-                            tech_bonus = 3 if game_state.has_tech('industrial_workshops') else 0
-                            prod = (prod + tech_bonus) * level
-                            prod_text = bonus_font.render(f"Current: {building_type.capitalize()} L{level} producing {prod} materials/turn", True, (255, 255, 100))
-                            screen.blit(prod_text, (panel_x + 10, panel_y + y_offset))
-                        elif building_type == 'hospital':
-                            prod = 2
-                            if terrain == TileType.BUILDING_INTACT:
-                                prod += 4
-                            # Apply tech bonus
-                            tech_bonus = 2 if game_state.has_tech('basic_medicine') else 0
-                            prod = (prod + tech_bonus) * level
-                            prod_text = bonus_font.render(f"Current: {building_type.capitalize()} L{level} producing {prod} medicine/turn", True, (255, 255, 100))
+                        resource, prod = self.building_output(game_state, building_type, terrain, level)
+                        if resource and building_type != 'research_center':
+                            prod_text = bonus_font.render(f"Current: {building_type.capitalize()} L{level} producing {prod} {RESOURCE_LABELS.get(resource, resource)}/turn", True, (255, 255, 100))
                             screen.blit(prod_text, (panel_x + 10, panel_y + y_offset))
                         elif building_type == 'wall':
                             prod_text = bonus_font.render(f"Current: {building_type.capitalize()} L{level} (defensive structure)", True, (255, 255, 100))
                             screen.blit(prod_text, (panel_x + 10, panel_y + y_offset))
 
+    def building_output(self, game_state, building_type, terrain, level=1):
+        """(resource, amount per turn) one building yields, counted the way City.production_vector does"""
+        building_yield = rules.building_yield(building_type, terrain)
+        if not building_yield:
+            return None, 0
+        resource, amount = building_yield
+        amount *= level
+        # Tech bonuses are flat per building, not scaled by level
+        amount += game_state.tech_modifiers.production_bonus.get((building_type, resource), 0)
+        return resource, amount
+
     def move_camera(self, dx, dy):
         """Move the camera"""
         self.camera_x += dx
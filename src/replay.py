@@ -0,0 +1,153 @@
+"""Command-log recording and headless replay.
+
+Every state-changing player action is appended to a JSON-lines log in
+saves/replays/. The first line is a header describing how the game started
+(seed, map size and difficulty for a new game, or the full save data for a
+loaded one); each following line is a command or a state checkpoint:
+
+    {"header": {"kind": "new", "seed": 1234, "map_size": 60, "difficulty": "medium"}}
+    {"turn": 0, "cmd": "move", "args": {"unit": 1, "at": [30, 22], "tile": [31, 22]}}
+    {"turn": 0, "cmd": "end_turn", "args": {}}
+    {"turn": 0, "cmd": "end_enemy_turn", "args": {}}
+    {"turn": 1, "checkpoint": "3f1c..."}
+
+Units and cities are referenced by their index in GameState.units/cities,
+which is reproducible because the engine is deterministic for a given seed.
+
+Usage:
+    cd src
+    python replay.py ../saves/replays/session_20250101_120000.jsonl
+"""
+import json
+import os
+
+
+class ReplayDivergence(Exception):
+    """Raised when a replay stops matching the recorded session"""
+
+
+class CommandRecorder:
+    """Appends commands and checkpoints to a replay log, one JSON object per line"""
+
+    def __init__(self, path, header):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.file = open(path, 'w')
+        self._write({'header': header})
+
+    def _write(self, entry):
+        self.file.write(json.dumps(entry, separators=(',', ':')) + '\n')
+        self.file.flush()  # Keep the log usable even if the game crashes
+
+    def record(self, turn, name, args):
+        """Append one player command"""
+        self._write({'turn': turn, 'cmd': name, 'args': args})
+
+    def checkpoint(self, turn, digest):
+        """Append a state digest the replayer must reproduce at this point"""
+        self._write({'turn': turn, 'checkpoint': digest})
+
+    def close(self):
+        if self.file:
+            self.file.close()
+            self.file = None
+
+
+def default_replay_path():
+    """New timestamped log path in saves/replays/"""
+    import datetime
+    timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+    return os.path.join(os.path.dirname(__file__), '..', 'saves', 'replays', f"session_{timestamp}.jsonl")
+
+
+def load_replay(path):
+    """Read a replay log; returns (header, entries)"""
+    with open(path, 'r') as f:
+        lines = [json.loads(line) for line in f if line.strip()]
+    if not lines or 'header' not in lines[0]:
+        raise ValueError(f"{path} is not a replay log (missing header)")
+    return lines[0]['header'], lines[1:]
+
+
+def replay(path, verbose=False):
+    """Re-run a recorded session headlessly and check it reaches the recorded states.
+
+    Returns a summary dict; raises ReplayDivergence on the first mismatch.
+    """
+    import time
+
+    # Headless: no window, no audio, nothing written to saves/ except this run's output
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+    from main import ZombieStrategyGame
+    from game_state import GameState
+    import game_log
+
+    # Game event chatter stays in the ring buffer unless asked for
+    game_log.set_console_enabled(verbose)
+
+    header, entries = load_replay(path)
+
+    game = ZombieStrategyGame()
+    game.headless_replay = True  # Skips autosave, leaderboards and recording
+    if header['kind'] == 'new':
+        game.selected_map_size = header['map_size']
+        game.initialize_game(header['difficulty'], seed=header['seed'])
+    else:
+        game.start_loaded_game(GameState.from_save_data(header['save']),
+                               header.get('camera_x', 0), header.get('camera_y', 0))
+
+    start = time.perf_counter()
+    commands = 0
+    checkpoints = 0
+    for line_number, entry in enumerate(entries, start=2):
+        if 'checkpoint' in entry:
+            digest = game.game_state.state_digest()
+            if digest != entry['checkpoint']:
+                raise ReplayDivergence(f"line {line_number}: state differs at turn {game.game_state.turn} "
+                                       f"(expected {entry['checkpoint'][:12]}, got {digest[:12]})")
+            checkpoints += 1
+        else:
+            if verbose:
+                print(f"[turn {entry['turn']}] {entry['cmd']} {entry['args']}")
+            try:
+                game.apply_command(entry['cmd'], entry['args'])
+            except ReplayDivergence as e:
+                raise ReplayDivergence(f"line {line_number}: {e}")
+            commands += 1
+
+    elapsed = time.perf_counter() - start
+    return {
+        'commands': commands,
+        'checkpoints': checkpoints,
+        'turn': game.game_state.turn,
+        'digest': game.game_state.state_digest(),
+        'seconds': elapsed
+    }
+
+
+if __name__ == "__main__":
+    import argparse
+    import sys
+
+    parser = argparse.ArgumentParser(description="Replay a recorded session headlessly and verify it")
+    parser.add_argument('log', help="Replay log (.jsonl) from saves/replays/")
+    parser.add_argument('--verbose', action='store_true', help="Print each command as it is replayed")
+    args = parser.parse_args()
+
+    try:
+        result = replay(args.log, args.verbose)
+    except ReplayDivergence as e:
+        import game_log
+        print(f"❌ Replay diverged: {e}")
+        print("Last game events before the divergence:")
+        for line in game_log.recent(20):
+            print(f"  {line}")
+        sys.exit(1)
+
+    if result['checkpoints'] == 0:
+        print("⚠ Log has no checkpoints; replay ran but nothing was verified")
+    print(f"✓ Replayed {result['commands']} commands to turn {result['turn']} in {result['seconds']:.2f}s, "
+          f"{result['checkpoints']} checkpoint(s) matched (final state {result['digest'][:12]})")
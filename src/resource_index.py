@@ -0,0 +1,136 @@
+"""Scavengeable resource piles, indexed by map area.
+
+GameState.resources maps a tile to its pile ({'food': 12, 'materials': 30,
+...}). ResourcePiles behaves like that dict, and also files every pile under
+a BUCKET_SIZE x BUCKET_SIZE bucket of the map. Adding, replacing or deleting a
+pile through the mapping keeps the buckets in step, so spatial queries only
+look at the buckets near the question instead of every pile on the map:
+
+    piles = game_state.resources
+    piles.nearest(x, y, k=3, resource='food')     # [(x1, y1), ...] closest first
+    piles.within(x, y, 10, resource='materials')  # every pile within 10 tiles
+    piles.in_rect(start_col, start_row, end_col, end_row)
+
+Distances are Chebyshev (8-way moves), ties broken by row then column. The
+buckets only track positions; `resource=` is checked against the live pile
+when the query runs, so amounts can be changed in place.
+"""
+from collections.abc import MutableMapping
+
+# Tiles per side of a bucket
+BUCKET_SIZE = 16
+
+
+def _has(pile, resource):
+    return resource is None or pile.get(resource, 0) > 0
+
+
+class ResourcePiles(MutableMapping):
+    """Dict of tile -> resource pile, with a bucketed spatial index over the tiles"""
+
+    def __init__(self, piles=None):
+        self.piles = {}    # (x, y) -> pile dict, in insertion order (saves and digests rely on it)
+        self.buckets = {}  # (bucket_x, bucket_y) -> set of (x, y) with a pile
+        if piles:
+            for position, pile in piles.items():
+                self[position] = pile
+
+    # Mapping interface
+    def __getitem__(self, position):
+        return self.piles[position]
+
+    def __setitem__(self, position, pile):
+        if position not in self.piles:
+            x, y = position
+            self.buckets.setdefault((x // BUCKET_SIZE, y // BUCKET_SIZE), set()).add(position)
+        self.piles[position] = pile
+
+    def __delitem__(self, position):
+        del self.piles[position]
+        x, y = position
+        key = (x // BUCKET_SIZE, y // BUCKET_SIZE)
+        bucket = self.buckets[key]
+        bucket.discard(position)
+        if not bucket:
+            del self.buckets[key]
+
+    def __contains__(self, position):
+        return position in self.piles
+
+    def __iter__(self):
+        return iter(self.piles)
+
+    def __len__(self):
+        return len(self.piles)
+
+    def keys(self):
+        return self.piles.keys()
+
+    def values(self):
+        return self.piles.values()
+
+    def items(self):
+        return self.piles.items()
+
+    def __repr__(self):
+        return f"ResourcePiles({self.piles!r})"
+
+    # Spatial queries
+    def in_rect(self, start_col, start_row, end_col, end_row):
+        """Positions with a pile in columns [start_col, end_col) and rows [start_row, end_row)"""
+        found = []
+        buckets = self.buckets
+        for bucket_y in range(start_row // BUCKET_SIZE, (end_row - 1) // BUCKET_SIZE + 1):
+            for bucket_x in range(start_col // BUCKET_SIZE, (end_col - 1) // BUCKET_SIZE + 1):
+                bucket = buckets.get((bucket_x, bucket_y))
+                if bucket:
+                    for position in bucket:
+                        if start_col <= position[0] < end_col and start_row <= position[1] < end_row:
+                            found.append(position)
+        return found
+
+    def within(self, x, y, radius, resource=None):
+        """Positions of piles within `radius` tiles of (x, y) (holding some `resource`, if given), closest first"""
+        piles = self.piles
+        found = []
+        for px, py in self.in_rect(x - radius, y - radius, x + radius + 1, y + radius + 1):
+            if _has(piles[(px, py)], resource):
+                found.append((max(abs(px - x), abs(py - y)), py, px))
+        found.sort()
+        return [(px, py) for _, py, px in found]
+
+    def nearest(self, x, y, k=1, resource=None, max_distance=None):
+        """Up to `k` closest piles to (x, y) (holding some `resource`, if given), closest first"""
+        if not self.buckets or k <= 0:
+            return []
+        piles = self.piles
+        buckets = self.buckets
+        center_x = x // BUCKET_SIZE
+        center_y = y // BUCKET_SIZE
+        # Never search past the farthest occupied bucket
+        max_ring = max(max(abs(bx - center_x), abs(by - center_y)) for bx, by in buckets)
+        if max_distance is not None:
+            max_ring = min(max_ring, max_distance // BUCKET_SIZE + 1)
+
+        found = []
+        for ring in range(max_ring + 1):
+            # Visit the buckets on the square ring `ring` buckets out from (x, y)'s bucket
+            for bucket_y in range(center_y - ring, center_y + ring + 1):
+                edge_row = bucket_y == center_y - ring or bucket_y == center_y + ring
+                step = 1 if edge_row else 2 * ring
+                for bucket_x in range(center_x - ring, center_x + ring + 1, step):
+                    bucket = buckets.get((bucket_x, bucket_y))
+                    if not bucket:
+                        continue
+                    for px, py in bucket:
+                        if _has(piles[(px, py)], resource):
+                            distance = max(abs(px - x), abs(py - y))
+                            if max_distance is None or distance <= max_distance:
+                                found.append((distance, py, px))
+            # Anything in a farther ring is more than ring * BUCKET_SIZE tiles away
+            if len(found) >= k:
+                found.sort()
+                if found[k - 1][0] <= ring * BUCKET_SIZE:
+                    break
+        found.sort()
+        return [(px, py) for _, py, px in found[:k]]
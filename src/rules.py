@@ -0,0 +1,143 @@
+"""Game rules registry: costs, upgrade curves, yields, unit stats and difficulty settings.
+
+The numbers live in rules.json next to this file. They are loaded once and
+compiled into lookup tables, so a cost check is a dict lookup instead of a
+freshly built cost table:
+
+    from rules import rules
+    cost = rules.build_cost('farm', game_state)       # {'materials': 30}
+    cost = rules.upgrade_cost('farm', current_level)  # None at max level
+    settings = rules.difficulty('hard')
+
+While developing, `python main.py --hot-reload-rules` re-reads rules.json
+whenever it changes on disk; listeners registered with on_reload() are told
+so they can drop anything cached from the old rules.
+"""
+import json
+import os
+
+RULES_PATH = os.path.join(os.path.dirname(__file__), 'rules.json')
+
+# Keys in rules.json that start with this are notes for humans, not rules
+COMMENT_PREFIX = '_'
+
+
+def _without_comments(table):
+    return {key: value for key, value in table.items() if not key.startswith(COMMENT_PREFIX)}
+
+
+class Rules:
+    """Compiled view of rules.json"""
+
+    def __init__(self, path=RULES_PATH):
+        self.path = path
+        self.mtime = None
+        self.listeners = []
+        self.load()
+
+    def load(self):
+        """Read and compile the rules file"""
+        with open(self.path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        mtime = os.path.getmtime(self.path)
+        # Compile into a scratch object first so a bad file can't leave the tables half-updated
+        staged = Rules.__new__(Rules)
+        staged._compile(data)
+        vars(self).update(vars(staged))
+        self.mtime = mtime
+
+    def _compile(self, data):
+        from map_generator import TileType
+
+        self.building_costs = _without_comments(data['building_costs'])
+        self.unit_costs = _without_comments(data['unit_costs'])
+        self.building_health = _without_comments(data['building_health'])
+
+        # Everything a city can spend resources on, with and without cure_research
+        # (manufacture_cure is the only entry that changes)
+        base_costs = {**self.building_costs, **self.unit_costs}
+        self.city_costs = {
+            False: {**base_costs, 'manufacture_cure': data['cure_cost']},
+            True: {**base_costs, 'manufacture_cure': data['cure_research_cost']},
+        }
+
+        # (building_type, current_level) -> cost of upgrading to the next level
+        upgrades = data['upgrades']
+        self.max_building_level = upgrades['max_level']
+        self.upgrade_costs = {}
+        for building_type, per_level in _without_comments(upgrades['materials_per_level']).items():
+            for level in range(1, self.max_building_level):
+                self.upgrade_costs[(building_type, level)] = {'materials': per_level * (level + 1)}
+
+        # (building_type, terrain) -> (resource, level-1 yield); terrain-independent yields
+        # are stored per building type for terrains not listed
+        yields = data['yields']
+        self.city_base_production = dict(yields['city_base'])
+        self.building_yields = {}
+        self.default_yields = {}
+        for building_type, spec in _without_comments(yields['buildings']).items():
+            self.default_yields[building_type] = (spec['resource'], spec['default'])
+            for terrain_name, amount in spec.get('terrain', {}).items():
+                self.building_yields[(building_type, getattr(TileType, terrain_name))] = (spec['resource'], amount)
+        self.production_tech_bonuses = {
+            tech_id: (bonus['building'], bonus['resource'], bonus['amount'])
+            for tech_id, bonus in _without_comments(yields['tech_bonuses']).items()
+        }
+
+        self.unit_stats = {unit_type: tuple(stats) for unit_type, stats in _without_comments(data['unit_stats']).items()}
+        self.difficulties = _without_comments(data['difficulty'])
+
+        zombie_lod = data['zombie_lod']
+        self.zombie_lod_distance = zombie_lod['distance']
+        self.zombie_lod_refresh_turns = zombie_lod['field_refresh_turns']
+
+    # Lookups
+    def build_cost(self, item, game_state=None):
+        """Cost of a building, recruit or the cure (None if a city can't build it)"""
+        cure_research = bool(game_state and game_state.tech_modifiers.cure_research)
+        return self.city_costs[cure_research].get(item)
+
+    def upgrade_cost(self, building_type, current_level):
+        """Cost of upgrading a building from current_level (None if it can't be upgraded)"""
+        return self.upgrade_costs.get((building_type, current_level))
+
+    def building_yield(self, building_type, terrain):
+        """(resource, amount per level) a building produces on a terrain, or None"""
+        building_yield = self.building_yields.get((building_type, terrain))
+        if building_yield is None:
+            building_yield = self.default_yields.get(building_type)
+        return building_yield
+
+    def difficulty(self, name):
+        """Settings for a difficulty level (unknown names get medium)"""
+        return self.difficulties.get(name, self.difficulties['medium'])
+
+    # Hot reload
+    def on_reload(self, callback):
+        """Call `callback()` after the rules are reloaded"""
+        self.listeners.append(callback)
+
+    def reload_if_changed(self):
+        """Reload if rules.json changed on disk; returns True if it did.
+
+        A file that fails to parse is reported and the old rules stay in effect.
+        """
+        try:
+            mtime = os.path.getmtime(self.path)
+        except OSError:
+            return False
+        if mtime == self.mtime:
+            return False
+        try:
+            self.load()
+        except (ValueError, KeyError, TypeError, AttributeError) as e:
+            self.mtime = mtime  # Don't retry until the file changes again
+            print(f"⚠ Could not reload {self.path}: {e}")
+            return False
+        for callback in self.listeners:
+            callback()
+        print(f"🔄 Reloaded rules from {self.path}")
+        return True
+
+
+rules = Rules()
@@ -0,0 +1,85 @@
+"""Precomputed spawn tiles along the map edges.
+
+Zombies appear at the map edges. Rather than guessing random edge tiles and
+retrying when one is water or occupied, each footprint size gets a pool of
+every valid anchor, built once per map (terrain never changes):
+
+    pool = EdgeSpawnPool(map_grid, size=2)
+    positions = pool.sample(rng, count, game_state.units.occupancy)
+
+sample() draws the whole batch without replacement, skipping occupied anchors,
+so a batch never fails quietly: if there are fewer free anchors than requested
+it spawns what fits and logs a warning.
+"""
+from game_log import get_logger
+
+spawn_log = get_logger('spawn')
+
+
+class EdgeSpawnPool:
+    """Every edge anchor where an NxN unit fits on land"""
+
+    def __init__(self, map_grid, size=1):
+        from map_generator import TileType
+
+        self.size = size
+        map_width = len(map_grid[0])
+        map_height = len(map_grid)
+        max_x = map_width - size
+        max_y = map_height - size
+
+        # Anchors (top-left tiles) whose footprint touches an edge: the top and bottom
+        # rows, then the left and right columns without their corners
+        candidates = []
+        for x in range(max_x + 1):
+            candidates.append((x, 0))
+            if max_y > 0:
+                candidates.append((x, max_y))
+        for y in range(1, max_y):
+            candidates.append((0, y))
+            if max_x > 0:
+                candidates.append((max_x, y))
+
+        self.tiles = [
+            (x, y) for x, y in candidates
+            if all(map_grid[y + dy][x + dx] != TileType.WATER for dy in range(size) for dx in range(size))
+        ]
+
+    def __len__(self):
+        return len(self.tiles)
+
+    def sample(self, rng, count, occupancy):
+        """Up to `count` distinct free anchors with non-overlapping footprints, drawn in one batch.
+
+        Walks a random permutation of the pool (a partial Fisher-Yates shuffle), checking
+        the OccupancyGrid only for the anchors it draws, so a mostly free edge costs about `count`
+        checks and a crowded one still finds every free anchor before giving up.
+        """
+        if count <= 0:
+            return []
+        tiles = self.tiles[:]
+        size = self.size
+        positions = []
+        claimed = set()  # Footprint tiles taken by this batch
+        occupied = 0
+        for i in range(len(tiles)):
+            j = rng.randrange(i, len(tiles))
+            tiles[i], tiles[j] = tiles[j], tiles[i]
+            x, y = tiles[i]
+            if occupancy.footprint_blocked(x, y, size):
+                occupied += 1
+                continue
+            if size == 1:
+                footprint = ((x, y),)
+            else:
+                footprint = [(x + dx, y + dy) for dy in range(size) for dx in range(size)]
+            if not claimed.isdisjoint(footprint):
+                continue  # Overlaps an anchor drawn earlier in this batch
+            positions.append((x, y))
+            claimed.update(footprint)
+            if len(positions) == count:
+                return positions
+
+        spawn_log.warning("Edge spawn pool (%dx%d) short: wanted %d, placed %d (%d valid tiles, %d occupied)",
+                          size, size, count, len(positions), len(tiles), occupied)
+        return positions
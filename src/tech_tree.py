@@ -1,4 +1,5 @@
 # Tech Tree Definitions
+from rules import rules
 
 TECH_TREE = {
     # Units Tree
@@ -132,17 +133,172 @@ TECH_TREE = {
     }
 }
 
+# Compiled tech tree: integer ids in prerequisite (topological) order and bitmasks,
+# so "is it researched" / "are its prerequisites met" are single AND operations
+def _topological_order(tree):
+    """Tech names ordered so every tech comes after its prerequisites"""
+    order = []
+    state = {}  # tech_id -> 'visiting' / 'done'
+
+    def visit(tech_id, path):
+        if state.get(tech_id) == 'done':
+            return
+        if state.get(tech_id) == 'visiting':
+            raise ValueError(f"Tech tree has a prerequisite cycle: {' -> '.join(path + [tech_id])}")
+        if tech_id not in tree:
+            raise ValueError(f"Unknown prerequisite '{tech_id}' (required by {path[-1]})")
+        state[tech_id] = 'visiting'
+        for prereq in tree[tech_id]['prerequisites']:
+            visit(prereq, path + [tech_id])
+        state[tech_id] = 'done'
+        order.append(tech_id)
+
+    for tech_id in tree:  # Dict order keeps the layout stable between runs
+        visit(tech_id, [])
+    return order
+
+
+TECH_ORDER = tuple(_topological_order(TECH_TREE))              # id -> tech name
+TECH_IDS = {tech_id: i for i, tech_id in enumerate(TECH_ORDER)}  # tech name -> id
+TECH_BITS = {tech_id: 1 << i for i, tech_id in enumerate(TECH_ORDER)}
+ALL_TECHS_MASK = (1 << len(TECH_ORDER)) - 1
+
+# Per id: direct prerequisites, every ancestor (closure), and techs that list it as a prerequisite
+PREREQ_MASKS = tuple(sum(TECH_BITS[p] for p in TECH_TREE[t]['prerequisites']) for t in TECH_ORDER)
+PREREQ_CLOSURE = []
+for _i, _tech_id in enumerate(TECH_ORDER):
+    _closure = PREREQ_MASKS[_i]
+    for _prereq in TECH_TREE[_tech_id]['prerequisites']:
+        _closure |= PREREQ_CLOSURE[TECH_IDS[_prereq]]  # Prerequisites come earlier in TECH_ORDER
+    PREREQ_CLOSURE.append(_closure)
+PREREQ_CLOSURE = tuple(PREREQ_CLOSURE)
+DEPENDENTS = tuple(tuple(TECH_IDS[t] for t in TECH_ORDER if tech_id in TECH_TREE[t]['prerequisites'])
+                   for tech_id in TECH_ORDER)
+ROOT_TECHS_MASK = sum(1 << i for i, mask in enumerate(PREREQ_MASKS) if not mask)
+
+# Research costs per id, without and with Research Documentation's 30% discount
+DISCOUNT_TECH_BIT = TECH_BITS['research_documentation']
+TECH_COSTS = tuple(TECH_TREE[t]['cost'] for t in TECH_ORDER)
+DISCOUNTED_TECH_COSTS = tuple(int(cost * 0.7) for cost in TECH_COSTS)
+
+
+class ResearchedTechs:
+    """Researched techs as a bitmask, plus the incrementally maintained researchable set.
+
+    Behaves like the set of tech names it replaces (`in`, iteration, len, add, update),
+    so saves and callers that list techs by name keep working.
+    """
+    __slots__ = ('mask', 'researchable')
+
+    def __init__(self, tech_ids=()):
+        self.mask = 0
+        self.researchable = ROOT_TECHS_MASK  # Not researched, all prerequisites researched
+        self.update(tech_ids)
+
+    def add(self, tech_id):
+        """Mark a tech researched and unlock any dependents whose prerequisites are now met"""
+        i = TECH_IDS[tech_id]
+        bit = 1 << i
+        if self.mask & bit:
+            return
+        self.mask |= bit
+        self.researchable &= ~bit
+        for dependent in DEPENDENTS[i]:
+            dependent_bit = 1 << dependent
+            if not self.mask & dependent_bit and PREREQ_MASKS[dependent] & ~self.mask == 0:
+                self.researchable |= dependent_bit
+
+    def update(self, tech_ids):
+        """Add several techs (in any order)"""
+        for tech_id in tech_ids:
+            self.add(tech_id)
+
+    def __contains__(self, tech_id):
+        return bool(self.mask & TECH_BITS.get(tech_id, 0))
+
+    def __iter__(self):
+        mask = self.mask
+        return (tech_id for i, tech_id in enumerate(TECH_ORDER) if mask >> i & 1)
+
+    def __len__(self):
+        return bin(self.mask).count('1')
+
+    def __repr__(self):
+        return f"ResearchedTechs({sorted(self)})"
+
+
 def can_research(tech_id, researched_techs):
     """Check if a tech can be researched (prerequisites met)"""
-    tech = TECH_TREE[tech_id]
-    for prereq in tech['prerequisites']:
-        if prereq not in researched_techs:
-            return False
-    return True
+    return PREREQ_MASKS[TECH_IDS[tech_id]] & ~researched_techs.mask == 0
 
 def get_tech_cost(tech_id, researched_techs):
     """Get the cost of a tech (possibly reduced by Research Documentation)"""
-    base_cost = TECH_TREE[tech_id]['cost']
-    if 'research_documentation' in researched_techs:
-        return int(base_cost * 0.7)  # 30% discount
-    return base_cost
+    if researched_techs.mask & DISCOUNT_TECH_BIT:
+        return DISCOUNTED_TECH_COSTS[TECH_IDS[tech_id]]  # 30% discount
+    return TECH_COSTS[TECH_IDS[tech_id]]
+
+
+class TechModifiers:
+    """Every active tech effect as a precomputed value, built once per set of researched techs.
+
+    Consumers read fields (e.g. `game_state.tech_modifiers.scout_vision`) instead of calling
+    has_tech for each effect; the table is rebuilt only when a tech is researched.
+    """
+    __slots__ = ('mask', 'unit_health_bonus', 'unit_moves_bonus', 'soldier_attack_bonus', 'unit_bonuses',
+                 'recruit_level', 'medic_heal_bonus', 'scavenge_multiplier', 'wall_damage_multiplier',
+                 'scout_vision', 'city_vision', 'new_city_resources', 'automated_defenses',
+                 'helicopter_transport', 'super_soldiers', 'cure_research', 'production_bonuses',
+                 'production_bonus')
+
+    def __init__(self, mask):
+        def has(tech_id):
+            return bool(mask & TECH_BITS[tech_id])
+
+        self.mask = mask
+
+        # Unit stats (new units start with them; existing units get the difference on research)
+        self.unit_health_bonus = 40 if has('armor_plating') else 0      # All player units
+        self.unit_moves_bonus = 1 if has('rapid_response') else 0       # All player units
+        self.soldier_attack_bonus = 10 if has('advanced_weaponry') else 0  # Soldiers only
+        self.unit_bonuses = (self.unit_health_bonus, self.unit_moves_bonus, self.soldier_attack_bonus)
+        self.recruit_level = 2 if has('combat_training') else 1
+        self.medic_heal_bonus = 20 if has('tactical_medicine') else 0
+        self.scavenge_multiplier = 1.25 if has('scavenging_efficiency') else 1
+        self.wall_damage_multiplier = 0.5 if has('fortification') else 1  # Player units standing on walls
+
+        # Vision
+        self.scout_vision = 4 if has('scout_training') else 3
+        self.city_vision = 5 if has('watchtower') else 3
+
+        # Cities
+        self.new_city_resources = {'food': 30, 'materials': 30} if has('quick_start') else {}
+        self.automated_defenses = has('automated_defenses')
+        self.helicopter_transport = has('helicopter_transport')
+        self.super_soldiers = has('super_soldier_program')
+        self.cure_research = has('cure_research')  # Cheaper cure (see rules.build_cost)
+
+        # Flat production bonuses per building: list of (building_type, resource, amount),
+        # and the same summed per (building_type, resource) for tooltips
+        self.production_bonuses = tuple(
+            bonus for tech_id, bonus in rules.production_tech_bonuses.items()
+            if tech_id in TECH_BITS and has(tech_id)
+        )
+        self.production_bonus = {}
+        for building_type, resource, amount in self.production_bonuses:
+            key = (building_type, resource)
+            self.production_bonus[key] = self.production_bonus.get(key, 0) + amount
+
+
+# researched mask -> TechModifiers (production bonuses come from the rules, so reloading clears it)
+_modifier_tables = {}
+rules.on_reload(_modifier_tables.clear)
+
+
+def get_tech_modifiers(researched_techs):
+    """Cached modifier table for a ResearchedTechs"""
+    mask = researched_techs.mask
+    modifiers = _modifier_tables.get(mask)
+    if modifiers is None:
+        modifiers = _modifier_tables[mask] = TechModifiers(mask)
+    return modifiers
+
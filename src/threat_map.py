@@ -0,0 +1,104 @@
+"""Which tiles the visible zombies can reach or attack on their next turn.
+
+Built once per player turn with a multi-source bounded search from every
+visible zombie, using each zombie's max_moves and the same movement rules as
+the zombie AI: roads cost 0.5, water can't be entered, and cities, buildings
+(walls included) and player units stop a zombie - it attacks them instead.
+Other zombies are treated as passable since they move too.
+
+    threat = game_state.get_threat_map()
+    threat.at(x, y)              # THREAT_NONE / THREAT_ATTACK / THREAT_REACH, O(1)
+    game_state.threat_at(x, y)   # same, rebuilding the map on a new turn
+
+A 2x2 super zombie is searched from each of its tiles as if they were 1x1
+zombies, which slightly overstates how far it can squeeze.
+"""
+import heapq
+
+from footprint import footprint_visible
+from pathfinding import NEIGHBOR_OFFSETS
+
+THREAT_NONE = 0
+THREAT_ATTACK = 1  # A zombie can hit a unit, city or building here but not step onto it
+THREAT_REACH = 2   # A zombie can walk onto this tile (and attack anything standing on it)
+
+
+class ThreatMap:
+    """Threat level of every tile for one player turn, stored as a bytearray"""
+
+    def __init__(self, game_state):
+        map_grid = game_state.map_grid
+        self.width = width = len(map_grid[0])
+        self.height = height = len(map_grid)
+        self.turn = game_state.turn
+        self.levels = levels = bytearray(width * height)
+
+        # Movement points are counted in half points so roads cost 1 and everything else 2
+        tile_costs = [None if cost is None else int(cost * 2) for cost in game_state.get_path_cache().costs.costs]
+
+        # Tiles a zombie attacks instead of entering
+        blocked = bytearray(width * height)
+        for city in game_state.cities:
+            blocked[city.y * width + city.x] = 1
+            for bx, by in city.building_locations:
+                blocked[by * width + bx] = 1
+        for unit in game_state.units.players:
+            blocked[unit.y * width + unit.x] = 1
+
+        # Seed every tile of every visible zombie with its full movement budget
+        best = {}  # Tile index -> most half points any zombie has left on arrival
+        open_heap = []
+        visible = game_state.visible
+        enemies = game_state.units.enemies
+        # Read the zombie arrays directly rather than through per-zombie views
+        for x, y, size, max_moves in zip(enemies.x, enemies.y, enemies.size, enemies.max_moves):
+            if not footprint_visible(visible, x, y, size):
+                continue
+            budget = max_moves * 2
+            for tile_y in range(y, y + size):
+                for tile_x in range(x, x + size):
+                    if not (tile_x < width and tile_y < height):
+                        continue
+                    index = tile_y * width + tile_x
+                    levels[index] = THREAT_REACH
+                    if budget > best.get(index, 0):
+                        best[index] = budget
+                        heapq.heappush(open_heap, (-budget, index))
+
+        # Expand from whichever tile has the most moves left, like a Dijkstra run backwards
+        while open_heap:
+            remaining, index = heapq.heappop(open_heap)
+            remaining = -remaining
+            if remaining < best[index]:
+                continue  # Stale heap entry
+            x = index % width
+            y = index // width
+            for dx, dy in NEIGHBOR_OFFSETS:
+                nx = x + dx
+                ny = y + dy
+                if not (0 <= nx < width and 0 <= ny < height):
+                    continue
+                neighbor = ny * width + nx
+                step_cost = tile_costs[neighbor]
+                if step_cost is None:
+                    continue  # Water: nothing to attack, can't enter
+                if blocked[neighbor]:
+                    if levels[neighbor] == THREAT_NONE:
+                        levels[neighbor] = THREAT_ATTACK
+                    continue
+                levels[neighbor] = THREAT_REACH
+                # A zombie may step with any points left, like Unit.move; only points left over carry on
+                left = remaining - step_cost
+                if left > 0 and left > best.get(neighbor, 0):
+                    best[neighbor] = left
+                    heapq.heappush(open_heap, (-left, neighbor))
+
+    def at(self, x, y):
+        """Threat level of tile (x, y) (THREAT_NONE off the map)"""
+        if 0 <= x < self.width and 0 <= y < self.height:
+            return self.levels[y * self.width + x]
+        return THREAT_NONE
+
+    def threatened_units(self, units):
+        """Units standing on tiles a zombie can attack next turn"""
+        return [unit for unit in units if self.at(unit.x, unit.y) != THREAT_NONE]
@@ -0,0 +1,145 @@
+"""Memory and attribute-access benchmark for Unit/City objects.
+
+Usage:
+    cd src
+    python unit_benchmark.py                 # 10,000 units
+    python unit_benchmark.py --units 50000 --json results.json
+"""
+import argparse
+import gc
+import json
+import time
+import tracemalloc
+
+from game_state import GameState, Unit, City
+from unit_store import UnitRoster
+
+
+def build_units(count, game_state):
+    """A late-game mix: mostly zombies, some super zombies and player units"""
+    player_types = ['survivor', 'scout', 'soldier', 'medic']
+    units = []
+    for i in range(count):
+        if i % 10 == 0:
+            units.append(Unit(i % 200, i // 200, player_types[(i // 10) % 4], 'player', 'medium', game_state))
+        elif i % 50 == 1:
+            units.append(Unit(i % 200, i // 200, 'super_zombie', 'enemy', 'medium'))
+        else:
+            units.append(Unit(i % 200, i // 200, 'zombie', 'enemy', 'medium'))
+    return units
+
+
+def measure_memory(count, game_state):
+    """Bytes allocated per unit (object, attribute storage, inventory and explored-tile set)"""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    units = build_units(count, game_state)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    # The list holding the units isn't part of a unit's cost
+    list_bytes = units.__sizeof__()
+    return (after - before - list_bytes) / count, units
+
+
+def measure_roster_memory(units):
+    """Bytes per zombie once the units are in a UnitRoster (enemy arrays, one view and occupancy-grid entry each)"""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    roster = UnitRoster(200, len(units) // 200 + 2, units)  # build_units lays units out 200 per row
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    # Player units are shared with `units`, so nearly all the new memory is enemy storage
+    return (after - before) / len(roster.enemies), roster
+
+
+def measure_city_memory(count):
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    cities = [City(i, i, f"City {i}") for i in range(count)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return (after - before - cities.__sizeof__()) / count
+
+
+def time_attribute_pass(units, repeats):
+    """Best-of-N time for one pass reading the fields the AI and renderer touch per unit"""
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        total = 0
+        for unit in units:
+            if unit.team == 'enemy':
+                total += unit.x + unit.y + unit.health + unit.attack_power + unit.moves_remaining + unit.size
+        elapsed = time.perf_counter() - start
+        best = min(best, elapsed)
+    return best * 1000.0
+
+
+def time_aging_pass(roster, repeats):
+    """Best-of-N time for the zombie aging pass over the enemy arrays"""
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        roster.enemies.age_all()
+        elapsed = time.perf_counter() - start
+        best = min(best, elapsed)
+    return best * 1000.0
+
+
+def time_inventory_pass(units, repeats):
+    """Best-of-N time for one pass reading and updating every unit's inventory"""
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for unit in units:
+            inventory = unit.inventory
+            inventory['food'] = inventory.get('food', 0) + 1
+            inventory['materials'] += 1
+        elapsed = time.perf_counter() - start
+        best = min(best, elapsed)
+    return best * 1000.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Unit memory and attribute-access benchmark")
+    parser.add_argument('--units', type=int, default=10000, help="Number of units to create")
+    parser.add_argument('--repeats', type=int, default=30, help="Timing repetitions (best is reported)")
+    parser.add_argument('--json', metavar='FILE', help="Also write results to a JSON file")
+    args = parser.parse_args()
+
+    from map_generator import TileType
+    game_state = GameState([[TileType.GRASS] * 40 for _ in range(40)], {}, None, 'medium', seed=1)
+
+    bytes_per_unit, units = measure_memory(args.units, game_state)
+    bytes_per_stored_zombie, roster = measure_roster_memory(units)
+    results = {
+        'units': args.units,
+        'bytes_per_unit': round(bytes_per_unit, 1),
+        'bytes_per_stored_zombie': round(bytes_per_stored_zombie, 1),
+        'bytes_per_city': round(measure_city_memory(1000), 1),
+        'attribute_pass_ms': round(time_attribute_pass(units, args.repeats), 3),
+        'roster_attribute_pass_ms': round(time_attribute_pass(roster, args.repeats), 3),
+        'aging_pass_ms': round(time_aging_pass(roster, args.repeats), 3),
+        'inventory_pass_ms': round(time_inventory_pass(units, args.repeats), 3),
+    }
+
+    print(f"Units:                 {results['units']:,}")
+    print(f"Memory per unit:       {results['bytes_per_unit']:.0f} bytes")
+    print(f"Memory per zombie (SoA): {results['bytes_per_stored_zombie']:.0f} bytes")
+    print(f"Memory per city:       {results['bytes_per_city']:.0f} bytes")
+    print(f"Attribute pass:        {results['attribute_pass_ms']:.2f} ms")
+    print(f"  via enemy views:     {results['roster_attribute_pass_ms']:.2f} ms")
+    print(f"Aging array pass:      {results['aging_pass_ms']:.2f} ms")
+    print(f"Inventory pass:        {results['inventory_pass_ms']:.2f} ms")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"Results written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,484 @@
+"""Struct-of-arrays storage for enemy units.
+
+Zombies are the bulk of GameState.units, so their per-unit fields live in
+parallel typed arrays (one column per field) inside an EnemyStore instead of
+in one Python object each. Code that wants a unit object gets an EnemyUnit: a
+small view that reads and writes its row of the store and otherwise behaves
+like a Unit, so the renderer, save code and main.py don't need to care.
+
+GameState.units is a UnitRoster: the player units (a plain list of Unit
+objects) followed by the enemy store. It supports the list operations the
+game uses (append, remove, index, iteration, indexing), with removal of an
+enemy being an O(1) swap-remove.
+
+Every zombie gets a stable id when it is added; its row (slot) may change
+when another zombie is removed, but its view and id do not.
+
+The roster also owns the OccupancyGrid (footprint.py) that answers "who is on
+this tile": units are registered when added and update it as they move.
+"""
+from array import array
+from footprint import OccupancyGrid
+
+# Packed int key for an anchor tile (y * stride + x), used instead of an (x, y) tuple in tile sets
+ANCHOR_STRIDE = 1 << 16
+
+# Age thresholds (turns) at which zombies reach levels 2, 3 and 4
+ZOMBIE_AGE_LEVELS = ((75, 4), (50, 3), (25, 2))
+
+
+class EnemyUnit:
+    """A Unit-compatible view of one row in an EnemyStore"""
+    __slots__ = ('store', 'slot', 'id')
+
+    team = 'enemy'
+    turn_skipped = False  # Only player units can skip their turn
+    tiles_explored = frozenset()  # Only scouts track explored tiles
+    goto = None  # Only player units take goto orders
+
+    def __init__(self, store, slot, unit_id):
+        self.store = store
+        self.slot = slot
+        self.id = unit_id
+
+    def __repr__(self):
+        return f"<EnemyUnit #{self.id} {self.unit_type} at ({self.x}, {self.y})>"
+
+    # Fields stored in typed arrays
+    @property
+    def x(self):
+        return self.store.x[self.slot]
+
+    @x.setter
+    def x(self, value):
+        self.store._place(self.slot, value, self.store.y[self.slot])
+
+    @property
+    def y(self):
+        return self.store.y[self.slot]
+
+    @y.setter
+    def y(self, value):
+        self.store._place(self.slot, self.store.x[self.slot], value)
+
+    @property
+    def health(self):
+        return self.store.health[self.slot]
+
+    @health.setter
+    def health(self, value):
+        self.store.health[self.slot] = value
+
+    @property
+    def max_health(self):
+        return self.store.max_health[self.slot]
+
+    @max_health.setter
+    def max_health(self, value):
+        self.store.max_health[self.slot] = value
+
+    @property
+    def attack_power(self):
+        return self.store.attack_power[self.slot]
+
+    @attack_power.setter
+    def attack_power(self, value):
+        self.store.attack_power[self.slot] = value
+
+    @property
+    def max_moves(self):
+        return self.store.max_moves[self.slot]
+
+    @max_moves.setter
+    def max_moves(self, value):
+        self.store.max_moves[self.slot] = value
+
+    @property
+    def moves_remaining(self):
+        # Stored as a double (roads cost 0.5), reported as an int when whole like Unit does
+        value = self.store.moves_remaining[self.slot]
+        return int(value) if value == int(value) else value
+
+    @moves_remaining.setter
+    def moves_remaining(self, value):
+        self.store.moves_remaining[self.slot] = value
+
+    @property
+    def age_in_turns(self):
+        return self.store.age_in_turns[self.slot]
+
+    @age_in_turns.setter
+    def age_in_turns(self, value):
+        self.store.age_in_turns[self.slot] = value
+
+    @property
+    def level(self):
+        return self.store.level[self.slot]
+
+    @level.setter
+    def level(self, value):
+        self.store.level[self.slot] = value
+
+    @property
+    def size(self):
+        return self.store.size[self.slot]
+
+    @size.setter
+    def size(self, value):
+        store = self.store
+        if store.occupancy is not None:
+            store.occupancy.remove(self, self.x, self.y, self.size)
+            store.occupancy.add(self, self.x, self.y, value)
+        store.size[self.slot] = value
+        store.max_size = max(store.max_size, value)
+
+    @property
+    def xp(self):
+        return self.store.xp[self.slot]
+
+    @xp.setter
+    def xp(self, value):
+        self.store.xp[self.slot] = value
+
+    @property
+    def xp_to_next_level(self):
+        return self.store.xp_to_next_level[self.slot]
+
+    @xp_to_next_level.setter
+    def xp_to_next_level(self, value):
+        self.store.xp_to_next_level[self.slot] = value
+
+    # Fields stored in plain per-slot lists
+    @property
+    def unit_type(self):
+        return self.store.unit_type[self.slot]
+
+    @unit_type.setter
+    def unit_type(self, value):
+        self.store.unit_type[self.slot] = value
+
+    @property
+    def inventory(self):
+        # Zombies rarely carry anything, so inventories are only created when asked for
+        inventories = self.store.inventories
+        inventory = inventories.get(self.id)
+        if inventory is None:
+            from game_state import ResourceStore
+            inventory = inventories[self.id] = ResourceStore()
+        return inventory
+
+    @inventory.setter
+    def inventory(self, value):
+        self.store.inventories[self.id] = value
+
+    # Unit behaviour
+    def reset_moves(self):
+        """Reset movement points at start of turn"""
+        self.store.moves_remaining[self.slot] = self.store.max_moves[self.slot]
+
+    def can_move(self):
+        return self.store.moves_remaining[self.slot] > 0
+
+    def move(self, dx, dy, terrain_type=None):
+        """Move unit by offset, with terrain-based movement cost"""
+        from map_generator import TileType
+
+        if self.can_move():
+            self.store._place(self.slot, self.x + dx, self.y + dy)
+
+            # Roads cost only 0.5 movement points
+            if terrain_type == TileType.ROAD:
+                self.store.moves_remaining[self.slot] -= 0.5
+            else:
+                self.store.moves_remaining[self.slot] -= 1
+            return True
+        return False
+
+    def gain_xp(self, amount):
+        """Gain XP and level up if enough XP earned"""
+        self.xp += amount
+        leveled_up = False
+
+        while self.xp >= self.xp_to_next_level:
+            self.xp -= self.xp_to_next_level
+            self.store._level_up(self.slot)
+            leveled_up = True
+            self.xp_to_next_level = int(self.xp_to_next_level * 1.5)
+
+        return leveled_up
+
+    def zombie_age_level_up(self):
+        """Level up zombie based on age"""
+        return self.store._age_level_up(self.slot)
+
+
+class EnemyStore:
+    """Enemy unit fields in parallel typed arrays, one row (slot) per zombie"""
+
+    INT_COLUMNS = ('x', 'y', 'health', 'max_health', 'attack_power', 'max_moves',
+                   'age_in_turns', 'level', 'size', 'xp', 'xp_to_next_level')
+
+    def __init__(self):
+        for column in self.INT_COLUMNS:
+            setattr(self, column, array('i'))
+        self.moves_remaining = array('d')
+        self.unit_type = []
+        self.views = []        # Slot -> EnemyUnit
+        self.inventories = {}  # Unit id -> ResourceStore, only for zombies that were given one
+        self.max_size = 1      # Largest footprint in the store
+        self.occupancy = None  # OccupancyGrid kept in step with positions (set by UnitRoster)
+        self.next_id = 0
+
+    def __len__(self):
+        return len(self.views)
+
+    def __iter__(self):
+        return iter(self.views)
+
+    def add(self, unit):
+        """Copy a Unit (or anything with the same fields) into a new row; returns its view"""
+        slot = len(self.views)
+        self.x.append(unit.x)
+        self.y.append(unit.y)
+        self.health.append(unit.health)
+        self.max_health.append(unit.max_health)
+        self.attack_power.append(unit.attack_power)
+        self.max_moves.append(unit.max_moves)
+        self.age_in_turns.append(unit.age_in_turns)
+        self.level.append(unit.level)
+        self.size.append(unit.size)
+        self.xp.append(unit.xp)
+        self.xp_to_next_level.append(unit.xp_to_next_level)
+        self.moves_remaining.append(unit.moves_remaining)
+        self.unit_type.append(unit.unit_type)
+        self.max_size = max(self.max_size, unit.size)
+
+        view = EnemyUnit(self, slot, self.next_id)
+        self.next_id += 1
+        if any(unit.inventory.values()):
+            self.inventories[view.id] = unit.inventory
+        self.views.append(view)
+        if self.occupancy is not None:
+            self.occupancy.add(view, unit.x, unit.y, unit.size)
+        return view
+
+    def add_batch(self, archetype, positions):
+        """Add a fresh unit of one archetype at each (x, y); returns their views"""
+        count = len(positions)
+        first_slot = len(self.views)
+        xs = [x for x, _ in positions]
+        ys = [y for _, y in positions]
+        self.x.extend(xs)
+        self.y.extend(ys)
+        self.health.extend([archetype.max_health] * count)
+        self.max_health.extend([archetype.max_health] * count)
+        self.attack_power.extend([archetype.attack_power] * count)
+        self.max_moves.extend([archetype.max_moves] * count)
+        self.moves_remaining.extend([archetype.max_moves] * count)
+        self.age_in_turns.extend([0] * count)
+        self.level.extend([1] * count)
+        self.size.extend([archetype.size] * count)
+        self.xp.extend([0] * count)
+        self.xp_to_next_level.extend([100] * count)
+        self.unit_type.extend([archetype.unit_type] * count)
+        self.max_size = max(self.max_size, archetype.size)
+
+        views = [EnemyUnit(self, first_slot + i, self.next_id + i) for i in range(count)]
+        self.next_id += count
+        self.views.extend(views)
+        if self.occupancy is not None:
+            for view, (x, y) in zip(views, positions):
+                self.occupancy.add(view, x, y, archetype.size)
+        return views
+
+    def remove(self, view):
+        """Swap-remove a unit in O(1): the last row moves into its slot.
+
+        The removed view keeps working (it is moved to a private one-row store)
+        so callers can still read it after removal, as they could a removed Unit.
+        """
+        if view.store is not self:
+            raise ValueError(f"{view!r} is not in this store")
+        slot = view.slot
+        last = len(self.views) - 1
+
+        detached = EnemyStore()
+        detached.add(view)
+        detached.views[0] = view
+        inventory = self.inventories.pop(view.id, None)
+        if inventory is not None:
+            detached.inventories[view.id] = inventory
+
+        if self.occupancy is not None:
+            self.occupancy.remove(view, self.x[slot], self.y[slot], self.size[slot])
+
+        columns = self.INT_COLUMNS + ('moves_remaining', 'unit_type', 'views')
+        for column in columns:
+            values = getattr(self, column)
+            values[slot] = values[last]
+            values.pop()
+        if slot != last:
+            self.views[slot].slot = slot
+
+        view.store = detached
+        view.slot = 0
+
+    def _place(self, slot, x, y):
+        """Move a unit's anchor tile, keeping the occupancy grid in step"""
+        if self.occupancy is not None:
+            self.occupancy.move(self.views[slot], self.x[slot], self.y[slot], x, y, self.size[slot])
+        self.x[slot] = x
+        self.y[slot] = y
+
+    def any_within(self, x, y, radius):
+        """True if any enemy's anchor tile is within `radius` (Chebyshev) of (x, y)"""
+        for zx, zy in zip(self.x, self.y):
+            if -radius <= zx - x <= radius and -radius <= zy - y <= radius:
+                return True
+        return False
+
+    # Array passes over every enemy
+    def reset_moves(self):
+        """Give every enemy its full movement points"""
+        self.moves_remaining = array('d', self.max_moves)
+
+    def age_all(self):
+        """Age every zombie by a turn and apply age level-ups; returns the views that leveled up"""
+        leveled = []
+        age_in_turns = self.age_in_turns
+        level = self.level
+        unit_type = self.unit_type
+        threshold = ZOMBIE_AGE_LEVELS[-1][0]
+        for slot in range(len(age_in_turns)):
+            age = age_in_turns[slot] + 1
+            age_in_turns[slot] = age
+            # Nothing changes before the first threshold or once a zombie is at its age level
+            if age >= threshold and level[slot] < 4 and unit_type[slot] in ('zombie', 'super_zombie'):
+                if self._age_level_up(slot):
+                    leveled.append(self.views[slot])
+        return leveled
+
+    def _age_level_up(self, slot):
+        """Raise a zombie to the level its age allows (+10% HP and attack per level)"""
+        if self.unit_type[slot] not in ('zombie', 'super_zombie'):
+            return False
+        age = self.age_in_turns[slot]
+        target_level = 1
+        for min_age, age_level in ZOMBIE_AGE_LEVELS:
+            if age >= min_age:
+                target_level = age_level
+                break
+
+        leveled_up = False
+        while self.level[slot] < target_level:
+            self._level_up(slot)
+            leveled_up = True
+        return leveled_up
+
+    def _level_up(self, slot):
+        self.level[slot] += 1
+        hp_boost = int(self.max_health[slot] * 0.1)
+        attack_boost = int(self.attack_power[slot] * 0.1) + 1  # At least +1
+        self.max_health[slot] += hp_boost
+        self.health[slot] += hp_boost  # Also heal when leveling up
+        self.attack_power[slot] += attack_boost
+
+    def damage_covered(self, covered_anchors, damage):
+        """Damage every enemy whose footprint touches the covered area, once each.
+
+        `covered_anchors` maps unit size -> set of anchor keys (y * ANCHOR_STRIDE + x)
+        from which a unit of that size has a footprint tile in the area, so each
+        enemy is one set lookup. Returns (damaged_count, killed_views); killed
+        units are not removed.
+        """
+        damaged = 0
+        killed = []
+        health = self.health
+        for slot, (zx, zy, unit_size) in enumerate(zip(self.x, self.y, self.size)):
+            if zy * ANCHOR_STRIDE + zx in covered_anchors[unit_size]:
+                health[slot] -= damage
+                damaged += 1
+                if health[slot] <= 0:
+                    killed.append(self.views[slot])
+        return damaged, killed
+
+
+class UnitRoster:
+    """GameState.units: player Unit objects followed by the enemy store's views.
+
+    Acts like the list it replaces. Enemy units appended to it are copied into
+    the store, so hold on to the view (e.g. via roster[-1]) rather than the
+    appended Unit if you need to modify the unit afterwards.
+    """
+
+    def __init__(self, width, height, units=()):
+        self.players = []
+        self.enemies = EnemyStore()
+        self.occupancy = self.enemies.occupancy = OccupancyGrid(width, height)
+        for unit in units:
+            self.append(unit)
+
+    def add(self, unit):
+        """Add a unit; returns the object now in the roster (the view, for enemies)"""
+        if unit.team == 'enemy':
+            return self.enemies.add(unit)
+        self.players.append(unit)
+        unit.occupancy = self.occupancy
+        self.occupancy.add(unit, unit.x, unit.y, unit.size)
+        return unit
+
+    def extend_players(self, units):
+        """Add several player units"""
+        for unit in units:
+            self.add(unit)
+
+    def append(self, unit):
+        self.add(unit)
+
+    def remove(self, unit):
+        if isinstance(unit, EnemyUnit):
+            self.enemies.remove(unit)
+        else:
+            self.players.remove(unit)
+            self.occupancy.remove(unit, unit.x, unit.y, unit.size)
+            unit.occupancy = None
+
+    def __iter__(self):
+        yield from self.players
+        yield from self.enemies.views
+
+    def __len__(self):
+        return len(self.players) + len(self.enemies)
+
+    def __bool__(self):
+        return len(self) > 0
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return list(self)[index]
+        if index < 0:
+            index += len(self)
+        if 0 <= index < len(self.players):
+            return self.players[index]
+        if 0 <= index - len(self.players) < len(self.enemies):
+            return self.enemies.views[index - len(self.players)]
+        raise IndexError("unit index out of range")
+
+    def index(self, unit):
+        if isinstance(unit, EnemyUnit):
+            if unit.store is not self.enemies:
+                raise ValueError(f"{unit!r} is not in the roster")
+            return len(self.players) + unit.slot
+        return self.players.index(unit)
+
+    def __contains__(self, unit):
+        if isinstance(unit, EnemyUnit):
+            return unit.store is self.enemies
+        return unit in self.players
+
+    def copy(self):
+        return list(self)
+
+    def unit_at(self, x, y, exclude_unit=None):
+        """Unit covering tile (x, y), accounting for multi-tile units (O(1) grid lookup)"""
+        return self.occupancy.unit_at(x, y, exclude_unit)
@@ -0,0 +1,91 @@
+"""Plays back the zombie turn from its AIAction records.
+
+Each zombie that acted gets a track: its steps in order, each given an equal
+share of the animation. A move slides from tile to tile; an attack bumps 30%
+of the way toward the target and back. KILL records add no motion.
+
+Tracks are added in batches as the time-sliced AI turn produces them, each
+starting when it arrives, and bucketed by the map area they cover so each
+frame only the buckets under the camera are looked at:
+
+    animator = ZombieAnimator(duration=1.0)
+    animator.add(new_actions, now)
+    positions = animator.positions(now, start_col, start_row, end_col, end_row)
+    positions.get(unit)   # (x, y) in fractional tiles, or None if the unit isn't animating
+"""
+import math
+
+from ai_actions import ATTACKS, MOVE
+
+# Tiles per side of a bucket
+BUCKET_SIZE = 16
+
+# Fraction of the way toward its target an attacking zombie lunges
+ATTACK_BUMP = 0.3
+
+
+class ZombieAnimator:
+    """Per-zombie step tracks built from one zombie turn's actions"""
+
+    def __init__(self, duration):
+        self.duration = duration  # Seconds each zombie's track takes to play
+        # unit -> (start time, list of (is_attack, from_x, from_y, to_x, to_y))
+        self.tracks = {}
+        # Bucket (column, row) -> units whose track passes through it
+        self.buckets = {}
+        self.last_start = None  # When the most recently added track started
+
+    def __len__(self):
+        return len(self.tracks)
+
+    def add(self, actions, start_time):
+        """Add tracks for a batch of actions, starting to play at `start_time` (seconds).
+
+        A zombie's actions must all arrive in one batch (the AI turn moves a zombie at a time).
+        """
+        new_tracks = {}
+        for action in actions:
+            if action.kind == MOVE or action.kind in ATTACKS:
+                steps = new_tracks.get(action.unit)
+                if steps is None:
+                    steps = new_tracks[action.unit] = []
+                steps.append((action.kind != MOVE, action.x, action.y, action.target_x, action.target_y))
+
+        buckets = self.buckets
+        for unit, steps in new_tracks.items():
+            self.tracks[unit] = (start_time, steps)
+            xs = [step[1] for step in steps] + [step[3] for step in steps]
+            ys = [step[2] for step in steps] + [step[4] for step in steps]
+            size = unit.size
+            for bucket_y in range(min(ys) // BUCKET_SIZE, (max(ys) + size - 1) // BUCKET_SIZE + 1):
+                for bucket_x in range(min(xs) // BUCKET_SIZE, (max(xs) + size - 1) // BUCKET_SIZE + 1):
+                    buckets.setdefault((bucket_x, bucket_y), []).append(unit)
+        if new_tracks:
+            self.last_start = start_time
+
+    def finished(self, now):
+        """True once every track added so far has played to the end"""
+        return self.last_start is None or now - self.last_start >= self.duration
+
+    def positions(self, now, start_col, start_row, end_col, end_row):
+        """Render positions at time `now` of the animating units near the given tile range"""
+        positions = {}
+        tracks = self.tracks
+        buckets = self.buckets
+        duration = self.duration
+        for bucket_y in range(start_row // BUCKET_SIZE, end_row // BUCKET_SIZE + 1):
+            for bucket_x in range(start_col // BUCKET_SIZE, end_col // BUCKET_SIZE + 1):
+                for unit in buckets.get((bucket_x, bucket_y), ()):
+                    if unit in positions:
+                        continue  # Already placed from a neighbouring bucket
+                    start_time, steps = tracks[unit]
+                    progress = min(1.0, (now - start_time) / duration)
+                    # Which step we are in, and how far through it
+                    scaled = progress * len(steps)
+                    index = min(int(scaled), len(steps) - 1)
+                    t = scaled - index
+                    is_attack, from_x, from_y, to_x, to_y = steps[index]
+                    if is_attack:
+                        t = ATTACK_BUMP * math.sin(t * math.pi)
+                    positions[unit] = (from_x + (to_x - from_x) * t, from_y + (to_y - from_y) * t)
+        return positions
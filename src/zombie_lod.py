@@ -0,0 +1,228 @@
+"""Cheap movement for zombies far from anything they could attack.
+
+The full zombie AI rebuilds and scans the list of every city, building and
+visible unit on every step. Most of a late-game horde is nowhere near any of
+them, so those zombies are simulated at a coarser level of detail:
+
+- The map is split into CELL_SIZE x CELL_SIZE cells. A breadth-first search
+  over the cells from the ones holding a target (the cure city while the cure
+  is being made, otherwise cities and buildings, walls only if nothing else is
+  left) gives each cell the direction toward the nearest target.
+- Each AI turn the cells within `distance` tiles of any city, building or
+  player unit are marked hot.
+- A zombie outside the hot cells steps along its cell's direction, trying the
+  two neighbouring directions when the way is blocked. As soon as it stands in
+  a hot cell it is promoted and the full AI takes its remaining moves.
+
+    field = game_state.get_dormant_field()    # None when LOD is off
+    if field is None or not field.move_dormant(unit, record):
+        ...full AI...
+
+The field is rebuilt when the set of targets changes, but at most once every
+`field_refresh_turns` turns for buildings coming and going (a city founded or
+lost, or the cure starting or stopping, rebuilds it at once). The turn and
+targets it was built from are saved with the game, so a loaded game keeps
+the same (possibly stale) field and plays out like the one that was saved.
+Dormant zombies don't chase visible units across the map the way the full AI
+does; they head for the cities instead until they come within range.
+"""
+from ai_actions import AIAction, MOVE
+from pathfinding import NEIGHBOR_OFFSETS
+
+# Tiles per side of a field cell
+CELL_SIZE = 8
+
+# Closest a dormant zombie may be to a target, so one step (2x2 footprint included) can't reach it
+MIN_DISTANCE = 4
+
+
+def _step_options(dx, dy):
+    """The field direction, then the two directions either side of it"""
+    if dx == 0:
+        return ((0, dy), (-1, dy), (1, dy))
+    if dy == 0:
+        return ((dx, 0), (dx, -1), (dx, 1))
+    return ((dx, dy), (dx, 0), (0, dy))
+
+
+def field_targets(game_state):
+    """Tiles the field leads to, as a sorted tuple (also used to tell when the field is stale)"""
+    if game_state.cure_manufacturing_city:
+        city = game_state.cure_manufacturing_city
+        return ((city.x, city.y),)
+    targets = []
+    walls = []
+    for city in game_state.cities:
+        targets.append((city.x, city.y))
+        for position, building in city.building_locations.items():
+            if building['type'] == 'wall':
+                walls.append(position)
+            else:
+                targets.append(position)
+    return tuple(sorted(targets or walls))
+
+
+def field_cities(game_state):
+    """City positions and the cure city's position; a change to either rebuilds the field at once"""
+    cure_city = game_state.cure_manufacturing_city
+    return (tuple((city.x, city.y) for city in game_state.cities),
+            (cure_city.x, cure_city.y) if cure_city else None)
+
+
+class DormantField:
+    """Direction field toward the nearest target plus this turn's hot cells"""
+
+    def __init__(self, game_state, saved=None):
+        """Build the field for the current targets, or for the ones recorded in `saved` (see to_save_data)"""
+        costs = game_state.get_path_cache().costs
+        self.width = width = costs.width
+        self.height = height = costs.height
+        self.columns = columns = (width + CELL_SIZE - 1) // CELL_SIZE
+        self.rows = rows = (height + CELL_SIZE - 1) // CELL_SIZE
+        self.tile_costs = costs.costs
+        self.occupancy = game_state.units.occupancy
+        self.map_grid = game_state.map_grid
+        if saved is None:
+            self.turn = game_state.turn
+            self.targets = field_targets(game_state)
+            self.cities = field_cities(game_state)
+        else:
+            # A loaded game carries on with the field it had, so it plays out like the game that was saved
+            self.turn = saved['turn']
+            self.targets = tuple(tuple(position) for position in saved['targets'])
+            cure_city = saved['cure_city']
+            self.cities = (tuple(tuple(position) for position in saved['cities']),
+                           tuple(cure_city) if cure_city else None)
+        self.hot = bytearray(columns * rows)
+
+        # Cells with no land at all can't be crossed
+        land = bytearray(columns * rows)
+        tile_costs = self.tile_costs
+        for y in range(height):
+            row_start = (y // CELL_SIZE) * columns
+            for x in range(width):
+                if tile_costs[y * width + x] is not None:
+                    land[row_start + x // CELL_SIZE] = 1
+
+        # Breadth-first search outward from the target cells
+        distance = [None] * (columns * rows)
+        frontier = []
+        for x, y in self.targets:
+            cell = (y // CELL_SIZE) * columns + x // CELL_SIZE
+            if distance[cell] is None:
+                distance[cell] = 0
+                frontier.append(cell)
+        steps_away = 0
+        while frontier:
+            steps_away += 1
+            next_frontier = []
+            for cell in frontier:
+                column = cell % columns
+                row = cell // columns
+                for dx, dy in NEIGHBOR_OFFSETS:
+                    nc = column + dx
+                    nr = row + dy
+                    if 0 <= nc < columns and 0 <= nr < rows:
+                        neighbor = nr * columns + nc
+                        if land[neighbor] and distance[neighbor] is None:
+                            distance[neighbor] = steps_away
+                            next_frontier.append(neighbor)
+            frontier = next_frontier
+
+        # Each reached cell points at its closest neighbour (ties in NEIGHBOR_OFFSETS order);
+        # target cells and unreachable cells get None and always use the full AI
+        self.steps = steps = [None] * (columns * rows)
+        for cell, cell_distance in enumerate(distance):
+            if not cell_distance:
+                continue
+            column = cell % columns
+            row = cell // columns
+            best = None
+            for dx, dy in NEIGHBOR_OFFSETS:
+                nc = column + dx
+                nr = row + dy
+                if 0 <= nc < columns and 0 <= nr < rows:
+                    neighbor_distance = distance[nr * columns + nc]
+                    if neighbor_distance is not None and (best is None or neighbor_distance < best[0]):
+                        best = (neighbor_distance, dx, dy)
+            steps[cell] = _step_options(best[1], best[2])
+
+    def is_current(self, game_state, refresh_turns):
+        """True unless the targets changed and the field is old enough to rebuild.
+
+        A city founded or lost, or the cure starting or stopping, rebuilds it at once.
+        """
+        if field_cities(game_state) != self.cities:
+            return False
+        if game_state.turn - self.turn < refresh_turns:
+            return True
+        return field_targets(game_state) == self.targets
+
+    def to_save_data(self):
+        """What a loaded game needs to rebuild this exact field"""
+        city_positions, cure_city = self.cities
+        return {
+            'turn': self.turn,
+            'targets': [list(position) for position in self.targets],
+            'cities': [list(position) for position in city_positions],
+            'cure_city': list(cure_city) if cure_city else None,
+        }
+
+    def mark_hot(self, game_state, distance):
+        """Mark the cells within `distance` tiles of any city, building or player unit"""
+        distance = max(distance, MIN_DISTANCE)
+        columns = self.columns
+        last_column = self.columns - 1
+        last_row = self.rows - 1
+        hot = self.hot = bytearray(columns * self.rows)
+
+        positions = [(unit.x, unit.y) for unit in game_state.units.players]
+        for city in game_state.cities:
+            positions.append((city.x, city.y))
+            positions.extend(city.building_locations)
+
+        for x, y in positions:
+            first_column = max(0, (x - distance) // CELL_SIZE)
+            end_column = min(last_column, (x + distance) // CELL_SIZE) + 1
+            for row in range(max(0, (y - distance) // CELL_SIZE), min(last_row, (y + distance) // CELL_SIZE) + 1):
+                row_start = row * columns
+                hot[row_start + first_column:row_start + end_column] = b'\x01' * (end_column - first_column)
+
+    def move_dormant(self, unit, record):
+        """Walk a zombie along the field; False if it is (or gets) within range and needs the full AI"""
+        columns = self.columns
+        hot = self.hot
+        x = unit.x
+        y = unit.y
+        cell = (y // CELL_SIZE) * columns + x // CELL_SIZE
+        if hot[cell] or self.steps[cell] is None:
+            return False
+
+        width = self.width
+        height = self.height
+        tile_costs = self.tile_costs
+        occupancy = self.occupancy
+        size = unit.size
+        while unit.can_move():
+            for dx, dy in self.steps[cell]:
+                new_x = x + dx
+                new_y = y + dy
+                if not (0 <= new_x and new_x + size <= width and 0 <= new_y and new_y + size <= height):
+                    continue
+                # Water is checked at the anchor tile, like the full AI
+                if tile_costs[new_y * width + new_x] is None:
+                    continue
+                if occupancy.unit_in_footprint(new_x, new_y, size, exclude_unit=unit):
+                    continue
+                break
+            else:
+                return True  # Boxed in: wait for next turn
+
+            unit.move(dx, dy, self.map_grid[new_y][new_x])
+            record(AIAction(MOVE, unit, x, y, new_x, new_y))
+            x = new_x
+            y = new_y
+            cell = (y // CELL_SIZE) * columns + x // CELL_SIZE
+            if hot[cell] or self.steps[cell] is None:
+                return False  # Promoted: the full AI takes the remaining moves
+        return True